@@ -1 +1,7 @@
-from skinWrangler import *
\ No newline at end of file
+try:
+    import maya.cmds
+except ImportError:
+    # outside Maya (the test suite, RPC clients) only the flat modules get imported, not the UI
+    pass
+else:
+    from skinWrangler import *
\ No newline at end of file
@@ -17,7 +17,9 @@ skinWranglerWindow = sw.show()
 """
 
 import os
+import time
 import logging
+from contextlib import contextmanager
 
 from qt import QtWidgets, QtGui, QtCore
 
@@ -27,11 +29,19 @@ except ImportError:
     import shiboken
 
 import maya.cmds as cmds
-import maya.mel as mel
 from maya.api import OpenMaya as om2
 from maya.OpenMayaUI import MQtUtil
 
+import numpy as np
+
 import skinwranglersource
+import skinwranglerdata
+import skinwranglerops
+import skinwranglermesh
+import skinwranglerindex
+import skinwrangleraudit
+import skinwranglerserver
+import skinwranglershared
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +71,69 @@ def show():
                           floating=True, r=True, uiScript="skinWrangler._initSkin()")
 
 
+class SkinAuditDialog(QtWidgets.QDialog):
+    """Sortable table of skinwrangleraudit.SkinReports with selection, JSON export and max influence enforcement"""
+
+    columns = ('SKINCLUSTER', 'MESH', 'VERTS', 'OVER MAX', 'MMI', 'UNNORMALIZED', 'LOCKED', 'UNUSED', '< EPSILON')
+
+    def __init__(self, reports, parent=None):
+        super(SkinAuditDialog, self).__init__(parent)
+        self.reports = reports
+        self.setWindowTitle('Skin audit')
+        self.resize(720, 400)
+        layout = QtWidgets.QVBoxLayout(self)
+        self.table = QtWidgets.QTableWidget(len(reports), len(self.columns), self)
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for row, report in enumerate(reports):
+            values = (report.skin, report.mesh, report.numVerts, len(report.overMax),
+                      'on' if report.maintainMax else 'off', len(report.unnormalized), len(report.locked),
+                      len(report.unused), report.belowEpsilon)
+            for col, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem()
+                # numbers as data so the columns sort numerically
+                item.setData(QtCore.Qt.DisplayRole, value)
+                item.setData(QtCore.Qt.UserRole, row)
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(3, QtCore.Qt.DescendingOrder)
+        layout.addWidget(self.table)
+
+        buttons = QtWidgets.QHBoxLayout()
+        for text, func in (('Select problem verts', self.selectFn), ('Enforce max influences', self.enforceFn),
+                           ('Save JSON', self.saveFn), ('Close', self.close)):
+            button = QtWidgets.QPushButton(text, self)
+            button.clicked.connect(func)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+    def selectedReports(self):
+        rows = sorted(set(self.table.item(index.row(), 0).data(QtCore.Qt.UserRole)
+                          for index in self.table.selectedIndexes()))
+        return [self.reports[row] for row in rows] or self.reports
+
+    def selectFn(self):
+        comps = []
+        for report in self.selectedReports():
+            verts = np.union1d(report.overMax, report.unnormalized)
+            comps.extend('{}.vtx[{}]'.format(report.mesh, v) for v in verts)
+        if comps:
+            cmds.select(comps, r=1)
+
+    def enforceFn(self):
+        parent = self.parent()
+        reports = self.selectedReports()
+        with parent.batchOperation('enforce max influences'):
+            fixed = skinwrangleraudit.enforceMaxInfluences(reports)
+        om2.MGlobal.displayInfo('[skinWrangler] Enforced max influences on {} skinClusters'.format(len(fixed)))
+
+    def saveFn(self):
+        path = QtWidgets.QFileDialog.getSaveFileName(self, 'Save Audit', '', 'JSON (*.json)')[0]
+        if path:
+            skinwrangleraudit.reportsToJson(self.reports, str(path))
+
+
 ########################################################################
 ## SKIN WRANGLER
 ########################################################################
@@ -71,13 +144,28 @@ class SkinWrangler(QtWidgets.QDialog):
     currentMesh = None
     currentSkin = None
     currentInf = None
-    currentVerts = None
     currentNormalization = None
+    session = None
 
     scriptJobNum = None
     copyCache = None
+    blendCopy = None
+
+    # refreshes run / skipped while a batch operation was running, exposed for tests
+    refreshCount = 0
+    suppressedRefreshCount = 0
+    batchDepth = 0
 
-    jointLoc = None
+    # (skinCluster, {influence: total abs change}) of the last compare, shown in the DIFF column
+    diffTotals = None
+    # per refresh data the influence rows are built from, the hierarchy view populates lazily out of it
+    listState = None
+    auditDialog = None
+    rpcServer = None
+    # [(SkinData, SharedArrays, process, rowsHash at publish)] of the out of process smooth being solved
+    workers = None
+
+    INDEX_ROLE = QtCore.Qt.UserRole + 1
 
     iconLib = {}
     iconPath = os.path.join(os.environ.get('MAYA_LOCATION', ""), "icons")
@@ -103,30 +191,66 @@ class SkinWrangler(QtWidgets.QDialog):
         self.ui.selShrinkBTN.clicked.connect(self.selShrinkFn)
         self.ui.selLoopBTN.clicked.connect(self.selLoopFn)
         self.ui.selPointsEffectedBTN.clicked.connect(self.selPointsEffectedFn)
+        self.ui.affectedThresholdSLD.valueChanged.connect(self.affectedThresholdChanged)
         self.ui.weightZeroBTN.clicked.connect(self.weightZeroFn)
         self.ui.weightHalfBTN.clicked.connect(self.weightHalfFn)
         self.ui.weightFullBTN.clicked.connect(self.weightFullFn)
         self.ui.setWeightBTN.clicked.connect(self.setWeightFn)
         self.ui.plusWeightBTN.clicked.connect(self.plusWeightFn)
         self.ui.minusWeightBTN.clicked.connect(self.minusWeightFn)
+        self.ui.multWeightBTN.clicked.connect(self.multWeightFn)
+        self.ui.divWeightBTN.clicked.connect(self.divWeightFn)
+        self.ui.scaleWeightBTN.clicked.connect(self.scaleWeightFn)
         self.ui.copyBTN.clicked.connect(self.copyFn)
         self.ui.pasteBTN.clicked.connect(self.pasteFn)
         self.ui.selectVertsWithInfBTN.clicked.connect(self.selectVertsWithInfFn)
         self.ui.setAverageWeightBTN.clicked.connect(self.setAverageWeightFn)
         self.ui.jointLST.itemSelectionChanged.connect(self.jointListSelChanged)
         self.ui.listAllCHK.stateChanged.connect(self.listAllChanged)
+        self.ui.hierarchyCHK.stateChanged.connect(self.listAllChanged)
+        self.ui.jointLST.itemExpanded.connect(self.fetchInfluenceChildren)
         self.ui.nameSpaceCHK.stateChanged.connect(self.cutNamespace)
-        self.ui.skinNormalCMB.currentIndexChanged.connect(self.skinNormalFn)
-        self.ui.filterLINE.returnPressed.connect(self.refreshUI)
+        # activated only fires on a user pick, refreshUI syncing the combo must not write or repair weights
+        self.ui.skinNormalCMB.activated.connect(self.skinNormalFn)
+        self.ui.longNamesCHK.stateChanged.connect(self.cutNamespace)
+        self.ui.filterLINE.textChanged.connect(self.filterChanged)
         self.ui.filterBTN.clicked.connect(self.refreshUI)
+        self.ui.lockFilteredBTN.clicked.connect(lambda: self.lockFilteredFn(True))
+        self.ui.unlockFilteredBTN.clicked.connect(lambda: self.lockFilteredFn(False))
         self.ui.clampInfBTN.clicked.connect(self.clampInfFn)
         self.ui.bindPoseBTN.clicked.connect(self.bindPoseFn)
+        self.ui.auditBindPoseBTN.clicked.connect(self.auditBindPoseFn)
+        self.ui.auditSceneBTN.clicked.connect(self.auditSceneFn)
+        self.ui.checkNormalizedBTN.clicked.connect(self.checkNormalizedFn)
+        self.ui.rpcServerCHK.toggled.connect(self.rpcServerFn)
+        self.ui.normalizeRowsBTN.clicked.connect(lambda: self.normalizeRowsFn())
         self.ui.removeUnusedBTN.clicked.connect(self.removeUnusedFn)
         self.ui.addJntBTN.clicked.connect(self.addJntFn)
         self.ui.jointOnBboxCenterBTN.clicked.connect(self.jointOnBboxCenterFn)
+        self.ui.prepEngineBTN.clicked.connect(self.prepEngineFn)
+        self.ui.falloffBTN.clicked.connect(self.falloffFn)
+        self.ui.roughBindBTN.clicked.connect(self.roughBindFn)
+        self.ui.transferBTN.clicked.connect(self.transferFn)
+        self.ui.compareBTN.clicked.connect(self.compareFn)
+        self.ui.exportWeightsBTN.clicked.connect(self.exportWeightsFn)
+        self.ui.snapshotBTN.clicked.connect(self.snapshotFn)
+        self.ui.restoreSnapshotBTN.clicked.connect(self.restoreSnapshotFn)
+        self.ui.snapshotCapSPIN.valueChanged.connect(self.snapshotCapChanged)
+        self.ui.blendSetBTN.clicked.connect(lambda: self.blendArithmeticFn('set'))
+        self.ui.blendAddBTN.clicked.connect(lambda: self.blendArithmeticFn('add'))
+        self.ui.blendSubBTN.clicked.connect(lambda: self.blendArithmeticFn('add', -1.0))
+        self.ui.blendScaleBTN.clicked.connect(lambda: self.blendArithmeticFn('scale'))
+        self.ui.blendSmoothBTN.clicked.connect(self.blendSmoothFn)
+        self.ui.blendCopyBTN.clicked.connect(self.blendCopyFn)
+        self.ui.blendPasteBTN.clicked.connect(self.blendPasteFn)
+        self.ui.blendPreviewCHK.toggled.connect(self.blendPreviewFn)
+        self.ui.rigidShellsBTN.clicked.connect(self.rigidShellsFn)
+        self.workerTimer = QtCore.QTimer(self)
+        self.workerTimer.setInterval(100)
+        self.workerTimer.timeout.connect(self.pollWorkers)
 
         logger.debug('skinWrangler initialized as {}'.format(self.objectName()))
-        self.scriptJobNum = cmds.scriptJob(e=['SelectionChanged', self.refreshUI], p=self.objectName(), kws=1)
+        self.scriptJobNum = cmds.scriptJob(e=['SelectionChanged', self.selectionChanged], p=self.objectName(), kws=1)
         self.refreshUI()
 
     def closeEvent(self, e):
@@ -134,8 +258,48 @@ class SkinWrangler(QtWidgets.QDialog):
             logger.debug('[skinWrangler] Killing scriptJob ({})'.format(str(self.scriptJobNum)))
             cmds.scriptJob(kill=self.scriptJobNum, force=1)
             self.scriptJobNum = None
+        if self.rpcServer:
+            self.rpcServer.stop()
+            self.rpcServer = None
+        self.stopWorkers()
+        skinwranglerdata.clearBlendPreview()
+        skinwranglerdata.clearCaches()
         self.removeAnnotations()
 
+    def selectionChanged(self):
+        """SelectionChanged scriptJob callback, ignored while a batch operation churns the selection"""
+        self.refreshUI()
+
+    @contextmanager
+    def batchOperation(self, name='batch'):
+        """
+        Guarded scope for internal batch work: the selection scriptJob can't trigger refreshes,
+        everything lands in one undo chunk, the user's selection is restored once at the end
+        and exactly one refresh is issued when the outermost scope exits.
+        """
+        outermost = not self.batchDepth
+        if outermost:
+            selection = cmds.ls(sl=1, long=True)
+            cmds.undoInfo(openChunk=True, chunkName='skinWrangler ' + name)
+        self.batchDepth += 1
+        try:
+            yield
+        finally:
+            try:
+                self.batchDepth -= 1
+                if outermost:
+                    # the batch may have deleted or renamed selected nodes
+                    selection = [node for node in selection if cmds.objExists(node)]
+                    if selection:
+                        cmds.select(selection, r=1)
+                    else:
+                        cmds.select(cl=1)
+            finally:
+                if outermost:
+                    cmds.undoInfo(closeChunk=True)
+            if outermost:
+                self.refreshUI()
+
     def averageWeights(self, weights):
         try:
             return sum(weights) / len(weights)
@@ -143,57 +307,7 @@ class SkinWrangler(QtWidgets.QDialog):
             return 0.0
 
     def findRelatedSkinCluster(self, skinObject):
-        """Python implementation of MEL command: http://takkun.nyamuuuu.net/blog/archives/592"""
-
-        skinShape = None
-        skinShapeWithPath = None
-        hiddenShape = None
-        hiddenShapeWithPath = None
-
-        cpTest = cmds.ls(skinObject, typ="controlPoint")
-        if len(cpTest):
-            skinShape = skinObject
-
-        else:
-            rels = cmds.listRelatives(skinObject)
-            if rels is None:
-                return False
-            for r in rels:
-                cpTest = cmds.ls("|".join([skinObject, r]), typ="controlPoint")
-                if len(cpTest) == 0:
-                    continue
-
-                io = cmds.getAttr('{}|{}.io'.format(skinObject, r))
-                if io:
-                    continue
-
-                visible = cmds.getAttr("{}|{}.v".format(skinObject, r))
-                if not visible:
-                    hiddenShape = r
-                    hiddenShapeWithPath = "{}|{}".format(skinObject, r)
-                    continue
-
-                skinShape = r
-                skinShapeWithPath = "{}|{}".format(skinObject, r)
-                break
-
-        if skinShape:
-            if len(skinShape) == 0:
-                if len(hiddenShape) == 0:
-                    return None
-
-                else:
-                    skinShape = hiddenShape
-                    skinShapeWithPath = hiddenShapeWithPath
-
-        clusters = cmds.ls(typ="skinCluster")
-        for c in clusters:
-            geom = cmds.skinCluster(c, q=True, g=True)
-            for g in geom:
-                if g == skinShape or g == skinShapeWithPath:
-                    return c
-
-        return None
+        return skinwranglerdata.findRelatedSkinCluster(skinObject)
 
     # annotation
     def removeAnnotations(self):
@@ -219,57 +333,69 @@ class SkinWrangler(QtWidgets.QDialog):
         # check to make sure a mesh is selected
         msh = cmds.ls(sl=1, o=1, type='mesh')
         if msh:
-            skin = self.findRelatedSkinCluster(msh[0])
-            if not skin:
-                cmds.warning('Cannot find a skinCluster related to [' + msh + ']')
+            # group every selected component by skinCluster, one cached weight block per cluster
+            session = skinwranglerdata.SkinSession.fromSelection()
+            if not session:
                 return False
-            self.currentSkin = skin
-            self.currentMesh = msh[0]
+            self.session = session
+            self.currentSkin = session.skins[0]
+            self.currentMesh = session.meshes[0]
             cmds.selectMode(component=1)
-            sel = cmds.ls(sl=1, flatten=1)
-            if sel:
-                msh = msh[0]
-                vtx = None
-                if sel != msh:
-                    if sel:
-                        vtx = len(sel)
-                    else:
-                        vtx = 0
-                self.currentVerts = sel
-
-                return sel, msh, vtx, skin
+            return session
         else:
             logger.info('Please select a mesh.')
             return False
 
-    def getAvgVertWeights(self, sel, skin):
-        """
-        Returns an averaged weight dictionary
-        """
-        wDict = {}
-        for jnt in cmds.skinCluster(skin, q=1, wi=1):
-            amt = cmds.skinPercent(skin, sel, q=1, t=jnt)
-            if amt > 0.0: wDict[jnt] = amt
-        return wDict
-
-    def vDictToTv(self, wDict):
-        re = []
-        for inf in wDict.keys():
-            re.append((inf, wDict[inf]))
-        return re
-
     def skinNormalFn(self, n):
-        if n == 0:
-            cmds.setAttr("{0}.normalizeWeights".format(self.currentSkin), n)
-            self.currentNormalization = 'None'
-        elif n == 1:
-            cmds.setAttr("{0}.normalizeWeights".format(self.currentSkin), n)
-            self.currentNormalization = 'Interactive'
-        elif n == 2:
-            cmds.setAttr("{0}.normalizeWeights".format(self.currentSkin), n)
-            self.currentNormalization = 'Post'
+        """User pick in skinNormalCMB, applies the mode to every skinCluster in the session"""
+        skins = self.session.skins if self.session else [self.currentSkin] if self.currentSkin else []
+        if n in (0, 1, 2) and skins:
+            modes = dict((skin, cmds.getAttr("{0}.normalizeWeights".format(skin))) for skin in skins)
+            # only a real switch back, skins already Interactive don't count
+            switched = [skin for skin in skins if n == 1 and modes[skin] != 1]
+            for skin in skins:
+                if modes[skin] != n:
+                    cmds.setAttr("{0}.normalizeWeights".format(skin), n)
+            self.currentNormalization = ['None', 'Interactive', 'Post'][n]
+            if switched and self.ui.autoNormalizeCHK.isChecked():
+                self.normalizeRowsFn(skins=switched)
+                return
         self.refreshUI()
 
+    def unnormalizedRows(self, data):
+        """Vertices of the whole mesh whose weights don't sum to 1, from the cached sparse weights"""
+        return skinwranglerops.unnormalizedRows(data.meshWeights().rowSums(), self.ui.normalizeTolSPIN.value())
+
+    def checkNormalizedFn(self):
+        """Selects every vertex of the selected meshes whose weights don't sum to 1"""
+        if not self.session:
+            cmds.warning('[skinWrangler] No skinned mesh selected')
+            return
+        comps = []
+        for data in self.session.clusters:
+            comps.extend(data.components(self.unnormalizedRows(data)))
+        om2.MGlobal.displayInfo('[skinWrangler] {} unnormalized vertices'.format(len(comps)))
+        if comps:
+            cmds.select(comps, r=1)
+
+    def normalizeRowsFn(self, skins=None):
+        """Renormalizes every unnormalized vertex of the selected meshes around their locked influences, one write each"""
+        if not self.session:
+            cmds.warning('[skinWrangler] No skinned mesh selected')
+            return
+
+        def op(data):
+            if skins is not None and data.skin not in skins:
+                return None
+            rows = self.unnormalizedRows(data)
+            if not len(rows):
+                return None
+            logger.info('[skinWrangler] Normalizing {} vertices of {}'.format(len(rows), data.mesh))
+            return rows, skinwranglerops.normalizeRows(data.meshWeights()[rows],
+                                                       locked=data.locked())
+
+        self.applyWeightOp(op, 'normalize rows')
+
     ## POLY SELECTION UI
     ########################################################################
     def selGrowFn(self):
@@ -284,10 +410,22 @@ class SkinWrangler(QtWidgets.QDialog):
     def selLoopFn(self):
         cmds.polySelectSp(loop=1)
 
+    def affectedThreshold(self):
+        return self.ui.affectedThresholdSLD.value() / 100.0
+
+    def affectedThresholdChanged(self, value):
+        self.ui.affectedThresholdLBL.setText('> {:.2f}'.format(self.affectedThreshold()))
+
     def selPointsEffectedFn(self):
-        if self.current is None or self.currentInf is None:
+        if not self.session or not self.currentInf:
             return
-        cmds.skinCluster(self.currentSkin, e=1, selectInfluenceVerts=self.currentInf)
+        # answered from the cached column index, no selectInfluenceVerts round trip
+        comps = self.session.influenceComponents(self.currentInf, self.affectedThreshold())
+        if comps:
+            cmds.select(comps)
+        else:
+            cmds.warning('[skinWrangler] No vertices weighted above {:.2f} to {}'.format(self.affectedThreshold(),
+                                                                                        self.currentInf))
 
     ## JOINT LIST
     ########################################################################
@@ -296,7 +434,7 @@ class SkinWrangler(QtWidgets.QDialog):
         # TODO: Need to use/store long paths or API pointers here as extra data on the widgets
         try:
             self.currentWidgets = self.ui.jointLST.selectedItems()
-            nodes = [item.text(0) for item in self.currentWidgets]
+            nodes = [self.influenceFromItem(item) for item in self.currentWidgets]
             if nodes:
                 if nodes[0] == 'MAKE A COMPONENT\n SELECTION ON\n SKINNED MESH':
                     self.currentInf = []
@@ -317,12 +455,61 @@ class SkinWrangler(QtWidgets.QDialog):
         except Exception as e:
             cmds.error(e)
 
+    def influenceFromItem(self, item):
+        """The full influence name is stored on the item, the text may have its namespace stripped"""
+        return item.data(0, QtCore.Qt.UserRole) or item.text(0)
+
+    def listItems(self):
+        """Every populated row of jointLST, depth first"""
+        stack = [self.ui.jointLST.topLevelItem(i) for i in reversed(range(self.ui.jointLST.topLevelItemCount()))]
+        while stack:
+            item = stack.pop()
+            yield item
+            stack.extend(item.child(i) for i in reversed(range(item.childCount())))
+
     def getJointFromList(self, jnt):
-        for i in range(0, self.ui.jointLST.topLevelItemCount()):
-            item = self.ui.jointLST.topLevelItem(i)
-            if item.text(0) == jnt: return item
+        tree = self.listState['tree'] if self.listState else None
+        if tree is not None and jnt in self.listState['names'].lookup:
+            # populate and expand the branch down to the influence first
+            for node in tree.ancestors(self.listState['names'].lookup[jnt]):
+                parent = next((item for item in self.listItems() if item.data(0, self.INDEX_ROLE) == node), None)
+                if parent is None:
+                    return False
+                self.fetchInfluenceChildren(parent)
+                parent.setExpanded(True)
+        for item in self.listItems():
+            if self.influenceFromItem(item) == jnt: return item
         return False
 
+    def filterChanged(self, *args):
+        """Live filter, hides rows through the session's name index without touching the scene"""
+        if not self.session:
+            return
+        names = self.session.nameIndex()
+        text = str(self.ui.filterLINE.text())
+        matches = set(names.filter(text, self.ui.longNamesCHK.isChecked()))
+        tree = self.listState['tree'] if self.listState else None
+        if tree is not None and text:
+            # keep the branches leading to a match visible
+            mask = np.zeros(len(tree))
+            mask[list(matches)] = 1.0
+            matches = set(np.nonzero(tree.totals(mask))[0].tolist())
+        for item in self.listItems():
+            index = names.lookup.get(self.influenceFromItem(item))
+            item.setHidden(index is not None and index not in matches)
+
+    def lockFilteredFn(self, locked=True):
+        """Locks or unlocks every influence matching the filter, one skinCluster edit per cluster"""
+        if not self.session:
+            cmds.warning('[skinWrangler] No skinned mesh selected')
+            return
+        names = self.session.nameIndex()
+        text = str(self.ui.filterLINE.text())
+        matches = [names.names[i] for i in names.filter(text, self.ui.longNamesCHK.isChecked())]
+        with self.batchOperation('lock influences' if locked else 'unlock influences'):
+            for skin in self.session.skins:
+                skinwranglerdata.setLocks(skin, matches, locked)
+
     def listAllChanged(self):
         self.refreshUI()
 
@@ -331,89 +518,119 @@ class SkinWrangler(QtWidgets.QDialog):
 
     ## SKINNING FUNCTIONS
     ########################################################################
+    def isNormalizing(self):
+        return self.currentNormalization == 'Interactive'
+
+    def applyWeightOp(self, func, name='weight op', session=None, blend=False):
+        """
+        Runs func(data) -> weights over every skinCluster in the session and commits
+        the results with one write per cluster, in a single undo chunk and a single refresh.
+        blend=True does the same for the dual quaternion blend weights.
+        """
+        session = session or self.session
+        if not session:
+            cmds.warning('[skinWrangler] No skinned vertices selected')
+            return False
+        try:
+            with self.batchOperation(name):
+                if blend:
+                    session.applyBlend(func)
+                else:
+                    session.apply(func)
+        except Exception:
+            logger.error('Failed to apply {}'.format(name), exc_info=True)
+            return False
+        if blend:
+            self.refreshBlendPreview()
+        return True
+
+    def influenceOp(self, func, name):
+        """Wraps func(weights, cols, locked) as a session op on the selected influences"""
+        if not self.currentInf:
+            cmds.warning('[skinWrangler] No influences/joints selected')
+            return False
+        infs = self.currentInf
+        if self.session:
+            columns = [self.session.influences.index(inf) for inf in infs if inf in self.session.influences]
+            if columns and self.session.lockMask()[columns].all():
+                cmds.warning('[skinWrangler] The selected influences are locked')
+                return False
+
+        def op(data):
+            cols = data.localColumns(infs)
+            if not len(cols):
+                return None
+            return func(data.weights, cols, data.locked())
+
+        return self.applyWeightOp(op, name)
+
+    def setInfluenceWeights(self, value, normalize=None):
+        """Sets the selected influences to value on every selected vertex of every selected mesh"""
+        if normalize is None:
+            normalize = self.isNormalizing()
+        return self.influenceOp(lambda weights, cols, locked: skinwranglerops.setColumns(
+            weights, cols, value, normalize=normalize, locked=locked), 'set weight')
+
+    def weightArithmetic(self, op, value, target=0.0):
+        """add/subtract/multiply/divide/scale the selected influence columns, see skinwranglerops.arithmetic"""
+        if op == 'divide' and value == 0.0:
+            cmds.warning('[skinWrangler] Cannot divide weights by zero')
+            return False
+        normalize = self.isNormalizing()
+        return self.influenceOp(lambda weights, cols, locked: skinwranglerops.arithmetic(
+            weights, cols, op, value, target, normalize=normalize, locked=locked), op + ' weight')
+
     def weightZeroFn(self):
         if self.currentInf:
-            for inf in self.currentInf:
-                cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[inf, 0.0])
-            self.refreshUI()
+            self.setInfluenceWeights(0.0)
 
     def weightHalfFn(self):
         if self.currentInf:
             num = len(self.currentInf)
-            if num == 1:
-                cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[str(self.currentInf[0]), 0.5])
-            elif num == 2:
-                cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[str(self.currentInf[0]), 1.0])
-                cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[str(self.currentInf[1]), 0.5])
-            elif num > 2:
-                if self.currentNormalization != 'None':
-                    cmds.warning('skinWrangler: Cannot skin more than two influences to 0.5 in a normalization mode')
-                    return None
-                else:
-                    for inf in self.currentInf:
-                        cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[inf, 0.5])
-            self.refreshUI()
+            if num > 2 and self.currentNormalization != 'None':
+                cmds.warning('skinWrangler: Cannot skin more than two influences to 0.5 in a normalization mode')
+                return None
+            self.setInfluenceWeights(0.5)
 
     def weightFullFn(self):
         num = 0
         if self.currentInf:
             num = len(self.currentInf)
         if num == 1:
-            cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[self.currentInf[0], 1.0])
+            self.setInfluenceWeights(1.0)
         elif num > 1:
             if self.currentNormalization != 'None':
                 cmds.warning('skinWrangler: Cannot skin more than two influences to 1.0 in a normalization mode')
                 return None
-        self.refreshUI()
+            self.setInfluenceWeights(1.0)
 
     def setWeightFn(self):
-        if self.currentInf:
-            if len(self.currentInf) > 1:
-                cmds.warning(
-                    'skinWrangler: Set Weight does not work with multi-selection because I am too lazy at the moment to write my own normalization code.')
-            else:
-                cmds.skinPercent(self.currentSkin, self.currentVerts,
-                                 tv=[self.currentInf[0], self.ui.setWeightSpin.value()])
-            self.refreshUI()
-        else:
-            cmds.warning('[skinWrangler] No influences/joints selected')
+        # multiple influences all get the value, normalization scales them down if they don't fit
+        self.setInfluenceWeights(self.ui.setWeightSpin.value())
 
     def plusWeightFn(self):
-        try:
-            cmds.undoInfo(openChunk=True)
-            val = self.ui.setWeightSpin.value()
-            if self.currentInf:
-                for inf in self.currentInf:
-                    cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[inf, val], r=1)
-            else:
-                cmds.warning('[skinWrangler] No influences/joints selected')
-            self.refreshUI()
-        except Exception:
-            logger.error("Failed to add weight", exc_info=True)
-        finally:
-            cmds.undoInfo(closeChunk=True)
+        self.weightArithmetic('add', self.ui.setWeightSpin.value())
 
     def minusWeightFn(self):
-        try:
-            cmds.undoInfo(openChunk=True)
-            val = -self.ui.setWeightSpin.value()
-            if self.currentInf:
-                for inf in self.currentInf:
-                    cmds.skinPercent(self.currentSkin, self.currentVerts, tv=[inf, val], r=1)
-            else:
-                cmds.warning('[skinWrangler] No influences/joints selected')
-            self.refreshUI()
-        except Exception:
-            logger.error("Failed to minus weight", exc_info=True)
-        finally:
-            cmds.undoInfo(closeChunk=True)
+        self.weightArithmetic('subtract', self.ui.setWeightSpin.value())
+
+    def multWeightFn(self):
+        self.weightArithmetic('multiply', self.ui.scaleWeightSpin.value())
+
+    def divWeightFn(self):
+        self.weightArithmetic('divide', self.ui.scaleWeightSpin.value())
+
+    def scaleWeightFn(self):
+        # scale the selected weights toward the SET WEIGHT value
+        self.weightArithmetic('scale', self.ui.scaleWeightSpin.value(), target=self.ui.setWeightSpin.value())
 
     def copyFn(self):
         if self.ui.copyBTN.isChecked():
             self.ui.copyBTN.setText('WEIGHTS COPIED')
             self.ui.copyBTN.setStyleSheet("background-color: #7a4242")
-            self.getSelected()
-            self.copyCache = self.getAvgVertWeights(self.currentVerts, self.currentSkin)
+            if not self.getSelected():
+                return
+            self.copyCache = self.session.averageDict()
             toolTip = ''
             for item in self.copyCache.keys():
                 toolTip += (item + ' - ' + str("%.4f" % self.copyCache[item]) + '\n')
@@ -429,215 +646,825 @@ class SkinWrangler(QtWidgets.QDialog):
         if not self.getSelected():
             om2.MGlobal.displayError("No mesh selected, please select a mesh")
             return
-        tvTuples = self.vDictToTv(self.copyCache)
-        logger.debug('[skinWrangler] Pasting weights to current selection: {}'.format(tvTuples))
-        cmds.skinPercent(self.currentSkin, self.currentVerts, tv=tvTuples)
-        self.refreshUI()
+        if not self.copyCache:
+            cmds.warning('[skinWrangler] No weights copied')
+            return
+        logger.debug('[skinWrangler] Pasting weights to current selection: {}'.format(self.copyCache))
+        copyCache = self.copyCache
+        normalize = self.isNormalizing()
+
+        def op(data):
+            row = np.array([copyCache.get(inf, 0.0) for inf in data.influences])
+            if not row.any():
+                return None
+            return skinwranglerops.setRows(data.weights, row, normalize=normalize, locked=data.locked())
+
+        self.applyWeightOp(op, 'paste')
+
+    ## BLEND WEIGHTS
+    ########################################################################
+    def blendArithmeticFn(self, op, sign=1.0):
+        """set/add/scale the dual quaternion blend weights of the selected vertices by the BLEND value"""
+        value = self.ui.blendValueSPIN.value() * sign
+        self.applyWeightOp(lambda data: skinwranglerops.blendArithmetic(data.blendWeights(), op, value),
+                           op + ' blend weight', blend=True)
+
+    def blendSmoothFn(self):
+        """Smooths the blend weights of the selected vertices over the mesh with the SMOOTH tab settings"""
+        strength = self.ui.smoothStrengthSPIN.value()
+        iterations = self.ui.smoothIterSPIN.value()
+        implicit = self.ui.smoothImplicitCHK.isChecked()
+        pinBorder = self.ui.smoothPinBorderCHK.isChecked()
+
+        def op(data):
+            adjacency = data.adjacency()
+            pinned = adjacency.border(data.indices) if pinBorder else None
+            return skinwranglerops.smoothValues(data.meshBlendWeights(), adjacency, data.indices, strength=strength,
+                                                iterations=iterations, implicit=implicit, pinned=pinned)
+
+        self.applyWeightOp(op, 'smooth blend weight', blend=True)
+
+    def blendCopyFn(self):
+        if self.ui.blendCopyBTN.isChecked():
+            if not self.getSelected():
+                self.ui.blendCopyBTN.setChecked(False)
+                return
+            self.blendCopy = self.session.averageBlendWeight()
+            self.ui.blendCopyBTN.setText('COPIED {:.3f}'.format(self.blendCopy))
+            self.ui.blendCopyBTN.setStyleSheet("background-color: #7a4242")
+        else:
+            self.ui.blendCopyBTN.setText('COPY')
+            self.ui.blendCopyBTN.setStyleSheet("background-color: #666666")
+            self.blendCopy = None
+
+    def blendPasteFn(self):
+        if self.blendCopy is None:
+            cmds.warning('[skinWrangler] No blend weight copied')
+            return
+        if not self.getSelected():
+            om2.MGlobal.displayError("No mesh selected, please select a mesh")
+            return
+        value = self.blendCopy
+        self.applyWeightOp(lambda data: skinwranglerops.blendArithmetic(data.blendWeights(), 'set', value),
+                           'paste blend weight', blend=True)
+
+    def refreshBlendPreview(self):
+        """Recolors every mesh of the session with its blend weights when the preview is on"""
+        if not self.ui.blendPreviewCHK.isChecked() or not self.session:
+            return
+        for data in self.session.clusters:
+            values = data.meshBlendWeights()
+            skinwranglerdata.previewBlendWeights(data.mesh, np.arange(len(values)), values)
+
+    def blendPreviewFn(self, enabled):
+        if enabled:
+            self.refreshBlendPreview()
+        else:
+            skinwranglerdata.clearBlendPreview()
+
+    def prepEngineFn(self):
+        """Prune, clamp and quantize the whole of every selected mesh, then select the worst offenders"""
+        if not self.session:
+            cmds.warning('[skinWrangler] No skinned mesh selected')
+            return
+        bits = 16 if self.ui.prepBitsCMB.currentIndex() else 8
+        maxInf = self.ui.prepMaxInfSPIN.value()
+        epsilon = self.ui.prepEpsilonSPIN.value()
+        report = []
+
+        def op(data):
+            # chunked over the used columns, then one write of just those columns
+            columns, weights, maxError, meanError = skinwranglerops.prepareSparseForEngine(
+                data.meshWeights(), maxInf, epsilon, bits, locked=data.locked())
+            if len(columns):
+                skinwranglerdata.writeWeights(data.skin, data.mesh, data.indices, weights, columns)
+            report.append((data, maxError, meanError))
+            return None
+
+        if not self.applyWeightOp(op, 'prepare for engine', session=self.session.wholeMeshes()) or not report:
+            return
+        maxError = np.concatenate([r[1] for r in report])
+        meanError = np.concatenate([r[2] for r in report])
+        self.ui.prepErrorLBL.setText('MAX ERR: {:.4f}  MEAN ERR: {:.5f}'.format(maxError.max(), meanError.mean()))
+        logger.info('[skinWrangler] Prepared {} vertices for engine ({} bit, {} inf), max error {:.5f}, mean {:.6f}'
+                    .format(len(maxError), bits, maxInf, maxError.max(), meanError.mean()))
+
+        # worst offenders across every mesh
+        worst = self.ui.prepWorstSPIN.value()
+        if worst:
+            offsets = np.cumsum([0] + [len(r[1]) for r in report])
+            order = np.argsort(-maxError)[:worst]
+            order = order[maxError[order] > 0.0]
+            comps = []
+            for i, (data, _, _) in enumerate(report):
+                rows = order[(order >= offsets[i]) & (order < offsets[i + 1])] - offsets[i]
+                comps.extend(data.components(data.indices[rows]))
+            if comps:
+                cmds.select(comps)
 
     def selectVertsWithInfFn(self):
-        self.checkMaxSkinInfluences(self.currentMesh, self.ui.selectVertsWithInfSPIN.value(), select=1)
+        if not self.session:
+            return
+        comps = []
+        for mesh in self.session.meshes:
+            verts = self.checkMaxSkinInfluences(mesh, self.ui.selectVertsWithInfSPIN.value())
+            comps.extend('{}.vtx[{}]'.format(mesh, v) for v in verts)
+        if comps:
+            cmds.select(comps, r=1)
+        else:
+            cmds.select(cl=1)
 
     def setAverageWeightFn(self):
+        """Laplacian smoothing of the selected vertices over the mesh adjacency, one write per skinCluster"""
+        strength = self.ui.smoothStrengthSPIN.value()
+        iterations = self.ui.smoothIterSPIN.value()
+        implicit = self.ui.smoothImplicitCHK.isChecked()
+        pinBorder = self.ui.smoothPinBorderCHK.isChecked()
+        maxInf = self.ui.clampInfSPIN.value() if self.ui.avgOptionCHK.isChecked() else None
+        infs = self.currentInf if self.ui.smoothSelInfCHK.isChecked() else None
+        if self.ui.smoothSelInfCHK.isChecked() and not infs:
+            cmds.warning('[skinWrangler] No influences/joints selected to smooth')
+            return
+
+        def solverArgs(data):
+            adjacency = data.adjacency()
+            columns = data.localColumns(infs) if infs else None
+            if infs and not len(columns):
+                return None
+            pinned = adjacency.border(data.indices) if pinBorder else None
+            return adjacency, columns, pinned, data.locked()
+
+        if self.ui.smoothProcessCHK.isChecked() and skinwranglershared.AVAILABLE:
+            self.startSmoothWorkers(solverArgs, strength, iterations, implicit, maxInf)
+            return
+
+        def op(data):
+            args = solverArgs(data)
+            if args is None:
+                return None
+            adjacency, columns, pinned, locked = args
+            return skinwranglerops.laplacianSmooth(data.meshWeights(), adjacency, data.indices, strength=strength,
+                                                   iterations=iterations, implicit=implicit, columns=columns,
+                                                   pinned=pinned, maxInfluences=maxInf, locked=locked)
+
+        self.applyWeightOp(op, 'smooth')
+
+    def startSmoothWorkers(self, solverArgs, strength, iterations, implicit, maxInf):
+        """
+        Publishes every cluster of the session to shared memory and starts one solver process each.
+        Maya stays responsive, workerTimer polls them and pollWorkers commits the results.
+        """
+        if not self.session:
+            cmds.warning('[skinWrangler] No skinned vertices selected')
+            return
+        if self.workers:
+            cmds.warning('[skinWrangler] A smooth is still solving')
+            return
+        jobs = []
         try:
-            cmds.undoInfo(openChunk=True)
-            if not self.ui.avgOptionCHK.isChecked():
-                mel.eval('weightHammerVerts;')
-            else:
-                sel = cmds.ls(sl=1)
-                cmds.ConvertSelectionToVertices()
-                newSel = cmds.ls(sl=1, flatten=1)
-                for vert in newSel:
-                    self.setAverageWeight(vert)
-                self.clampInfluences(self.currentMesh, self.ui.clampInfSPIN.value(), force=True)
-                cmds.select(sel)
-        except Exception as e:
-            cmds.error('skinWrangler: ' + str(e))
+            for data in self.session.clusters:
+                args = solverArgs(data)
+                if args is None:
+                    continue
+                adjacency, columns, pinned, locked = args
+                # the solver works on the shared block in place, only the result rows come back
+                shared = skinwranglerdata.publishSkin(data.skin, data.mesh, data.indices)
+                published = skinwranglerdata.rowsHash(data.skin, data.mesh, data.indices)
+                jobs.append((data, shared, None, published))
+                process = skinwranglershared.startWorker(skinwranglershared.smoothWorker, shared.name, strength,
+                                                         iterations, implicit, columns, pinned, maxInf, locked)
+                jobs[-1] = (data, shared, process, published)
+        except Exception:
+            logger.error('Failed to start the smooth solver', exc_info=True)
+            self.stopWorkers(jobs)
+            return
+        if not jobs:
+            return
+        self.workers = jobs
+        self.ui.setAverageWeightBTN.setEnabled(False)
+        self.workerTimer.start()
+
+    def pollWorkers(self):
+        """
+        workerTimer callback, once every solver finished their blocks are committed in one undo chunk.
+        Clusters whose rows were edited while solving are skipped, the result would overwrite the edit.
+        """
+        if any(job[2].is_alive() for job in self.workers):
+            return
+        self.workerTimer.stop()
+        jobs, self.workers = self.workers, None
+        self.ui.setAverageWeightBTN.setEnabled(True)
+        try:
+            blocks = {}
+            for data, shared, process, published in jobs:
+                try:
+                    skinwranglershared.checkWorker(process, 'smooth solver')
+                except RuntimeError as e:
+                    cmds.warning('[skinWrangler] {} on {}'.format(e, data.mesh))
+                    continue
+                if skinwranglerdata.rowsHash(data.skin, data.mesh, data.indices) != published:
+                    cmds.warning('[skinWrangler] Weights of {} changed while smoothing, '
+                                 'skipping its result'.format(data.mesh))
+                    continue
+                blocks[id(data)] = shared
+
+            def op(data):
+                skinwranglerdata.commitShared(blocks[id(data)], data.skin, data.mesh)
+                return None
+
+            if blocks:
+                session = skinwranglerdata.SkinSession(job[0] for job in jobs if id(job[0]) in blocks)
+                self.applyWeightOp(op, 'smooth', session=session)
         finally:
-            cmds.undoInfo(closeChunk=True)
-
-    def setAverageWeight(self, vtx):
-        msh = vtx.split('.')[0]
-        cmds.select(vtx)
-        cmds.ConvertSelectionToEdges()
-        cmds.ConvertSelectionToVertices()
-        neighbors = cmds.ls(sl=1, flatten=1)
-        neighbors.pop(neighbors.index(vtx))
-        infList = {}
-        skin = self.findRelatedSkinCluster(msh)
-        for vert in neighbors:
-            for jnt in cmds.skinCluster(skin, q=1, wi=1):
-                amt = cmds.skinPercent(skin, vert, q=1, t=jnt)
-                if amt > 0.0:
-                    if jnt in infList:
-                        infList[jnt].append(amt)
-                    else:
-                        infList[str(jnt)] = [amt]
-        for inf in infList:
-            total = None
-            for w in infList[inf]:
-                if not total:
-                    total = w
-                else:
-                    total += w
-            weight = total / len(infList[inf])
-            cmds.skinPercent(self.currentSkin, vtx, tv=[str(inf), weight], nrm=1)
+            self.stopWorkers(jobs)
+
+    def stopWorkers(self, jobs=None):
+        """Kills the given (or the running) solver processes and frees their shared blocks"""
+        if jobs is None:
+            jobs, self.workers = self.workers or [], None
+            self.workerTimer.stop()
+            self.ui.setAverageWeightBTN.setEnabled(True)
+        for data, shared, process, published in jobs:
+            if process is not None and process.is_alive():
+                process.terminate()
+            if process is not None:
+                process.join()
+            shared.close()
+
+    def rigidShellsFn(self):
+        """
+        Binds every shell touched by the selection rigidly: all its vertices get the dominant influence
+        or the average row of the whole shell. Shell labels are cached per mesh, one write per skinCluster.
+        """
+        mode = skinwranglerops.RIGID_MODES[self.ui.rigidModeCMB.currentIndex()]
+        infs = self.currentInf if self.ui.rigidSelInfCHK.isChecked() else None
+        if self.ui.rigidSelInfCHK.isChecked() and not infs:
+            cmds.warning('[skinWrangler] No influences/joints selected')
+            return
+        counts = []
+
+        def op(data):
+            columns = data.localColumns(infs) if infs else None
+            if infs and not len(columns):
+                return None
+            labels = data.shells()
+            shells = np.unique(labels[data.indices])
+            rows = np.nonzero(np.isin(labels, shells))[0]
+            counts.append(len(shells))
+            return rows, skinwranglerops.rigidShells(data.meshWeights()[rows], labels[rows], mode, columns,
+                                                     locked=data.locked())
+
+        if self.applyWeightOp(op, 'rigidify shells'):
+            self.ui.rigidShellsLBL.setText('{} shells'.format(sum(counts)))
+
+    def falloffFn(self):
+        """Fades the first selected influence out from the selected vertices over N rings or an edge distance"""
+        if not self.currentInf:
+            cmds.warning('[skinWrangler] No influences/joints selected')
+            return
+        inf = self.currentInf[0]
+        byDistance = self.ui.falloffModeCMB.currentIndex() == 1
+        radius = self.ui.falloffDistSPIN.value() if byDistance else self.ui.falloffRingsSPIN.value()
+        curve = str(self.ui.falloffCurveCMB.currentText())
+        normalize = self.isNormalizing()
+
+        def op(data):
+            cols = data.localColumns([inf])
+            if not len(cols):
+                return None
+            adjacency = data.adjacency()
+            if byDistance:
+                distance = skinwranglermesh.edgeDistance(adjacency, data.points(), data.indices, radius)
+                region = np.nonzero(np.isfinite(distance))[0]
+            else:
+                distance = skinwranglermesh.ringDistance(adjacency, data.indices, radius)
+                region = np.nonzero(distance >= 0)[0]
+            amount = skinwranglerops.falloff(distance[region], radius, curve)
+            weights = skinwranglerops.blendColumn(data.meshWeights()[region], cols[0], amount, normalize=normalize,
+                                                  locked=data.locked())
+            return region, weights
+
+        self.applyWeightOp(op, 'falloff')
+
+    def roughBindFn(self):
+        """
+        Rebinds the selected vertices to the selected influences by inverse distance to their bone segments,
+        keeping the closest N per vertex. One write per skinCluster, the rest of the mesh is untouched.
+        """
+        if not self.currentInf:
+            cmds.warning('[skinWrangler] No influences/joints selected')
+            return
+        infs = self.currentInf
+        maxInf = self.ui.bindMaxInfSPIN.value()
+        visible = self.ui.bindVisibleCHK.isChecked()
+        shells = self.ui.bindShellCHK.isChecked()
+
+        def op(data):
+            cols = data.localColumns(infs)
+            if not len(cols):
+                return None
+            starts, ends = skinwranglerdata.jointSegments([data.influences[c] for c in cols])
+            points = data.points()[data.indices]
+            distance = skinwranglermesh.segmentDistance(points, starts, ends)
+            allowed = None
+            if visible:
+                normals = skinwranglerdata.meshNormals(data.mesh)[data.indices]
+                allowed = skinwranglermesh.segmentFacing(points, normals, starts, ends)
+            if shells:
+                labels = data.shells()[data.indices]
+                nearest = skinwranglerops.shellNearest(labels, distance, maxInf)
+                allowed = nearest if allowed is None else allowed & nearest
+            values = skinwranglerops.proximityWeights(distance, maxInf, allowed=allowed)
+            return skinwranglerops.bindColumns(data.weights, cols, values, locked=data.locked())
+
+        self.applyWeightOp(op, 'rough bind')
+
+    def transferFn(self):
+        """
+        Copies weights from the first selected skinned mesh onto the second by closest point on the
+        source surface, interpolating the source rows barycentrically. Influences are matched by name
+        and the missing ones added to the target. Optionally only the selected target vertices.
+        """
+        if not self.session or len(self.session.clusters) < 2:
+            cmds.warning('[skinWrangler] Select the source skinned mesh, then the target mesh or its vertices')
+            return
+        source, target = self.session.clusters[0], self.session.clusters[1]
+        if self.ui.transferSelCHK.isChecked():
+            indices = target.indices
+        else:
+            indices = np.arange(om2.MFnMesh(skinwranglerdata.getDagPath(target.mesh)).numVertices)
+
+        start = time.time()
+        with self.batchOperation('transfer weights'):
+            indices, distance = skinwranglerdata.transferWeights(source.skin, source.mesh, target.skin, target.mesh,
+                                                                 indices)
+        logger.info('[skinWrangler] Transferred {} vertices in {:.2f}s, max distance {:.4f}'.format(
+            len(indices), time.time() - start, distance.max() if len(distance) else 0.0))
+
+    def exportWeightsFn(self):
+        """Saves the weights of the current skinCluster for later compares"""
+        if not self.currentSkin:
+            cmds.warning('[skinWrangler] No skinCluster to export')
+            return
+        path = QtWidgets.QFileDialog.getSaveFileName(None, 'Export Weights', '', 'Weights (*.npz)')[0]
+        if path:
+            skinwranglerdata.exportWeights(self.currentSkin, self.currentMesh, str(path))
+
+    def compareFn(self):
+        """
+        Diffs the weights of the first selected skinCluster against the second one, or against a
+        weight file when only one is selected. Selects the vertices changed beyond the tolerance and
+        shows the per influence change totals in the joint list.
+        """
+        if not self.session:
+            cmds.warning('[skinWrangler] No skinned mesh selected to compare')
+            return
+        skin, mesh = self.session.skins[0], self.session.meshes[0]
+        if len(self.session.skins) > 1:
+            otherNames = skinwranglerdata.influenceNames(self.session.skins[1])
+            other = skinwranglerdata.weightCache(self.session.skins[1], self.session.meshes[1]).sparse()
+        else:
+            path = QtWidgets.QFileDialog.getOpenFileName(None, 'Compare Weights', '', 'Weights (*.npz)')[0]
+            if not path:
+                return
+            otherNames, other = skinwranglerdata.loadWeightFile(str(path))
+
+        names, columns, otherColumns = skinwranglerindex.alignColumns(skinwranglerdata.influenceNames(skin),
+                                                                      otherNames)
+        try:
+            l1, linf, totals = skinwranglerindex.weightDiff(skinwranglerdata.weightCache(skin, mesh).sparse(), other,
+                                                            columns, otherColumns, len(names))
+        except ValueError as e:
+            cmds.warning('[skinWrangler] ' + str(e))
+            return
+
+        verts = np.nonzero(linf > self.ui.compareTolSPIN.value())[0]
+        self.diffTotals = (skin, dict(zip(names, totals)))
+        self.ui.compareLBL.setText('{} of {} verts differ, max {:.4f}, total {:.2f}'.format(
+            len(verts), len(linf), linf.max() if len(linf) else 0.0, l1.sum()))
+        if len(verts):
+            cmds.select(['{}.vtx[{}]'.format(mesh, v) for v in verts], r=1)
+        else:
+            self.refreshUI()
+
+    def refreshSnapshots(self):
+        ring = skinwranglerdata.snapshotRing()
+        self.ui.snapshotCMB.clear()
+        self.ui.snapshotCMB.addItems(list(reversed(ring.names())))
+        self.ui.snapshotLBL.setText('{} snaps, {:.1f} MB'.format(len(ring), ring.nbytes / 1048576.0))
+
+    def snapshotCapChanged(self, value):
+        evicted = skinwranglerdata.snapshotRing().setCap(value * 1048576)
+        if evicted:
+            logger.info('[skinWrangler] Dropped snapshots over the memory cap: {}'.format(', '.join(evicted)))
+        self.refreshSnapshots()
+
+    def snapshotFn(self):
+        """Snapshots the full weights of every selected skinCluster in memory"""
+        skins = list(zip(self.session.skins, self.session.meshes)) if self.session else []
+        if not skins and self.currentSkin:
+            skins = [(self.currentSkin, self.currentMesh)]
+        if not skins:
+            cmds.warning('[skinWrangler] No skinCluster to snapshot')
+            return
+        name, ok = QtWidgets.QInputDialog.getText(None, 'Snapshot', 'Enter snapshot name:',
+                                                  text='snap{:02d}'.format(len(skinwranglerdata.snapshotRing()) + 1))
+        if not ok:
+            return
+        compression = 'zlib' if self.ui.snapshotZlibCHK.isChecked() else 'float16'
+        evicted = []
+        for skin, mesh in skins:
+            label = str(name) if len(skins) == 1 else '{} ({})'.format(name, skin)
+            evicted.extend(skinwranglerdata.takeSnapshot(skin, mesh, label, compression))
+        if evicted:
+            logger.info('[skinWrangler] Dropped snapshots over the memory cap: {}'.format(', '.join(evicted)))
+        self.refreshSnapshots()
+
+    def restoreSnapshotFn(self):
+        """Restores the chosen snapshot, whole mesh or only the selected vertices, as one write"""
+        name = str(self.ui.snapshotCMB.currentText())
+        if name not in skinwranglerdata.snapshotRing():
+            cmds.warning('[skinWrangler] No snapshot to restore')
+            return
+        indices = None
+        if self.ui.restoreSelCHK.isChecked():
+            skin = skinwranglerdata.snapshotRing().get(name).skin
+            selected = [data.indices for data in (self.session.clusters if self.session else []) if data.skin == skin]
+            if not selected:
+                cmds.warning('[skinWrangler] No vertices of the snapshot\'s mesh selected')
+                return
+            indices = selected[0]
+        try:
+            with self.batchOperation('restore snapshot'):
+                skinwranglerdata.restoreSnapshot(name, indices)
+        except ValueError as e:
+            cmds.warning('[skinWrangler] ' + str(e))
+        self.refreshSnapshots()
 
     def checkMaxSkinInfluences(self, node, maxInf, debug=1, select=0):
-        """Takes node name string and max influences int.
-        From CG talk thread (MEL converted to Python, then added some things)"""
+        """Takes node name string and max influences int, returns the indices of the vertices over maxInf.
+        Counted from the cached sparse weights of the whole mesh in one pass."""
 
-        cmds.select(cl=1)
         skinClust = self.findRelatedSkinCluster(node)
-        if skinClust == "":
+        if not skinClust:
             cmds.error("checkSkinInfluences: can't find skinCluster connected to '" + node + "'.\n")
 
-        verts = cmds.polyEvaluate(node, v=1)
-        returnVerts = []
-        for i in range(0, verts):
-            inf = cmds.skinPercent(skinClust, (node + ".vtx[" + str(i) + "]"), q=1, v=1)
-            activeInf = []
-            for j in range(0, len(inf)):
-                if inf[j] > 0.0: activeInf.append(inf[j])
-            if len(activeInf) > maxInf:
-                returnVerts.append(i)
+        weights = skinwranglerdata.weightCache(skinClust, node).sparse()
+        returnVerts = np.nonzero(weights.rowCounts() > maxInf)[0].tolist()
 
         if select:
-            for vert in returnVerts:
-                cmds.select((node + '.vtx[' + str(vert) + ']'), add=1)
+            cmds.select(['{}.vtx[{}]'.format(node, v) for v in returnVerts], r=1)
         if debug:
             msg = """
             checkMaxSkinInfluences>>> Total Verts:{}
             checkMaxSkinInfluences>>> Vertices Over Threshold:{}
             checkMaxSkinInfluences>>> Indices:{}
-            """.format(verts, len(returnVerts), str(returnVerts))
+            """.format(weights.shape[0], len(returnVerts), str(returnVerts))
             logger.debug(msg)
 
         return returnVerts
 
     def checkLockedInfluences(self, skinCluster):
         """
-        Check if provided skinCluster has locked influences
+        Check if provided skinCluster has locked influences, from the cached lock mask
         """
-        influenceObjects = cmds.skinCluster(skinCluster, q=True, inf=True)
-        for currentJoint in influenceObjects:
-            if (cmds.skinCluster(skinCluster, q=True, lw=True, inf=currentJoint)):
-                return True
-        return False
+        return bool(skinwranglerdata.lockMask(skinCluster).any())
 
     def clampInfFn(self):
-        self.clampInfluences(self.currentMesh, self.clampInfSPIN.value(), force=True)
+        meshes = self.session.meshes if self.session else [self.currentMesh] if self.currentMesh else []
+        if not meshes:
+            cmds.warning('[skinWrangler] No skinned mesh selected')
+            return
+        with self.batchOperation('clamp influences'):
+            for mesh in meshes:
+                self.clampInfluences(mesh, self.ui.clampInfSPIN.value())
 
     def bindPoseFn(self):
         if self.currentSkin:
-            bp = cmds.listConnections(".".join([self.currentSkin, "bindPose"]), s=1)
-            if len(bp) > 0:
+            bp = skinwranglerdata.bindPoses(self.currentSkin)
+            if len(bp) == 1:
                 cmds.dagPose(bp[0], r=1)
-            else:
+            elif bp:
                 cmds.warning('Multiple bind poses detected: ' + str(bp))
+            else:
+                cmds.warning('No bind pose found for ' + self.currentSkin)
         else:
             cmds.warning('No skin cluster loaded or mesh with skin cluster selected.')
 
-    def removeUnusedFn(self):
-        if self.currentSkin:
-            cmds.skinCluster(self.currentMesh, removeUnusedInfluence=1)
-            self.refreshUI()
-        else:
-            cmds.warning('No skin cluster loaded or mesh with skin cluster selected.')
+    def auditBindPoseFn(self):
+        """Checks every skinCluster in the scene against its bind pose and offers bulk fixes"""
+        reports = skinwrangleraudit.auditBindPoses()
+        bad = [report for report in reports if not report.ok]
+        if not bad:
+            om2.MGlobal.displayInfo('[skinWrangler] All {} skinClusters are in their bind pose'.format(len(reports)))
+            return
+
+        drifted = sorted(set(inf for report in bad for inf in report.drifted))
+        lines = []
+        for report in bad:
+            issues = []
+            if report.drifted:
+                issues.append('{} drifted (max {:.4f})'.format(len(report.drifted), report.drift.max()))
+            if report.missingPose:
+                issues.append('no bind pose')
+            if report.multiplePoses:
+                issues.append('{} bind poses'.format(len(report.poses)))
+            lines.append('{}: {}'.format(report.skin, ', '.join(issues)))
+            logger.warning('[skinWrangler] bind pose audit {}'.format(lines[-1]))
+
+        box = QtWidgets.QMessageBox(self)
+        box.setWindowTitle('Bind pose audit')
+        box.setText('{} of {} skinClusters have bind pose issues'.format(len(bad), len(reports)))
+        box.setDetailedText('\n'.join(lines))
+        restoreBTN = box.addButton('Restore bind pose', QtWidgets.QMessageBox.AcceptRole)
+        rebindBTN = box.addButton('Rebind at current pose', QtWidgets.QMessageBox.AcceptRole)
+        posesBTN = box.addButton('Fix dagPose nodes', QtWidgets.QMessageBox.AcceptRole)
+        box.addButton(QtWidgets.QMessageBox.Cancel)
+        box.exec_()
+
+        clicked = box.clickedButton()
+        with self.batchOperation('bind pose fix'):
+            if clicked == restoreBTN:
+                skinwrangleraudit.restoreBindPoses(bad)
+            elif clicked == rebindBTN:
+                skinwrangleraudit.resetBindPreMatrices(bad)
+            elif clicked == posesBTN:
+                skinwrangleraudit.rebuildBindPoses(bad)
+        if drifted and clicked not in (restoreBTN, rebindBTN):
+            cmds.select(drifted, r=1)
+
+    def auditSceneFn(self):
+        """Audits the weights of every skinCluster in the scene and shows the report table"""
+        start = time.time()
+        reports = skinwrangleraudit.auditSkins(epsilon=self.ui.auditEpsilonSPIN.value())
+        bad = [report for report in reports if not report.ok]
+        logger.info('[skinWrangler] Audited {} skinClusters in {:.2f}s, {} with issues'.format(
+            len(reports), time.time() - start, len(bad)))
+        if not reports:
+            cmds.warning('[skinWrangler] No skinClusters in the scene')
+            return
+        self.auditDialog = SkinAuditDialog(reports, self)
+        self.auditDialog.show()
 
-    def clampInfluences(self, mesh, maxInf, debug=0, force=False):
+    def rpcServerFn(self, enabled):
         """
-        Sets max influences on skincluster of mesh / cutting off smallest ones
+        Starts/stops the local JSON-RPC server, every call it serves runs on Maya's main thread.
+        exportWeights can only write below the project's data/skinWrangler folder.
         """
-        skinClust = self.findRelatedSkinCluster(mesh)
-
-        lockedInfluences = self.checkLockedInfluences(skinClust)
-        doit = True
-        if lockedInfluences:
-            if force:
-                self.unlockLockedInfluences(skinClust)
-                cmds.warning('Locked influences were unlocked on skinCluster')
-            else:
-                doit = False
+        if self.rpcServer:
+            self.rpcServer.stop()
+            self.rpcServer = None
+        if not enabled:
+            return
+        import maya.utils
+        exportDir = os.path.join(cmds.workspace(q=1, rootDirectory=1), 'data', 'skinWrangler')
+        server = skinwranglerserver.RPCServer(skinwranglerserver.MayaBackend(exportDir),
+                                              port=self.ui.rpcPortSPIN.value(),
+                                              executor=maya.utils.executeInMainThreadWithResult)
+        try:
+            server.start()
+        except (IOError, OSError) as e:
+            cmds.warning('[skinWrangler] Could not start the RPC server: {}'.format(e))
+            self.ui.rpcServerCHK.setChecked(False)
+            return
+        self.rpcServer = server
+
+    def removeCandidates(self, data, threshold):
+        """Local columns of the influences whose max weight over the whole mesh is at or below threshold"""
+        mins, maxs = data.influenceIndex().ranges()
+        # locked influences are kept, removing one would move its weight
+        candidates = np.nonzero((maxs <= threshold) & ~data.locked())[0]
+        if len(candidates) == len(data.influences):
+            cmds.warning('[skinWrangler] Every influence of {} is below {}, keeping them'.format(data.skin, threshold))
+            return candidates[:0], maxs
+        return candidates, maxs
+
+    def previewRemoveCandidates(self, preview):
+        """Marks the {influence: max weight} candidates in jointLST"""
+        orange = QtGui.QColor(230, 150, 50, 255)
+        for item in self.listItems():
+            inf = self.influenceFromItem(item)
+            if inf in preview:
+                item.setForeground(0, orange)
+                item.setToolTip(0, 'Will be removed, max weight {:.4f}'.format(preview[inf]))
 
-        if doit:
-            verts = self.checkMaxSkinInfluences(mesh, maxInf)
+    def removeUnusedFn(self):
+        """
+        Removes the influences whose max weight is at or below the threshold, after moving
+        their weight to the nearest kept parent influence. One write and one removal per skinCluster.
+        """
+        if not self.session:
+            cmds.warning('No skin cluster loaded or mesh with skin cluster selected.')
+            return
+        threshold = self.ui.removeThresholdSPIN.value()
+        plan = []
+        preview = {}
+        for data in self.session.clusters:
+            candidates, maxs = self.removeCandidates(data, threshold)
+            if len(candidates):
+                plan.append((data, candidates))
+                preview.update((data.influences[c], maxs[c]) for c in candidates)
+        if not plan:
+            cmds.warning('[skinWrangler] No influences at or below {}'.format(threshold))
+            return
 
-            logger.info('pruneVertWeights>> Pruning {}  vertices'.format(len(verts)))
+        self.previewRemoveCandidates(preview)
+        answer = QtWidgets.QMessageBox.question(self, 'Remove influences',
+                                                'Remove {} influences at or below {}?\n\n{}'.format(
+                                                    len(preview), threshold, '\n'.join(sorted(preview))),
+                                                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
+        if answer != QtWidgets.QMessageBox.Yes:
+            self.refreshUI()
+            return
 
-            for v in verts:
-                infs = cmds.skinPercent(skinClust, (mesh + ".vtx[" + str(v) + "]"), q=1, v=1)
-                active = []
-                for inf in infs:
-                    if inf > 0.0: active.append(inf)
-                active = list(reversed(sorted(active)))
-                if debug: print 'Clamping vertex', v, 'to', active[maxInf]
-                cmds.skinPercent(skinClust, (mesh + ".vtx[" + str(v) + "]"), pruneWeights=(active[maxInf] * 1.001))
-        else:
-            cmds.warning('Cannot clamp influences due to locked weights on skinCluster')
+        with self.batchOperation('remove influences'):
+            for data, candidates in plan:
+                index = data.influenceIndex()
+                rows = index.verticesOf(candidates)
+                if len(rows) and threshold > 0.0:
+                    targets = skinwranglerops.removalTargets(candidates, skinwranglerdata.influenceParents(data.influences))
+                    weights = skinwranglerops.redistributeColumns(data.meshWeights()[rows], candidates, targets,
+                                                                  locked=data.locked())
+                    data.commitRows(rows, weights)
+                cmds.skinCluster(data.skin, e=1, ri=[data.influences[c] for c in candidates])
+                skinwranglerdata.invalidate(data.skin)
+
+    def clampInfluences(self, mesh, maxInf, debug=0):
+        """
+        Sets max influences on skincluster of mesh / cutting off smallest ones.
+        Locked influences are never unlocked, they always count as kept and the cut comes out of
+        the unlocked ones. One write for every vertex over the limit.
+        """
+        skinClust = self.findRelatedSkinCluster(mesh)
+        verts = np.asarray(self.checkMaxSkinInfluences(mesh, maxInf, debug=debug), dtype=np.intp)
+        logger.info('pruneVertWeights>> Pruning {}  vertices'.format(len(verts)))
+        if not len(verts):
+            return 0
+
+        locked = skinwranglerdata.lockMask(skinClust)
+        weights = skinwranglerops.limitInfluences(skinwranglerdata.weightCache(skinClust, mesh).sparse()[verts], maxInf,
+                                                  locked=locked)
+        skinwranglerdata.writeWeights(skinClust, mesh, verts, weights)
+        stuck = np.count_nonzero(weights[:, locked] > 0.0, axis=1) > maxInf
+        if stuck.any():
+            cmds.warning('[skinWrangler] {} vertices of {} have more than {} locked influences and stay over the limit'
+                         .format(int(stuck.sum()), mesh, maxInf))
+        return len(verts)
 
     def addJntFn(self):
-        sel = cmds.ls(sl=1)
-        if len(sel) == 2:
-            mesh, jnt = None, None
-            for node in sel:
-                if cmds.nodeType(node) == 'joint': jnt = node
-                if cmds.listRelatives(node, allDescendents=True, noIntermediate=True, fullPath=True, type="mesh"):
-                    mesh = node
-            if jnt and mesh:
-                cmds.skinCluster(self.findRelatedSkinCluster(mesh), e=1, lw=1, wt=0, ai=jnt)
-                cmds.setAttr(jnt + '.liw', 0)
-            else:
-                cmds.warning('skinWrangler: Cannot find joint and mesh in selection: ' + str(sel))
+        """Adds every selected joint to the skinCluster of every selected mesh, optionally seeding weights by distance"""
+        sel = cmds.ls(sl=1, o=1)
+        joints = cmds.ls(sel, type='joint')
+        meshes = [node for node in sel if node not in joints and
+                  cmds.listRelatives(node, allDescendents=True, noIntermediate=True, fullPath=True, type="mesh")]
+        skins = []
+        for mesh in meshes:
+            skin = self.findRelatedSkinCluster(mesh)
+            if skin and skin not in skins:
+                skins.append(skin)
+        if not joints or not skins:
+            cmds.warning('skinWrangler: Cannot find joints and skinned meshes in selection: ' + str(sel))
+            return
+
+        seed = self.ui.addSeedCHK.isChecked()
+        radius = self.ui.addRadiusSPIN.value()
+        with self.batchOperation('add influences'):
+            for skin in skins:
+                added = skinwranglerdata.addInfluences(skin, joints)
+                logger.info('[skinWrangler] Added {} influences to {}'.format(len(added), skin))
+                if added and seed:
+                    self.seedInfluences(skin, added, radius)
+
+    def seedInfluences(self, skin, joints, radius):
+        """Weights joints by distance to their bone segment for the vertices within radius, one write"""
+        mesh = skinwranglerdata.skinGeometry(skin)
+        starts, ends = skinwranglerdata.jointSegments(joints)
+        distance = skinwranglermesh.segmentDistance(skinwranglerdata.meshPoints(mesh), starts, ends)
+        rows = np.nonzero((distance <= radius).any(axis=1))[0]
+        if not len(rows):
+            return
+        rows, weights = skinwranglerdata.readWeights(skin, mesh, rows)
+        lookup = dict((inf, i) for i, inf in enumerate(skinwranglerdata.influenceNames(skin)))
+        columns = [lookup[skinwranglerdata.getDagPath(jnt).partialPathName()] for jnt in joints]
+        weights = skinwranglerops.seedColumns(weights, columns, distance[rows], radius,
+                                              locked=skinwranglerdata.lockMask(skin))
+        skinwranglerdata.writeWeights(skin, mesh, rows, weights)
 
     ## TOOLS TAB
     ########################################################################
-    def makeLocOnSel(self):
-        tool = cmds.currentCtx()
-        cmds.setToolTo('moveSuperContext')
-        pos = cmds.manipMoveContext('Move', q=True, p=True)
-        startLoc = cmds.spaceLocator(n=('skinWrangler_jointBboxLocator'))[0]
-        cmds.move(pos[0], pos[1], pos[2], startLoc, ws=1, a=1)
-        cmds.setToolTo(tool)
-        return startLoc
-
     def jointOnBboxCenterFn(self):
-        if self.ui.jointOnBboxCenterBTN.isChecked():
-            self.ui.jointOnBboxCenterBTN.setText('CREATE JOINT FROM ALIGN LOC')
-            self.jointLoc = self.makeLocOnSel()
-            cmds.setAttr(self.jointLoc + '.displayLocalAxis', 1)
-            cmds.select(self.jointLoc)
+        """
+        Creates a joint at the center of every selected island (connected run of selected vertices),
+        or one for the whole selection. Positions are read in bulk and the joints made in one go.
+        """
+        selection = skinwranglerdata.selectedVertices()
+        if not selection:
+            cmds.warning('[skinWrangler] Select vertices, faces, edges or meshes to place joints on')
+            return
+        mode = str(self.ui.jointCenterModeCMB.currentText())
+        islands = self.ui.jointGroupCMB.currentIndex() == 0
+        parent = self.currentInf[0] if self.ui.jointParentCHK.isChecked() and self.currentInf else None
+
+        centers, rotations = [], []
+        if islands:
+            for mesh, verts in selection.items():
+                labels = skinwranglermesh.componentLabels(skinwranglerdata.meshAdjacency(mesh), verts)
+                c, r = skinwranglermesh.groupFrames(skinwranglerdata.meshPoints(mesh)[verts], labels, mode)
+                centers.append(c)
+                rotations.append(r)
         else:
-            self.ui.jointOnBboxCenterBTN.setText('MAKE JOINT ON BBOX CENTER')
-            locXform = cmds.getAttr(self.jointLoc + '.worldMatrix')
-
-            # get name
-            newName = 'createdJoint'
-            inputName, ok = QtWidgets.QInputDialog.getText(None, 'Creating Node', 'Enter node name:', text=newName)
-            if ok: newName = str(inputName)
-            cmds.select(cl=1)
-            jnt = cmds.joint(name=newName)
-            cmds.xform(jnt, m=locXform)
-            cmds.delete(self.jointLoc)
+            points = np.concatenate([skinwranglerdata.meshPoints(mesh)[verts] for mesh, verts in selection.items()])
+            c, r = skinwranglermesh.groupFrames(points, np.zeros(len(points), dtype=np.intp), mode)
+            centers.append(c)
+            rotations.append(r)
+        centers = np.concatenate(centers)
+        rotations = np.concatenate(rotations) if mode == 'pca' else None
+
+        newName, ok = QtWidgets.QInputDialog.getText(None, 'Creating Joints',
+                                                     'Enter name for {} joints:'.format(len(centers)),
+                                                     text='createdJoint')
+        if not ok:
+            return
+        newName = str(newName)
+        names = [newName] if len(centers) == 1 else ['{}_{:02d}'.format(newName, i + 1) for i in range(len(centers))]
+        with self.batchOperation('joints at centers'):
+            joints = skinwranglerdata.createJoints(names, centers, rotations, parent)
+        logger.info('[skinWrangler] Created {} joints'.format(len(joints)))
 
     ## REFRESH UI
     ###############
+    def influenceItem(self, i):
+        """jointLST row for union influence i of the session, from the current listState"""
+        state = self.listState
+        inf = self.session.influences[i]
+        wid = QtWidgets.QTreeWidgetItem()
+        wid.setText(0, state['names'].display(i, self.ui.nameSpaceCHK.isChecked(), self.ui.longNamesCHK.isChecked()))
+        wid.setData(0, QtCore.Qt.UserRole, inf)
+        wid.setData(0, self.INDEX_ROLE, int(i))
+        wid.setIcon(0, self.iconLib['joint'])
+        if state['average'][i] > 0:
+            red = QtGui.QColor(200, 75, 75, 255)
+            wid.setForeground(0, red)
+            wid.setForeground(1, red)
+            wid.setText(1, str("%.4f" % state['average'][i]))
+        wid.setText(2, str(state['counts'][i]))
+        if state['locked'][i]:
+            font = wid.font(0)
+            font.setItalic(True)
+            wid.setFont(0, font)
+            wid.setToolTip(0, 'Locked')
+        if state['diffs']:
+            wid.setText(3, str("%.3f" % state['diffs'].get(inf, 0.0)))
+        if state['tree'] is not None:
+            wid.setText(4, str("%.4f" % state['totals'][i]))
+            if len(self.visibleChildren(i)):
+                wid.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        return wid
+
+    def visibleChildren(self, node):
+        """Child influences of node (-1 for the roots) listed in the hierarchy, empty subtrees only with list all"""
+        children = self.listState['tree'].childrenOf(node)
+        if self.ui.listAllCHK.isChecked():
+            return children
+        return children[self.listState['totals'][children] > 0]
+
+    def fetchInfluenceChildren(self, item=None):
+        """Populates the rows under an influence the first time it's expanded, the top level for item None"""
+        if not self.listState or self.listState['tree'] is None:
+            return
+        if item is None:
+            self.ui.jointLST.addTopLevelItems([self.influenceItem(i) for i in self.visibleChildren(-1)])
+            return
+        node = item.data(0, self.INDEX_ROLE)
+        if node is None or item.childCount():
+            return
+        item.addChildren([self.influenceItem(i) for i in self.visibleChildren(node)])
+        self.filterChanged()
+
+    def multiLabel(self, names):
+        if len(names) > 1:
+            return '{} (+{})'.format(names[0], len(names) - 1)
+        return names[0]
+
     def refreshUI(self):
+        if self.batchDepth:
+            self.suppressedRefreshCount += 1
+            return False
+        self.refreshCount += 1
         refInf = self.currentInf
         self.ui.jointLST.clear()
+        self.listState = None
         self.currentInf = refInf
 
-        filter = str(self.ui.filterLINE.text()).lower()
-
         wid = QtWidgets.QTreeWidgetItem()
         font = wid.font(0)
         font.setWeight(QtGui.QFont.Normal)
         font.setPointSize(8)
 
         vertSel = True
-        s = self.getSelected()
-        if s:
-            sel, msh, vtx, skin = s
-            self.ui.vtxLBL.setText(str(vtx))
+        session = self.getSelected()
+        if session:
+            self.ui.vtxLBL.setText(str(len(session)))
         else:
             wid = QtWidgets.QTreeWidgetItem()
             wid.setText(0, 'MAKE A COMPONENT\n SELECTION ON\n SKINNED MESH')
@@ -645,13 +1472,14 @@ class SkinWrangler(QtWidgets.QDialog):
             self.ui.jointLST.addTopLevelItem(wid)
             cmds.undoInfo(swf=1)
             self.currentInf = None
+            self.session = None
             vertSel = False
 
         skin = None
         if self.currentMesh:
-            self.ui.mshLBL.setText(self.currentMesh)
+            self.ui.mshLBL.setText(self.multiLabel(self.session.meshes if vertSel else [self.currentMesh]))
         if self.currentSkin:
-            self.ui.sknLBL.setText(self.currentSkin)
+            self.ui.sknLBL.setText(self.multiLabel(self.session.skins if vertSel else [self.currentSkin]))
             skin = self.currentSkin
 
         if skin:
@@ -666,6 +1494,7 @@ class SkinWrangler(QtWidgets.QDialog):
 
             # normalization
             n = cmds.skinCluster(skin, q=1, nw=1)
+            self.ui.skinNormalCMB.blockSignals(True)
             if n == 0:
                 self.ui.skinNormalCMB.setCurrentIndex(n)
                 self.currentNormalization = 'None'
@@ -675,6 +1504,7 @@ class SkinWrangler(QtWidgets.QDialog):
             elif n == 2:
                 self.ui.skinNormalCMB.setCurrentIndex(n)
                 self.currentNormalization = 'Post'
+            self.ui.skinNormalCMB.blockSignals(False)
 
             # max weights
             self.ui.skinMaxInfLBL.setText(str(cmds.skinCluster(skin, q=1, mi=1)))
@@ -682,34 +1512,36 @@ class SkinWrangler(QtWidgets.QDialog):
             if not vertSel:
                 return False
 
-            # update jointList
-            wDict = self.getAvgVertWeights(sel, skin)
-            red = QtGui.QColor(200, 75, 75, 255)
-            for inf in wDict.keys():
-                if filter in inf.lower() or filter == '':
-                    wid = QtWidgets.QTreeWidgetItem()
-                    infName = inf
-                    if self.ui.nameSpaceCHK.isChecked():
-                        infName = inf.split(':')[-1]
-                    wid.setText(0, infName)
-                    wid.setForeground(0, red)
-                    wid.setForeground(1, red)
-                    wid.setIcon(0, self.iconLib['joint'])
-                    wid.setText(1, str("%.4f" % wDict[inf]))
-                    self.ui.jointLST.addTopLevelItem(wid)
-            if self.ui.listAllCHK.isChecked():
-                for inf in cmds.skinCluster(self.currentSkin, q=1, inf=1):
-                    if inf not in wDict.keys() and (filter in inf.lower() or filter == ''):
-                        wid = QtWidgets.QTreeWidgetItem()
-                        wid.setIcon(0, self.iconLib['joint'])
-                        if self.ui.nameSpaceCHK.isChecked():
-                            inf = inf.split(':')[-1]
-                        wid.setText(0, inf)
-                        self.ui.jointLST.addTopLevelItem(wid)
+            # update jointList, merged averages across every selected skinCluster
+            average = self.session.averageWeights()
+            hierarchy = self.ui.hierarchyCHK.isChecked()
+            tree = skinwranglerdata.influenceTree(self.session.influences) if hierarchy else None
+            self.listState = {
+                'average': average,
+                'counts': self.session.influenceCounts(self.affectedThreshold()),
+                'names': self.session.nameIndex(),
+                'diffs': self.diffTotals[1] if self.diffTotals and self.diffTotals[0] == skin else None,
+                'locked': self.session.lockMask(),
+                'tree': tree,
+                # one pass over the cached parent array, not a DAG walk
+                'totals': tree.totals(average) if hierarchy else None,
+            }
+            self.ui.jointLST.setRootIsDecorated(hierarchy)
+            self.ui.jointLST.setItemsExpandable(hierarchy)
+            if hierarchy:
+                self.fetchInfluenceChildren()
+            else:
+                rows = np.nonzero(average > 0)[0]
+                if self.ui.listAllCHK.isChecked():
+                    rows = np.concatenate((rows, np.nonzero(average <= 0)[0]))
+                self.ui.jointLST.addTopLevelItems([self.influenceItem(i) for i in rows])
+            self.filterChanged()
 
             if self.currentInf:
                 for item in self.currentInf:
-                    self.getJointFromList(item).setSelected(True)
+                    wid = self.getJointFromList(item)
+                    if wid:
+                        wid.setSelected(True)
             logger.info('refreshUI skinWrangler completed.')
 
 
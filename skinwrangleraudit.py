@@ -0,0 +1,248 @@
+"""
+skinWrangler scene audits
+
+Checks that run over every skinCluster in the scene. The analysis functions only see
+NumPy arrays so they can be vectorized across clusters, the audit* functions pull the
+data out of Maya through skinwranglerdata.
+"""
+
+import json
+import logging
+
+import numpy as np
+
+import maya.cmds as cmds
+from maya.api import OpenMaya as om2
+
+import skinwranglerdata
+import skinwranglerindex
+import skinwranglerops
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+logger = logging.getLogger(__name__)
+
+BIND_TOLERANCE = 1e-4
+WEIGHT_EPSILON = 1e-4
+SUM_TOLERANCE = skinwranglerops.SUM_TOLERANCE
+
+
+## BIND POSE
+########################################################################
+def bindDrift(world, bindPre):
+    """
+    Per influence drift from the bind pose: max abs element of bindPreMatrix * worldMatrix - identity.
+    world and bindPre are stacked (n, 4, 4) arrays, so a whole scene can go through in one call.
+    """
+    world = np.asarray(world, dtype=np.float64)
+    bindPre = np.asarray(bindPre, dtype=np.float64)
+    if not len(world):
+        return np.zeros(0)
+    diff = np.matmul(bindPre, world) - np.eye(4)
+    return np.abs(diff).reshape(len(diff), 16).max(axis=1)
+
+
+class BindPoseReport(object):
+    """Bind pose state of one skinCluster"""
+
+    def __init__(self, skin, influences, drift, poses, tolerance=BIND_TOLERANCE):
+        self.skin = skin
+        self.influences = influences
+        self.drift = drift
+        self.poses = poses
+        self.tolerance = tolerance
+
+    @property
+    def drifted(self):
+        return [inf for inf, d in zip(self.influences, self.drift) if d > self.tolerance]
+
+    @property
+    def missingPose(self):
+        return not self.poses
+
+    @property
+    def multiplePoses(self):
+        return len(self.poses) > 1
+
+    @property
+    def ok(self):
+        return not (self.drifted or self.missingPose or self.multiplePoses)
+
+    def __repr__(self):
+        return '<BindPoseReport {} drifted:{} poses:{}>'.format(self.skin, len(self.drifted), len(self.poses))
+
+
+def auditBindPoses(skins=None, tolerance=BIND_TOLERANCE):
+    """
+    Bind pose reports for the given (default: every) skinCluster in the scene.
+    Matrices of all clusters are stacked and checked in one vectorized pass.
+    """
+    skins = skins if skins is not None else cmds.ls(type='skinCluster')
+    records = []
+    worlds, bindPres = [], []
+    for skin in skins:
+        names, world, bindPre = skinwranglerdata.bindMatrices(skin)
+        records.append((skin, names, skinwranglerdata.bindPoses(skin, names)))
+        worlds.append(world)
+        bindPres.append(bindPre)
+    if not records:
+        return []
+    drift = bindDrift(np.concatenate(worlds), np.concatenate(bindPres))
+    offsets = np.cumsum([0] + [len(names) for skin, names, poses in records])
+    return [BindPoseReport(skin, names, drift[offsets[i]:offsets[i + 1]], poses, tolerance)
+            for i, (skin, names, poses) in enumerate(records)]
+
+
+def restoreBindPoses(reports):
+    """Puts the skeleton of every report with exactly one dagPose back into its bind pose"""
+    restored = []
+    for report in reports:
+        if len(report.poses) == 1 and report.drifted:
+            cmds.dagPose(report.poses[0], r=1)
+            restored.append(report.skin)
+    return restored
+
+
+def resetBindPreMatrices(reports):
+    """Rebinds drifted influences in place: bindPreMatrix becomes the inverse of the current world matrix"""
+    for report in reports:
+        drifted = report.drifted
+        if not drifted:
+            continue
+        names, world, bindPre = skinwranglerdata.bindMatrices(report.skin)
+        lookup = dict((name, i) for i, name in enumerate(names))
+        rows = [lookup[name] for name in drifted]
+        skinwranglerdata.setBindPreMatrices(report.skin, drifted, np.linalg.inv(world[rows]))
+
+
+def rebuildBindPoses(reports):
+    """
+    Fixes missing and multiple bind poses: a missing one is saved from the current influences
+    and plugged into the skinCluster, extra ones no skinCluster uses are deleted.
+    """
+    fixed = []
+    for report in reports:
+        if report.missingPose:
+            pose = cmds.dagPose(report.influences, bindPose=1, save=1, n=report.skin + '_bindPose')
+            cmds.connectAttr(pose + '.message', report.skin + '.bindPose', f=1)
+            fixed.append(report.skin)
+        elif report.multiplePoses:
+            unused = [pose for pose in report.poses[1:]
+                      if not cmds.listConnections(pose + '.message', s=0, d=1, type='skinCluster')]
+            if unused:
+                cmds.delete(unused)
+                fixed.append(report.skin)
+    return fixed
+
+
+## SKIN WEIGHTS
+########################################################################
+class SkinReport(object):
+    """Weight health of one skinCluster, vertex lists are indices into its mesh"""
+
+    def __init__(self, skin, mesh, influences, numVerts, maxInfluences, maintainMax, overMax, unnormalized, locked,
+                 unused, belowEpsilon):
+        self.skin = skin
+        self.mesh = mesh
+        self.influences = influences
+        self.numVerts = numVerts
+        self.maxInfluences = maxInfluences
+        self.maintainMax = maintainMax
+        self.overMax = overMax
+        self.unnormalized = unnormalized
+        self.locked = locked
+        self.unused = unused
+        self.belowEpsilon = belowEpsilon
+
+    @property
+    def lockedMask(self):
+        locked = set(self.locked)
+        return np.array([inf in locked for inf in self.influences], dtype=bool)
+
+    @property
+    def ok(self):
+        return not (len(self.overMax) or len(self.unnormalized) or self.unused or self.belowEpsilon)
+
+    def toDict(self):
+        return {'skinCluster': self.skin, 'mesh': self.mesh, 'vertices': self.numVerts,
+                'maxInfluences': self.maxInfluences, 'maintainMaxInfluences': self.maintainMax,
+                'overMax': self.overMax.tolist(), 'unnormalized': self.unnormalized.tolist(), 'locked': self.locked, 'unused': self.unused,
+                'belowEpsilon': self.belowEpsilon}
+
+    def __repr__(self):
+        return '<SkinReport {} overMax:{} unnormalized:{}>'.format(self.skin, len(self.overMax),
+                                                                   len(self.unnormalized))
+
+
+def analyzeSkin(skin, mesh, influences, weights, maxInfluences, maintainMax, locked, epsilon=WEIGHT_EPSILON,
+                tolerance=SUM_TOLERANCE):
+    """
+    Pure NumPy half of the audit, safe to run off the main thread.
+    weights is a SparseWeights of the whole mesh, locked a bool mask over influences. Rows over
+    maxInfluences are reported whether or not maintainMax is on, the flag is only passed through.
+    """
+    numVerts, numInfluences = weights.shape
+    values = weights.values
+    overMax = np.nonzero(weights.rowCounts() > maxInfluences)[0] if maxInfluences > 0 else np.zeros(0, np.intp)
+    unnormalized = skinwranglerops.unnormalizedRows(weights.rowSums(), tolerance)
+    used = np.bincount(weights.cols[values > epsilon], minlength=numInfluences) > 0
+    return SkinReport(skin, mesh, influences, numVerts, maxInfluences, bool(maintainMax), overMax, unnormalized,
+                      [inf for inf, lock in zip(influences, locked) if lock],
+                      [inf for inf, use in zip(influences, used) if not use],
+                      int(np.count_nonzero((values > 0.0) & (values < epsilon))))
+
+
+def extractSkin(skin):
+    """Main thread half: one bulk read of the whole mesh plus the settings the analysis needs"""
+    mesh = skinwranglerdata.skinGeometry(skin)
+    influences = skinwranglerdata.influenceNames(skin)
+    numVerts = om2.MFnMesh(skinwranglerdata.getDagPath(mesh)).numVertices
+    weights = skinwranglerindex.SparseWeights.fromChunks(skinwranglerdata.iterWeightChunks(skin, mesh),
+                                                         (numVerts, len(influences)))
+    return (skin, mesh, influences, weights, cmds.skinCluster(skin, q=1, mi=1), cmds.skinCluster(skin, q=1, mmi=1),
+            skinwranglerdata.lockMask(skin))
+
+
+def auditSkins(skins=None, epsilon=WEIGHT_EPSILON, tolerance=SUM_TOLERANCE, workers=None):
+    """
+    Weight reports for the given (default: every) skinCluster in the scene.
+    Maya is only touched on the main thread, the analysis runs across clusters in a thread pool
+    (NumPy releases the GIL for the heavy parts, a process pool would mean spawning Maya).
+    """
+    skins = skins if skins is not None else cmds.ls(type='skinCluster')
+    records = [extractSkin(skin) for skin in skins]
+    analyze = lambda record: analyzeSkin(*record, epsilon=epsilon, tolerance=tolerance)
+    if ThreadPoolExecutor is None or len(records) < 2:
+        return [analyze(record) for record in records]
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        return list(pool.map(analyze, records))
+    finally:
+        pool.shutdown()
+
+
+def reportsToJson(reports, path=None):
+    """JSON of a list of SkinReports, written to path when given"""
+    text = json.dumps([report.toDict() for report in reports], indent=2)
+    if path:
+        with open(path, 'w') as f:
+            f.write(text)
+    return text
+
+
+def enforceMaxInfluences(reports):
+    """Limits the over max vertices of every report to its max influences, locked columns kept, one write each"""
+    fixed = []
+    for report in reports:
+        if not len(report.overMax):
+            continue
+        indices, weights = skinwranglerdata.readWeights(report.skin, report.mesh, report.overMax)
+        # locks may have changed since the audit, the write patches the weight cache itself
+        locked = skinwranglerdata.lockMask(report.skin)
+        weights = skinwranglerops.limitInfluences(weights, report.maxInfluences, locked=locked)
+        skinwranglerdata.writeWeights(report.skin, report.mesh, indices, weights)
+        fixed.append(report.skin)
+    return fixed
@@ -0,0 +1,162 @@
+"""
+skinWrangler mesh data cache
+
+Derived mesh structures (adjacency, shell labels, spatial indices...) stored on disk as .npy
+files and loaded back memory mapped, keyed by a topology hash so they survive sessions and
+are shared by every mesh with the same topology. Layout:
+
+    <root>/v<CACHE_VERSION>/<topology hash>/<key>/<array name>.npy
+
+Each <key> directory is one record, written to a temp directory and renamed into place so a
+crash never leaves half a record behind. Records are evicted least recently used first
+(directory mtime, touched on every hit) once the cache grows over its cap.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import sys
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_CAP = 512 * 1024 * 1024
+
+
+def defaultCacheDir():
+    """SKINWRANGLER_CACHE if set, otherwise the platform's per user cache folder"""
+    if os.environ.get('SKINWRANGLER_CACHE'):
+        return os.environ['SKINWRANGLER_CACHE']
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'skinWrangler')
+
+
+def _hasher():
+    try:
+        return hashlib.blake2b(digest_size=16)
+    except AttributeError:
+        return hashlib.sha1()
+
+
+def topologyHash(numVerts, counts, connects):
+    """Hex digest of the vertex count and the face-vertex buffers, same topology same hash"""
+    h = _hasher()
+    h.update(np.array([numVerts, len(counts)], dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(counts, dtype=np.int32).tobytes())
+    h.update(np.ascontiguousarray(connects, dtype=np.int32).tobytes())
+    return h.hexdigest()
+
+
+def arrayHash(array):
+    """Short digest of an array's contents, for records that also depend on positions"""
+    h = _hasher()
+    h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()[:16]
+
+
+def _dirSize(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+class MeshCache(object):
+    """Memory mapped records of named arrays per (topology, key) with a size capped LRU"""
+
+    def __init__(self, root=None, cap=DEFAULT_CAP):
+        self.root = os.path.join(root or defaultCacheDir(), 'v{}'.format(CACHE_VERSION))
+        self.cap = cap
+
+    def _path(self, topology, key):
+        return os.path.join(self.root, topology, key)
+
+    def get(self, topology, key):
+        """{name: read only memmap} of a record, None on a miss"""
+        path = self._path(topology, key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            arrays = dict((os.path.splitext(name)[0], np.load(os.path.join(path, name), mmap_mode='r'))
+                          for name in os.listdir(path) if name.endswith('.npy'))
+            os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            logger.warning('[skinWrangler] Dropping unreadable cache record {}'.format(path))
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        return arrays
+
+    def put(self, topology, key, arrays):
+        """Stores {name: array} as a record, then evicts down to the cap. Returns the arrays memory mapped."""
+        path = self._path(topology, key)
+        temp = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            if os.path.isdir(temp):
+                shutil.rmtree(temp)
+            os.makedirs(temp)
+            for name, array in arrays.items():
+                np.save(os.path.join(temp, name + '.npy'), np.asarray(array))
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            os.rename(temp, path)
+        except (IOError, OSError):
+            # an unwritable cache only costs the rebuild next time
+            logger.warning('[skinWrangler] Could not write cache record {}'.format(path), exc_info=True)
+            shutil.rmtree(temp, ignore_errors=True)
+            return arrays
+        self.evict()
+        return self.get(topology, key) or arrays
+
+    def getOrBuild(self, topology, key, build):
+        """The cached record, or build() -> {name: array} stored and returned on a miss"""
+        arrays = self.get(topology, key)
+        if arrays is None:
+            arrays = self.put(topology, key, build())
+        return arrays
+
+    def records(self):
+        """[(mtime, bytes, path)] of every record, oldest first"""
+        records = []
+        if not os.path.isdir(self.root):
+            return records
+        for topology in os.listdir(self.root):
+            folder = os.path.join(self.root, topology)
+            if not os.path.isdir(folder):
+                continue
+            for key in os.listdir(folder):
+                path = os.path.join(folder, key)
+                if os.path.isdir(path) and not key.endswith('.tmp'):
+                    records.append((os.path.getmtime(path), _dirSize(path), path))
+        return sorted(records)
+
+    @property
+    def nbytes(self):
+        return sum(record[1] for record in self.records())
+
+    def evict(self):
+        """Removes least recently used records until under cap, returns the removed paths"""
+        records = self.records()
+        total = sum(record[1] for record in records)
+        removed = []
+        for mtime, size, path in records:
+            if total <= self.cap:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed.append(path)
+            folder = os.path.dirname(path)
+            if not os.listdir(folder):
+                os.rmdir(folder)
+        return removed
+
+    def remove(self, topology):
+        """Drops every record of one topology"""
+        shutil.rmtree(os.path.join(self.root, topology), ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,1044 @@
+"""
+skinWrangler weight data layer
+
+Bulk reads and writes of skinCluster weights as NumPy matrices, and the
+SkinSession that groups a component selection by skinCluster so every
+weight op is a single write per cluster instead of one skinPercent call
+per vertex/influence.
+"""
+
+import os
+import logging
+from collections import OrderedDict
+
+import numpy as np
+
+import maya.cmds as cmds
+from maya.api import OpenMaya as om2
+from maya.api import OpenMayaAnim as oma2
+
+import skinwranglercache
+import skinwranglerindex
+import skinwranglermesh
+import skinwranglerops
+import skinwranglershared
+import skinwranglersnapshot
+import skinwranglerspatial
+
+logger = logging.getLogger(__name__)
+
+UNDO_PLUGIN = 'skinwranglerundo'
+READ_CHUNK = 65536
+
+# weight blocks waiting to be picked up by the skinWranglerSetWeights command
+_pendingWrites = []
+
+
+## NODE HELPERS
+########################################################################
+def getMObject(node):
+    sel = om2.MSelectionList()
+    sel.add(node)
+    return sel.getDependNode(0)
+
+
+def getDagPath(node):
+    sel = om2.MSelectionList()
+    sel.add(node)
+    return sel.getDagPath(0)
+
+
+def getSkinFn(skin):
+    return oma2.MFnSkinCluster(getMObject(skin))
+
+
+def vertexComponent(indices):
+    """Returns a kMeshVertComponent MObject holding the given vertex indices"""
+    fn = om2.MFnSingleIndexedComponent()
+    comp = fn.create(om2.MFn.kMeshVertComponent)
+    fn.addElements([int(i) for i in indices])
+    return comp
+
+
+def influenceNames(skin):
+    """Influence names in the physical index order used by getWeights/setWeights"""
+    return [path.partialPathName() for path in getSkinFn(skin).influenceObjects()]
+
+
+def findRelatedSkinCluster(skinObject):
+    """Python implementation of MEL command: http://takkun.nyamuuuu.net/blog/archives/592"""
+
+    skinShape = None
+    skinShapeWithPath = None
+    hiddenShape = None
+    hiddenShapeWithPath = None
+
+    cpTest = cmds.ls(skinObject, typ="controlPoint")
+    if len(cpTest):
+        skinShape = skinObject
+
+    else:
+        rels = cmds.listRelatives(skinObject)
+        if rels is None:
+            return False
+        for r in rels:
+            cpTest = cmds.ls("|".join([skinObject, r]), typ="controlPoint")
+            if len(cpTest) == 0:
+                continue
+
+            io = cmds.getAttr('{}|{}.io'.format(skinObject, r))
+            if io:
+                continue
+
+            visible = cmds.getAttr("{}|{}.v".format(skinObject, r))
+            if not visible:
+                hiddenShape = r
+                hiddenShapeWithPath = "{}|{}".format(skinObject, r)
+                continue
+
+            skinShape = r
+            skinShapeWithPath = "{}|{}".format(skinObject, r)
+            break
+
+    if skinShape:
+        if len(skinShape) == 0:
+            if len(hiddenShape) == 0:
+                return None
+
+            else:
+                skinShape = hiddenShape
+                skinShapeWithPath = hiddenShapeWithPath
+
+    clusters = cmds.ls(typ="skinCluster")
+    for c in clusters:
+        geom = cmds.skinCluster(c, q=True, g=True)
+        for g in geom:
+            if g == skinShape or g == skinShapeWithPath:
+                return c
+
+    return None
+
+
+## BULK READ / WRITE
+########################################################################
+def readWeights(skin, mesh, indices=None):
+    """
+    Returns (indices, weights) where weights is an (len(indices), numInfluences) float64 matrix.
+    indices=None reads every vertex of the mesh.
+    """
+    fn = getSkinFn(skin)
+    path = getDagPath(mesh)
+    if indices is None:
+        indices = np.arange(om2.MFnMesh(path).numVertices, dtype=np.intp)
+    indices = np.asarray(indices, dtype=np.intp)
+    if not len(indices):
+        return indices, np.zeros((0, len(fn.influenceObjects())))
+    weights, numInf = fn.getWeights(path, vertexComponent(indices))
+    weights = np.fromiter(weights, dtype=np.float64, count=len(weights))
+    return indices, weights.reshape(-1, numInf)
+
+
+def applyWeights(skin, mesh, indices, weights, influences=None):
+    """
+    Raw setWeights call, not undoable. Returns the previous weights as a matrix of the same shape.
+    influences are physical influence indices, None meaning all of them.
+    """
+    fn = getSkinFn(skin)
+    path = getDagPath(mesh)
+    weights = np.asarray(weights, dtype=np.float64)
+    if influences is None:
+        influences = range(weights.shape[1])
+    cache = _weightCaches.get((skin, mesh))
+    if cache:
+        cache.suspended += 1
+    try:
+        old = fn.setWeights(path, vertexComponent(indices), om2.MIntArray([int(i) for i in influences]),
+                            om2.MDoubleArray(weights.ravel().tolist()), False, True)
+    except Exception:
+        # the callback was suspended, so nothing else will tell the cache the write may be partial
+        if cache:
+            cache.dirty = True
+        raise
+    finally:
+        if cache:
+            cache.suspended -= 1
+    if cache:
+        cache.update(indices, weights, influences)
+    return np.fromiter(old, dtype=np.float64, count=len(old)).reshape(weights.shape)
+
+
+def loadUndoPlugin():
+    if not cmds.pluginInfo(UNDO_PLUGIN, q=1, loaded=1):
+        cmds.loadPlugin(os.path.join(os.path.dirname(os.path.abspath(__file__)), UNDO_PLUGIN + '.py'), quiet=1)
+
+
+def popPendingWrite():
+    return _pendingWrites.pop(0)
+
+
+def writeWeights(skin, mesh, indices, weights, influences=None):
+    """
+    Writes a weight block back in one setWeights call.
+    Goes through the skinWranglerSetWeights command so the write lands on Maya's undo queue.
+    """
+    loadUndoPlugin()
+    _pendingWrites.append((skin, mesh, np.asarray(indices, dtype=np.intp),
+                           np.asarray(weights, dtype=np.float64), influences))
+    try:
+        cmds.skinWranglerSetWeights()
+    finally:
+        del _pendingWrites[:]
+
+
+def iterWeightChunks(skin, mesh, chunkSize=READ_CHUNK):
+    """Yields (indices, weights) blocks covering the whole mesh so big meshes never get read densely at once"""
+    numVerts = om2.MFnMesh(getDagPath(mesh)).numVertices
+    for start in range(0, numVerts, chunkSize):
+        yield readWeights(skin, mesh, np.arange(start, min(start + chunkSize, numVerts), dtype=np.intp))
+
+
+## BLEND WEIGHTS
+########################################################################
+BLEND_COLOR_SET = 'skinWranglerBlend'
+
+# {mesh: (history nodes added by the blend weight preview, previous current color set)}
+_blendPreviews = {}
+
+
+def readBlendWeights(skin, mesh, indices=None):
+    """
+    Returns (indices, values), the per vertex dual quaternion blend weights as a float64 array.
+    indices=None reads every vertex of the mesh.
+    """
+    path = getDagPath(mesh)
+    if indices is None:
+        indices = np.arange(om2.MFnMesh(path).numVertices, dtype=np.intp)
+    indices = np.asarray(indices, dtype=np.intp)
+    if not len(indices):
+        return indices, np.zeros(0)
+    values = getSkinFn(skin).getBlendWeights(path, vertexComponent(indices))
+    return indices, np.fromiter(values, dtype=np.float64, count=len(values))
+
+
+def applyBlendWeights(skin, mesh, indices, values):
+    """Raw setBlendWeights call, not undoable. Returns the previous values."""
+    old = readBlendWeights(skin, mesh, indices)[1]
+    getSkinFn(skin).setBlendWeights(getDagPath(mesh), vertexComponent(indices),
+                                    om2.MDoubleArray(np.asarray(values, dtype=np.float64).tolist()))
+    return old
+
+
+def writeBlendWeights(skin, mesh, indices, values):
+    """Writes blend weights in one setBlendWeights call through the undoable skinWranglerSetBlendWeights command"""
+    loadUndoPlugin()
+    _pendingWrites.append((skin, mesh, np.asarray(indices, dtype=np.intp), np.asarray(values, dtype=np.float64)))
+    try:
+        cmds.skinWranglerSetBlendWeights()
+    finally:
+        del _pendingWrites[:]
+
+
+def clearBlendPreview(mesh=None):
+    """Removes the blend weight preview of a mesh, or of every previewed mesh, history nodes included"""
+    for key in ([mesh] if mesh else list(_blendPreviews)):
+        nodes, colorSet = _blendPreviews.pop(key, ([], None))
+        nodes = [n for n in nodes if cmds.objExists(n)]
+        if nodes:
+            cmds.delete(nodes)
+        if not cmds.objExists(key):
+            continue
+        cmds.setAttr(key + '.displayColors', 0)
+        if colorSet and colorSet in (cmds.polyColorSet(key, q=1, allColorSets=1) or []):
+            cmds.polyColorSet(key, currentColorSet=1, colorSet=colorSet)
+
+
+def previewBlendWeights(mesh, indices, values):
+    """
+    Shows blend weights as vertex colors in the viewport, black for linear up to white for dual
+    quaternion, set in one setVertexColors call on a dedicated color set. The history nodes this
+    adds to the mesh are remembered and deleted again by clearBlendPreview.
+    """
+    clearBlendPreview(mesh)
+    history = set(cmds.listHistory(mesh) or [])
+    colorSet = (cmds.polyColorSet(mesh, q=1, currentColorSet=1) or [None])[0]
+    if BLEND_COLOR_SET not in (cmds.polyColorSet(mesh, q=1, allColorSets=1) or []):
+        cmds.polyColorSet(mesh, create=1, colorSet=BLEND_COLOR_SET, representation='RGB')
+    cmds.polyColorSet(mesh, currentColorSet=1, colorSet=BLEND_COLOR_SET)
+    values = np.asarray(values, dtype=np.float64)
+    colors = om2.MColorArray([om2.MColor((v, v, v)) for v in values.tolist()])
+    # meshes with history (every skinned one) take the colors through a polyColorPerVertex node
+    modifier = om2.MDGModifier()
+    om2.MFnMesh(getDagPath(mesh)).setVertexColors(colors, om2.MIntArray([int(i) for i in indices]), modifier)
+    modifier.doIt()
+    cmds.setAttr(mesh + '.displayColors', 1)
+    _blendPreviews[mesh] = (list(set(cmds.listHistory(mesh) or []) - history), colorSet)
+
+
+## FULL MESH CACHE
+########################################################################
+_weightCaches = {}
+
+
+class WeightCache(object):
+    """
+    Sparse full-mesh weights of one skinCluster/mesh pair.
+    Our own writes patch the rows in place, any other weightList edit (paint tools, skinPercent...)
+    flags the cache dirty through an attribute callback and it gets re-read on next access. The
+    influence names it was read with are kept too, so influences added or removed outside the tool
+    (which shift the columns without a weightList edit) also trigger a re-read.
+    """
+
+    def __init__(self, skin, mesh):
+        self.skin = skin
+        self.mesh = mesh
+        self.dirty = True
+        self.suspended = 0
+        self.weights = None
+        self.influences = None
+        self.callbacks = [om2.MNodeMessage.addAttributeChangedCallback(getMObject(skin), self._attrChanged)]
+
+    def _attrChanged(self, msg, plug, otherPlug, clientData):
+        if self.suspended or not msg & om2.MNodeMessage.kAttributeSet:
+            return
+        if plug.partialName().startswith(('wl', 'weightList')):
+            self.dirty = True
+
+    def stale(self):
+        return self.dirty or self.weights is None or self.influences != influenceNames(self.skin)
+
+    def read(self):
+        self.influences = influenceNames(self.skin)
+        shape = (om2.MFnMesh(getDagPath(self.mesh)).numVertices, len(self.influences))
+        self.weights = skinwranglerindex.SparseWeights.fromChunks(iterWeightChunks(self.skin, self.mesh), shape)
+        self.dirty = False
+
+    def sparse(self):
+        if self.stale():
+            self.read()
+        return self.weights
+
+    def index(self):
+        return self.sparse().index()
+
+    def update(self, indices, weights, influences=None):
+        if self.stale():
+            self.dirty = True
+        else:
+            self.weights.replaceRows(indices, weights, influences)
+
+    def remove(self):
+        for cb in self.callbacks:
+            om2.MMessage.removeCallback(cb)
+        self.callbacks = []
+
+
+def weightCache(skin, mesh):
+    key = (skin, mesh)
+    cache = _weightCaches.get(key)
+    if cache is None:
+        cache = _weightCaches[key] = WeightCache(skin, mesh)
+    return cache
+
+
+def invalidate(skin):
+    """Drops every cache of a skinCluster, needed once its influence list changes"""
+    for key in [key for key in _weightCaches if key[0] == skin]:
+        _weightCaches.pop(key).remove()
+    if skin in _lockCaches:
+        _lockCaches.pop(skin).remove()
+
+
+## LOCKS
+########################################################################
+_lockCaches = {}
+
+
+def _lockPlug(node):
+    """The lockInfluenceWeights plug of an influence, None for influences without one"""
+    fn = om2.MFnDependencyNode(node)
+    return fn.findPlug('liw', False) if fn.hasAttribute('liw') else None
+
+
+class LockCache(object):
+    """
+    Lock state of a skinCluster's influences as a bool mask in influence order. Read once, then
+    kept current by attribute changed callbacks on every influence's liw plug.
+    """
+
+    def __init__(self, skin):
+        self.skin = skin
+        self.influences = influenceNames(skin)
+        self.mask = np.zeros(len(self.influences), dtype=bool)
+        self.callbacks = []
+        for i, inf in enumerate(self.influences):
+            node = getMObject(inf)
+            plug = _lockPlug(node)
+            self.mask[i] = plug.asBool() if plug is not None else False
+            self.callbacks.append(om2.MNodeMessage.addAttributeChangedCallback(node, self._attrChanged, i))
+
+    def _attrChanged(self, msg, plug, otherPlug, clientData):
+        # liw is added on the fly to influences that aren't joints, so additions count too
+        if not msg & (om2.MNodeMessage.kAttributeSet | om2.MNodeMessage.kAttributeAdded):
+            return
+        if plug.partialName() in ('liw', 'lockInfluenceWeights'):
+            self.mask[clientData] = plug.asBool()
+
+    def remove(self):
+        for cb in self.callbacks:
+            om2.MMessage.removeCallback(cb)
+        self.callbacks = []
+
+
+def lockCache(skin):
+    """LockCache of a skinCluster, rebuilt when its influence list changed"""
+    cache = _lockCaches.get(skin)
+    if cache is None or cache.influences != influenceNames(skin):
+        if cache is not None:
+            cache.remove()
+        cache = _lockCaches[skin] = LockCache(skin)
+    return cache
+
+
+def lockMask(skin):
+    """Bool mask of the influences with lockInfluenceWeights on, in influence order"""
+    return lockCache(skin).mask.copy()
+
+
+def setLocks(skin, influences, locked=True):
+    """Locks or unlocks the given influences of a skinCluster in one undoable skinCluster edit"""
+    cache = lockCache(skin)
+    lookup = dict((inf, i) for i, inf in enumerate(cache.influences))
+    # indexed through the cached mask, influences already in the requested state are skipped
+    columns = np.array([lookup[inf] for inf in influences if inf in lookup], dtype=np.intp)
+    columns = columns[cache.mask[columns] != bool(locked)]
+    if not len(columns):
+        return []
+    influences = [cache.influences[i] for i in columns]
+    cmds.skinCluster(skin, e=1, inf=influences, lw=bool(locked))
+    cache.mask[columns] = bool(locked)
+    return influences
+
+
+def clearCaches():
+    for cache in _weightCaches.values():
+        cache.remove()
+    _weightCaches.clear()
+    for cache in _lockCaches.values():
+        cache.remove()
+    _lockCaches.clear()
+    _adjacencyCache.clear()
+    _shellCache.clear()
+    _bvhCache.clear()
+    _topologyCache.clear()
+    for cb in _topologyCallbacks.values():
+        om2.MMessage.removeCallback(cb)
+    _topologyCallbacks.clear()
+    _nameIndexCache.clear()
+    _influenceTreeCache.clear()
+
+
+## WEIGHT FILES
+########################################################################
+WEIGHT_FILE_VERSION = 1
+
+
+def exportWeights(skin, mesh, path):
+    """Saves the sparse full-mesh weights with their influence names to a compressed .npz"""
+    weights = weightCache(skin, mesh).sparse()
+    np.savez_compressed(path, version=WEIGHT_FILE_VERSION, rows=weights.rows, cols=weights.cols,
+                        values=weights.values, shape=np.array(weights.shape),
+                        influences=np.array(influenceNames(skin)))
+
+
+def loadWeightFile(path):
+    """(influence names, SparseWeights) from a file written by exportWeights"""
+    data = np.load(path)
+    weights = skinwranglerindex.SparseWeights(data['rows'], data['cols'], data['values'], data['shape'])
+    return [str(name) for name in data['influences']], weights
+
+
+## SNAPSHOTS
+########################################################################
+_snapshotRing = skinwranglersnapshot.SnapshotRing()
+
+
+def snapshotRing():
+    return _snapshotRing
+
+
+def takeSnapshot(skin, mesh, name, compression='float16'):
+    """Stores the cached full-mesh weights in the snapshot ring, returns the names evicted to make room"""
+    snapshot = skinwranglersnapshot.Snapshot(name, skin, mesh, influenceNames(skin),
+                                             weightCache(skin, mesh).sparse(), compression)
+    return _snapshotRing.add(snapshot)
+
+
+def restoreSnapshot(name, indices=None):
+    """
+    Writes a snapshot back in one write, every vertex or just indices. Influences are matched by name,
+    only the ones used by either the snapshot or the current weights are written.
+    """
+    snapshot = _snapshotRing.get(name)
+    skin, mesh = snapshot.skin, snapshot.mesh
+    stored = snapshot.sparse()
+    current = weightCache(skin, mesh).sparse()
+    if stored.shape[0] != current.shape[0]:
+        raise ValueError('Snapshot {} has {} vertices, {} has {}'.format(name, stored.shape[0], mesh,
+                                                                          current.shape[0]))
+    lookup = dict((inf, i) for i, inf in enumerate(influenceNames(skin)))
+    remap = np.array([lookup.get(inf, -1) for inf in snapshot.influences], dtype=np.intp)
+    cols = remap[stored.cols]
+    keep = cols >= 0
+    if not keep.all():
+        logger.warning('Snapshot {} influences no longer on {} are dropped'.format(name, skin))
+    target = skinwranglerindex.SparseWeights(stored.rows[keep], cols[keep], stored.values[keep], current.shape)
+
+    rows = np.arange(current.shape[0]) if indices is None else np.asarray(indices, dtype=np.intp)
+    used = np.union1d(np.unique(target.cols), np.unique(current.cols))
+    writeWeights(skin, mesh, rows, target.toDense(rows)[:, used], used)
+
+
+_nameIndexCache = {}
+_influenceTreeCache = {}
+
+
+def influenceNameIndex(names):
+    """NameIndex for a list of influences, built once per distinct influence list"""
+    key = tuple(names)
+    index = _nameIndexCache.get(key)
+    if index is None:
+        longNames = cmds.ls(names, long=1) if names else []
+        if len(longNames) != len(names):
+            longNames = names
+        index = _nameIndexCache[key] = skinwranglerindex.NameIndex(names, longNames)
+    return index
+
+
+def influenceLongNames(names):
+    longNames = cmds.ls(names, long=1) if names else []
+    if len(longNames) != len(names):
+        longNames = [(cmds.ls(name, long=1) or [name])[0] for name in names]
+    return longNames
+
+
+def influenceParents(names):
+    """Parent index array: the nearest DAG ancestor of each influence that is also in names, -1 for roots"""
+    return skinwranglerindex.parentIndices(influenceLongNames(names))
+
+
+def influenceTree(names):
+    """InfluenceTree of a list of influences, keyed by their long names so reparenting rebuilds it"""
+    key = tuple(influenceLongNames(names))
+    tree = _influenceTreeCache.get(key)
+    if tree is None:
+        tree = _influenceTreeCache[key] = skinwranglerindex.InfluenceTree(skinwranglerindex.parentIndices(key))
+    return tree
+
+
+def bindMatrices(skin):
+    """
+    (influence names, world matrices, bindPreMatrix entries) of a skinCluster,
+    the matrices stacked as (numInfluences, 4, 4) arrays in Maya's row-major layout.
+    """
+    fn = getSkinFn(skin)
+    paths = fn.influenceObjects()
+    plug = fn.findPlug('bindPreMatrix', False)
+    world = np.empty((len(paths), 4, 4))
+    bindPre = np.empty((len(paths), 4, 4))
+    for i, path in enumerate(paths):
+        world[i] = np.reshape(list(path.inclusiveMatrix()), (4, 4))
+        element = plug.elementByLogicalIndex(fn.indexForInfluenceObject(path))
+        bindPre[i] = np.reshape(list(om2.MFnMatrixData(element.asMObject()).matrix()), (4, 4))
+    return [path.partialPathName() for path in paths], world, bindPre
+
+
+def setBindPreMatrices(skin, names, matrices):
+    """Writes bindPreMatrix entries for the given influences"""
+    fn = getSkinFn(skin)
+    for name, matrix in zip(names, matrices):
+        logical = fn.indexForInfluenceObject(getDagPath(name))
+        cmds.setAttr('{}.bindPreMatrix[{}]'.format(skin, logical), *np.ravel(matrix).tolist(), type='matrix')
+
+
+def bindPoses(skin, influences=None):
+    """
+    Bind pose dagPose nodes of a skinCluster: the one plugged into .bindPose first, then any other
+    bind pose its influences are members of. More than one is Maya's 'multiple bind poses' case.
+    """
+    poses = cmds.listConnections(skin + '.bindPose', s=1, d=0, type='dagPose') or []
+    if influences is None:
+        influences = influenceNames(skin)
+    members = cmds.listConnections(influences, s=0, d=1, type='dagPose') if influences else None
+    for pose in members or []:
+        if pose not in poses and cmds.dagPose(pose, q=1, bindPose=1):
+            poses.append(pose)
+    return poses
+
+
+def jointSegments(joints):
+    """
+    (starts, ends) world space bone segments, from each joint to the average of its child joints.
+    Joints without children get a zero length segment.
+    """
+    starts = np.empty((len(joints), 3))
+    ends = np.empty((len(joints), 3))
+    for i, jnt in enumerate(joints):
+        starts[i] = cmds.xform(jnt, q=1, ws=1, t=1)
+        children = cmds.listRelatives(jnt, c=1, type='joint', f=1)
+        if children:
+            ends[i] = np.mean([cmds.xform(child, q=1, ws=1, t=1) for child in children], axis=0)
+        else:
+            ends[i] = starts[i]
+    return starts, ends
+
+
+def skinGeometry(skin):
+    """First deformed shape of a skinCluster"""
+    return getSkinFn(skin).getPathAtIndex(0).partialPathName()
+
+
+def addInfluences(skin, joints):
+    """Adds joints missing from a skinCluster in one call with zero weight, returns the ones added"""
+    existing = set(influenceNames(skin))
+    new = [jnt for jnt in joints if getDagPath(jnt).partialPathName() not in existing]
+    if new:
+        cmds.skinCluster(skin, e=1, lw=1, wt=0, ai=new)
+        for jnt in new:
+            cmds.setAttr(jnt + '.liw', 0)
+        invalidate(skin)
+    return new
+
+
+def createJoints(names, centers, rotations=None, parent=None):
+    """
+    Creates one joint per center in one pass, optionally oriented (rotation rows are the joint axes,
+    baked into jointOrient) and all parented under parent in a single call. Returns the joint names.
+    """
+    cmds.select(cl=1)
+    joints = []
+    for i, name in enumerate(names):
+        matrix = np.eye(4)
+        if rotations is not None:
+            matrix[:3, :3] = rotations[i]
+        matrix[3, :3] = centers[i]
+        jnt = cmds.createNode('joint', n=name)
+        cmds.xform(jnt, ws=1, m=matrix.ravel().tolist())
+        joints.append(jnt)
+    if parent and joints:
+        joints = cmds.parent(joints, parent)
+    if rotations is not None and joints:
+        cmds.makeIdentity(joints, apply=1, r=1)
+    return joints
+
+
+## TOPOLOGY
+########################################################################
+_adjacencyCache = {}
+_shellCache = {}
+# {mesh: (topology hash, points hash, TriangleBVH)}, poses change too often to be worth a disk record
+_bvhCache = {}
+# {mesh: (signature, topology hash)} and the topology changed callbacks clearing it
+_topologyCache = {}
+_topologyCallbacks = {}
+_meshCache = skinwranglercache.MeshCache()
+
+
+def meshCache():
+    """The on-disk MeshCache derived mesh data goes through"""
+    return _meshCache
+
+
+def meshFaces(mesh):
+    """(polygon vertex counts, face-vertex connects) as int arrays"""
+    counts, connects = om2.MFnMesh(getDagPath(mesh)).getVertices()
+    return np.array(counts, dtype=np.intp), np.array(connects, dtype=np.intp)
+
+
+def _topologyChanged(node, clientData):
+    mesh = clientData
+    _topologyCache.pop(mesh, None)
+    _adjacencyCache.pop(mesh, None)
+    _shellCache.pop(mesh, None)
+    _bvhCache.pop(mesh, None)
+
+
+def meshTopology(mesh):
+    """
+    Topology hash of a mesh, the key of its records in meshCache(). Recomputed after a topology
+    changed callback or when the vertex/edge/face counts differ from last time.
+    """
+    fn = om2.MFnMesh(getDagPath(mesh))
+    signature = (fn.numVertices, fn.numEdges, fn.numPolygons)
+    cached = _topologyCache.get(mesh)
+    if cached is None or cached[0] != signature:
+        counts, connects = meshFaces(mesh)
+        cached = _topologyCache[mesh] = (signature, skinwranglercache.topologyHash(fn.numVertices, counts, connects))
+        if mesh not in _topologyCallbacks:
+            _topologyCallbacks[mesh] = om2.MPolyMessage.addPolyTopologyChangedCallback(getMObject(mesh),
+                                                                                       _topologyChanged, mesh)
+    return cached[1]
+
+
+def meshAdjacency(mesh):
+    """Vertex adjacency of a mesh, from memory, then the disk cache, then built from the faces"""
+    topology = meshTopology(mesh)
+    cached = _adjacencyCache.get(mesh)
+    if cached is None or cached[0] != topology:
+
+        def build():
+            counts, connects = meshFaces(mesh)
+            numVerts = om2.MFnMesh(getDagPath(mesh)).numVertices
+            return skinwranglermesh.Adjacency.fromFaces(counts, connects, numVerts).toArrays()
+
+        arrays = meshCache().getOrBuild(topology, 'adjacency', build)
+        cached = _adjacencyCache[mesh] = (topology, skinwranglermesh.Adjacency.fromArrays(arrays))
+    return cached[1]
+
+
+def meshShells(mesh):
+    """Shell label of every vertex, from memory, then the disk cache, then a union-find over the adjacency"""
+    topology = meshTopology(mesh)
+    cached = _shellCache.get(mesh)
+    if cached is None or cached[0] != topology:
+        arrays = meshCache().getOrBuild(topology, 'shells',
+                                        lambda: {'labels': skinwranglermesh.shellLabels(meshAdjacency(mesh))})
+        cached = _shellCache[mesh] = (topology, arrays['labels'])
+    return cached[1]
+
+
+def meshPoints(mesh):
+    """World space vertex positions as an (n, 3) array, in one xform call"""
+    return np.array(cmds.xform('{}.vtx[*]'.format(mesh), q=1, ws=1, t=1), dtype=np.float64).reshape(-1, 3)
+
+
+def meshBVH(mesh):
+    """
+    Closest point BVH over the current world space triangles of a mesh. Kept in memory for the last
+    pose of each mesh only, so posed rebuilds never write to or evict from the disk cache.
+    """
+    points = meshPoints(mesh)
+    topology = meshTopology(mesh)
+    pose = skinwranglercache.arrayHash(points)
+    cached = _bvhCache.get(mesh)
+    if cached is None or cached[:2] != (topology, pose):
+        counts, connects = meshFaces(mesh)
+        bvh = skinwranglerspatial.TriangleBVH.fromFaces(points, counts, connects)
+        cached = _bvhCache[mesh] = (topology, pose, bvh)
+    return cached[2]
+
+
+def transferWeights(sourceSkin, sourceMesh, targetSkin, targetMesh, indices=None):
+    """
+    Closest point weight transfer: every target vertex (or the given ones) gets the source rows of
+    its closest point on the source surface, blended barycentrically. Source influences the result
+    uses are added to the target, locked target influences are kept. One undoable write.
+    Returns (vertex indices, distance of each to the source surface).
+    """
+    if indices is None:
+        indices = np.arange(om2.MFnMesh(getDagPath(targetMesh)).numVertices, dtype=np.intp)
+    indices = np.asarray(indices, dtype=np.intp)
+    bvh = meshBVH(sourceMesh)
+    tris, bary, distance = bvh.closestPoint(meshPoints(targetMesh)[indices])
+    sourceNames = influenceNames(sourceSkin)
+    rows = skinwranglerops.interpolateRows(weightCache(sourceSkin, sourceMesh).sparse(), bvh.triangles[tris],
+                                           bary)
+
+    addInfluences(targetSkin, skinwranglerops.transferNames(rows, sourceNames, influenceNames(targetSkin)))
+    locked = lockMask(targetSkin)
+    current = weightCache(targetSkin, targetMesh).sparse()[indices] if locked.any() else None
+    weights = skinwranglerops.transferRows(rows, sourceNames, influenceNames(targetSkin), current, locked)
+    writeWeights(targetSkin, targetMesh, indices, weights)
+    return indices, distance
+
+
+def meshNormals(mesh):
+    """World space per vertex normals as an (n, 3) array"""
+    normals = om2.MFnMesh(getDagPath(mesh)).getVertexNormals(False, om2.MSpace.kWorld)
+    return np.array([(n.x, n.y, n.z) for n in normals], dtype=np.float64).reshape(-1, 3)
+
+
+## SHARED MEMORY
+########################################################################
+def publishSkin(skin, mesh, indices=None):
+    """
+    Shared memory block for out of process solvers: 'weights' (every vertex, dense), 'points',
+    'edges' and 'indices' (the rows to commit back). The weights are scattered straight from the
+    sparse cache into the block, no intermediate dense copy.
+    """
+    weights = weightCache(skin, mesh).sparse()
+    adjacency = meshAdjacency(mesh)
+    indices = np.arange(weights.shape[0]) if indices is None else np.asarray(indices, dtype=np.intp)
+    shared = skinwranglershared.SharedArrays.create([('weights', weights.shape, np.float64),
+                                                     ('points', (weights.shape[0], 3), np.float64),
+                                                     ('edges', adjacency.edges.shape, np.intp),
+                                                     ('indices', indices.shape, np.intp)])
+    shared['weights'][weights.rows, weights.cols] = weights.values
+    shared['points'][:] = meshPoints(mesh)
+    shared['edges'][:] = adjacency.edges
+    shared['indices'][:] = indices
+    return shared
+
+
+def rowsHash(skin, mesh, indices):
+    """Digest of the cached rows of the given vertices, tells whether they were edited in between"""
+    return skinwranglercache.arrayHash(weightCache(skin, mesh).sparse().toDense(indices))
+
+
+def commitShared(shared, skin, mesh):
+    """
+    Writes the rows of a published block's indices back in one write. Locked columns are put back
+    from the current weights whatever the solver did with them.
+    """
+    indices = shared['indices']
+    weights = shared['weights']
+    weights = weights if len(indices) == len(weights) else weights[indices]
+    locked = lockMask(skin)
+    if locked.any():
+        weights = skinwranglerops.keepLocked(weights, weightCache(skin, mesh).sparse().toDense(indices), locked)
+    writeWeights(skin, mesh, indices, weights)
+
+
+## SELECTION
+########################################################################
+def selectedVertices():
+    """
+    Returns an OrderedDict {meshShape: vertex indices} for the current selection.
+    Faces/edges are converted to vertices, whole objects expand to every vertex.
+    """
+    result = OrderedDict()
+    sel = cmds.ls(sl=1)
+    if not sel:
+        return result
+    verts = cmds.polyListComponentConversion(sel, toVertex=1) or []
+    selList = om2.MSelectionList()
+    for vtx in verts:
+        selList.add(vtx)
+    for i in range(selList.length()):
+        path, comp = selList.getComponent(i)
+        if comp.isNull():
+            continue
+        mesh = path.partialPathName()
+        elements = om2.MFnSingleIndexedComponent(comp).getElements()
+        if mesh in result:
+            result[mesh] = np.union1d(result[mesh], np.asarray(elements, dtype=np.intp))
+        else:
+            result[mesh] = np.unique(np.asarray(elements, dtype=np.intp))
+    return result
+
+
+## SESSION
+########################################################################
+class SkinData(object):
+    """
+    One mesh/skinCluster pair and the selected vertices.
+    columns maps each local influence to its column in the session's union influence table.
+    """
+
+    def __init__(self, skin, mesh, indices=None):
+        self.skin = skin
+        self.mesh = mesh
+        self.influences = influenceNames(skin)
+        if indices is None:
+            indices = np.arange(om2.MFnMesh(getDagPath(mesh)).numVertices, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.columns = np.zeros(len(self.influences), dtype=np.intp)
+        self._blendWeights = None
+
+    def __len__(self):
+        return len(self.indices)
+
+    def localColumns(self, names):
+        """Local column indices of the given influence names, skipping names this skinCluster doesn't have"""
+        lookup = dict((inf, i) for i, inf in enumerate(self.influences))
+        return np.array([lookup[n] for n in names if n in lookup], dtype=np.intp)
+
+    def components(self, indices=None):
+        if indices is None:
+            indices = self.indices
+        return ['{}.vtx[{}]'.format(self.mesh, i) for i in indices]
+
+    @property
+    def weights(self):
+        """
+        Dense rows of the selected vertices, pulled from the dirty tracked WeightCache on every access
+        so edits made outside skinWrangler since the session was built are never written back over.
+        """
+        return self.meshWeights()[self.indices]
+
+    def meshWeights(self):
+        """Sparse weights of every vertex of the mesh, rows can be pulled out densely with meshWeights()[indices]"""
+        return weightCache(self.skin, self.mesh).sparse()
+
+    def adjacency(self):
+        return meshAdjacency(self.mesh)
+
+    def points(self):
+        return meshPoints(self.mesh)
+
+    def shells(self):
+        return meshShells(self.mesh)
+
+    def locked(self):
+        """Lock mask over this cluster's influences, from the callback maintained LockCache"""
+        return lockMask(self.skin)
+
+    def influenceIndex(self):
+        """Column-major index over the whole mesh, not just the selected rows"""
+        return weightCache(self.skin, self.mesh).index()
+
+    def commit(self, weights):
+        """Writes the full rows back in one call, the WeightCache is patched with them by the write"""
+        writeWeights(self.skin, self.mesh, self.indices, weights)
+
+    def blendWeights(self):
+        """Blend weights of the selected vertices, read on first use"""
+        if self._blendWeights is None:
+            self._blendWeights = readBlendWeights(self.skin, self.mesh, self.indices)[1]
+        return self._blendWeights
+
+    def meshBlendWeights(self):
+        """Blend weights of every vertex of the mesh"""
+        return readBlendWeights(self.skin, self.mesh)[1]
+
+    def commitBlend(self, values, indices=None):
+        """Writes blend weights for the selected vertices, or the given ones, in one call"""
+        if indices is None or np.array_equal(indices, self.indices):
+            writeBlendWeights(self.skin, self.mesh, self.indices, values)
+            self._blendWeights = np.asarray(values, dtype=np.float64)
+        else:
+            writeBlendWeights(self.skin, self.mesh, indices, values)
+
+    def commitRows(self, indices, weights):
+        """Writes full rows for any vertices of the mesh, not just the selected ones"""
+        indices = np.asarray(indices, dtype=np.intp)
+        if np.array_equal(indices, self.indices):
+            return self.commit(weights)
+        writeWeights(self.skin, self.mesh, indices, weights)
+
+
+class SkinSession(object):
+    """
+    Groups a selection spanning any number of skinned meshes by skinCluster
+    and keeps a union influence table across all of them.
+    """
+
+    def __init__(self, clusters):
+        self.clusters = list(clusters)
+        self.influences = []
+        lookup = {}
+        for data in self.clusters:
+            for i, inf in enumerate(data.influences):
+                if inf not in lookup:
+                    lookup[inf] = len(self.influences)
+                    self.influences.append(inf)
+                data.columns[i] = lookup[inf]
+
+    @classmethod
+    def fromSelection(cls):
+        clusters = []
+        for mesh, indices in selectedVertices().items():
+            skin = findRelatedSkinCluster(mesh)
+            if not skin:
+                cmds.warning('Cannot find a skinCluster related to [' + mesh + ']')
+                continue
+            clusters.append(SkinData(skin, mesh, indices))
+        return cls(clusters)
+
+    def wholeMeshes(self):
+        """A session over every vertex of the meshes in this one"""
+        return SkinSession(SkinData(data.skin, data.mesh) for data in self.clusters)
+
+    def __len__(self):
+        return sum(len(data) for data in self.clusters)
+
+    def __bool__(self):
+        return bool(self.clusters)
+
+    __nonzero__ = __bool__
+
+    @property
+    def skins(self):
+        return [data.skin for data in self.clusters]
+
+    @property
+    def meshes(self):
+        return [data.mesh for data in self.clusters]
+
+    def nameIndex(self):
+        return influenceNameIndex(self.influences)
+
+    def averageWeights(self):
+        """Average weight per union influence over every selected vertex of every cluster"""
+        total = np.zeros(len(self.influences))
+        count = len(self)
+        for data in self.clusters:
+            total[data.columns] += data.weights.sum(axis=0)
+        if count:
+            total /= count
+        return total
+
+    def averageDict(self, threshold=0.0):
+        avg = self.averageWeights()
+        return OrderedDict((inf, avg[i]) for i, inf in enumerate(self.influences) if avg[i] > threshold)
+
+    def influenceCounts(self, threshold=0.0):
+        """Vertices per union influence above threshold, over the whole of every mesh in the session"""
+        counts = np.zeros(len(self.influences), dtype=np.intp)
+        for data in self.clusters:
+            counts[data.columns] += data.influenceIndex().counts(threshold)
+        return counts
+
+    def influenceComponents(self, names, threshold=0.0):
+        """Vertex components of every mesh in the session weighted to any of the named influences above threshold"""
+        comps = []
+        for data in self.clusters:
+            verts = data.influenceIndex().verticesOf(data.localColumns(names), threshold)
+            comps.extend(data.components(verts))
+        return comps
+
+    def lockMask(self):
+        """Union influences locked on any cluster of the session"""
+        locked = np.zeros(len(self.influences), dtype=bool)
+        for data in self.clusters:
+            locked[data.columns] |= data.locked()
+        return locked
+
+    def components(self):
+        comps = []
+        for data in self.clusters:
+            comps.extend(data.components())
+        return comps
+
+    def averageBlendWeight(self):
+        """Mean blend weight over every selected vertex of every cluster"""
+        count = len(self)
+        return sum(data.blendWeights().sum() for data in self.clusters) / count if count else 0.0
+
+    def applyBlend(self, func):
+        """
+        Like apply, for blend weights: func(data) returns the new values of the selected vertices,
+        (vertex indices, values) for other rows or None to skip, one write per cluster.
+        """
+        for data in self.clusters:
+            result = func(data)
+            if result is None:
+                continue
+            if isinstance(result, tuple):
+                data.commitBlend(result[1], result[0])
+            else:
+                data.commitBlend(result)
+
+    def apply(self, func):
+        """
+        Calls func(data) for every cluster and commits the returned weight matrix with one write per cluster.
+        func may also return (vertex indices, weights) to write rows other than the selected ones,
+        returning None skips the cluster.
+        """
+        for data in self.clusters:
+            result = func(data)
+            if result is None:
+                continue
+            if isinstance(result, tuple):
+                data.commitRows(*result)
+            else:
+                data.commit(result)
@@ -0,0 +1,396 @@
+"""
+skinWrangler sparse weight indices
+
+Sparse views over a full mesh weight matrix. SparseWeights keeps the non-zero weights
+row by row so blocks of vertices can be swapped in after a write, InfluenceIndex is the
+column-major (CSC) view answering "which vertices does this influence touch" in
+O(nnz of that column).
+"""
+
+import numpy as np
+
+
+class SparseWeights(object):
+    """Non-zero weights of a (vertices, influences) matrix stored as sorted COO triplets"""
+
+    def __init__(self, rows, cols, values, shape, presorted=False):
+        self.rows = np.asarray(rows, dtype=np.intp)
+        self.cols = np.asarray(cols, dtype=np.intp)
+        self.values = np.asarray(values, dtype=np.float64)
+        if not presorted:
+            order = np.lexsort((self.cols, self.rows))
+            self.rows, self.cols, self.values = self.rows[order], self.cols[order], self.values[order]
+        self.shape = tuple(shape)
+        self._index = None
+
+    @classmethod
+    def fromDense(cls, weights, rowIndices=None):
+        weights = np.asarray(weights, dtype=np.float64)
+        rows, cols = np.nonzero(weights)
+        values = weights[rows, cols]
+        if rowIndices is not None:
+            rows = np.asarray(rowIndices, dtype=np.intp)[rows]
+        return cls(rows, cols, values, weights.shape)
+
+    @classmethod
+    def fromChunks(cls, chunks, shape):
+        """Builds from an iterable of (rowIndices, denseBlock) without ever holding the full dense matrix"""
+        rows, cols, values = [], [], []
+        for rowIndices, block in chunks:
+            r, c = np.nonzero(block)
+            rows.append(np.asarray(rowIndices, dtype=np.intp)[r])
+            cols.append(c)
+            values.append(block[r, c])
+        if not rows:
+            return cls(np.zeros(0), np.zeros(0), np.zeros(0), shape)
+        return cls(np.concatenate(rows), np.concatenate(cols), np.concatenate(values), shape)
+
+    def __getitem__(self, rowIndices):
+        """Dense rows, so a SparseWeights can stand in for a full matrix when only a few rows get read"""
+        return self.toDense(rowIndices)
+
+    @property
+    def nnz(self):
+        return len(self.values)
+
+    def rowCounts(self, threshold=0.0):
+        """Number of influences per row with a weight above threshold"""
+        rows = self.rows[self.values > threshold] if threshold > 0.0 else self.rows
+        return np.bincount(rows, minlength=self.shape[0])
+
+    def rowSums(self):
+        return np.bincount(self.rows, self.values, self.shape[0])
+
+    def rowPointers(self):
+        return np.concatenate(([0], np.cumsum(np.bincount(self.rows, minlength=self.shape[0]))))
+
+    def toDense(self, rowIndices=None):
+        """Dense block for the given rows (all rows if None), in the order given"""
+        if rowIndices is None:
+            dense = np.zeros(self.shape)
+            dense[self.rows, self.cols] = self.values
+            return dense
+        rowIndices = np.asarray(rowIndices, dtype=np.intp)
+        lookup = np.full(self.shape[0], -1, dtype=np.intp)
+        lookup[rowIndices] = np.arange(len(rowIndices))
+        dense = np.zeros((len(rowIndices), self.shape[1]))
+        hit = lookup[self.rows] >= 0
+        dense[lookup[self.rows[hit]], self.cols[hit]] = self.values[hit]
+        return dense
+
+    def iterRowBlocks(self, chunkSize, columns=None):
+        """
+        Yields (rowIndices, dense block) over consecutive row chunks, restricted to columns when given.
+        The triplets are sorted by row, so every chunk is a slice of them.
+        """
+        if columns is None:
+            columns = np.arange(self.shape[1])
+        columns = np.asarray(columns, dtype=np.intp)
+        lookup = np.full(self.shape[1], -1, dtype=np.intp)
+        lookup[columns] = np.arange(len(columns))
+        for start in range(0, self.shape[0], chunkSize):
+            end = min(start + chunkSize, self.shape[0])
+            first, last = np.searchsorted(self.rows, [start, end])
+            cols = lookup[self.cols[first:last]]
+            hit = cols >= 0
+            block = np.zeros((end - start, len(columns)))
+            block[self.rows[first:last][hit] - start, cols[hit]] = self.values[first:last][hit]
+            yield np.arange(start, end, dtype=np.intp), block
+
+    def replaceRows(self, rowIndices, block, columns=None):
+        """Swaps in new weights for the given rows, columns limits the update to those influences"""
+        rowIndices = np.asarray(rowIndices, dtype=np.intp)
+        block = np.asarray(block, dtype=np.float64)
+        if columns is None:
+            columns = np.arange(self.shape[1])
+        columns = np.asarray(columns, dtype=np.intp)
+        colMask = np.zeros(self.shape[1], dtype=bool)
+        colMask[columns] = True
+        # the triplets are sorted by row, so the replaced ones are found per row range without a full scan
+        targets = np.unique(rowIndices)
+        starts = np.searchsorted(self.rows, targets, 'left')
+        counts = np.searchsorted(self.rows, targets, 'right') - starts
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        keep = np.ones(len(self.rows), dtype=bool)
+        keep[positions[colMask[self.cols[positions]]]] = False
+        keptRows, keptCols = self.rows[keep], self.cols[keep]
+        r, c = np.nonzero(block)
+        rows, cols, values = rowIndices[r], columns[c], block[r, c]
+        # only the new triplets get sorted, then merged into the kept ones which already are
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        at = np.searchsorted(keptRows * self.shape[1] + keptCols, rows * self.shape[1] + cols)
+        at += np.arange(len(at))
+        slots = np.ones(len(keptRows) + len(at), dtype=bool)
+        slots[at] = False
+        merged = []
+        for kept, new in ((keptRows, rows), (keptCols, cols), (self.values[keep], values)):
+            out = np.empty(len(slots), dtype=kept.dtype)
+            out[slots] = kept
+            out[at] = new
+            merged.append(out)
+        self.__init__(merged[0], merged[1], merged[2], self.shape, presorted=True)
+
+    def index(self):
+        """Column-major index, built lazily and dropped whenever rows are replaced"""
+        if self._index is None:
+            self._index = InfluenceIndex(self.rows, self.cols, self.values, self.shape)
+        return self._index
+
+
+def alignColumns(namesA, namesB):
+    """
+    Shared influence table for two name lists, matched with paths and namespaces stripped so the
+    same joints in two references line up. Returns (names, columnsA, columnsB) where names keeps
+    namesA as is followed by the names only B has.
+    """
+    short = lambda name: name.split('|')[-1].split(':')[-1]
+    lookup = dict((short(name), i) for i, name in enumerate(namesA))
+    names = list(namesA)
+    columnsB = []
+    for name in namesB:
+        key = short(name)
+        if key not in lookup:
+            lookup[key] = len(names)
+            names.append(name)
+        columnsB.append(lookup[key])
+    return names, np.arange(len(namesA), dtype=np.intp), np.array(columnsB, dtype=np.intp)
+
+
+def weightDiff(a, b, columnsA, columnsB, numColumns, chunkSize=65536):
+    """
+    Row-wise L1 and L-inf difference between two SparseWeights over the same vertices, their columns
+    mapped into a shared table of numColumns. Streams over row chunks of the sorted triplets, so
+    neither matrix is ever made dense. Returns (l1, linf, columnTotals).
+    """
+    if a.shape[0] != b.shape[0]:
+        raise ValueError('Cannot diff weights of {} and {} vertices'.format(a.shape[0], b.shape[0]))
+    numRows = a.shape[0]
+    columnsA = np.asarray(columnsA, dtype=np.intp)
+    columnsB = np.asarray(columnsB, dtype=np.intp)
+    l1 = np.zeros(numRows)
+    linf = np.zeros(numRows)
+    totals = np.zeros(numColumns)
+    for start in range(0, numRows, chunkSize):
+        end = min(start + chunkSize, numRows)
+        sliceA = slice(*np.searchsorted(a.rows, [start, end]))
+        sliceB = slice(*np.searchsorted(b.rows, [start, end]))
+        rows = np.concatenate((a.rows[sliceA], b.rows[sliceB])) - start
+        cols = np.concatenate((columnsA[a.cols[sliceA]], columnsB[b.cols[sliceB]]))
+        values = np.concatenate((a.values[sliceA], -b.values[sliceB]))
+        # entries present in both cancel out once summed per (row, column)
+        keys, inverse = np.unique(rows * numColumns + cols, return_inverse=True)
+        diff = np.abs(np.bincount(inverse.reshape(-1), values, len(keys)))
+        rows, cols = keys // numColumns, keys % numColumns
+        l1[start:end] = np.bincount(rows, diff, end - start)
+        np.maximum.at(linf[start:end], rows, diff)
+        totals += np.bincount(cols, diff, numColumns)
+    return l1, linf, totals
+
+
+class InfluenceIndex(object):
+    """
+    CSC index over a weight matrix: for column j the vertices are rows[indptr[j]:indptr[j + 1]]
+    with their weights in the same slice of values, sorted by vertex.
+    """
+
+    def __init__(self, rows, cols, values, shape):
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        order = np.lexsort((rows, cols))
+        self.rows = rows[order]
+        self.values = np.asarray(values, dtype=np.float64)[order]
+        self.shape = tuple(shape)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=self.shape[1]))))
+        self._entryCols = None
+
+    @classmethod
+    def fromDense(cls, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        rows, cols = np.nonzero(weights)
+        return cls(rows, cols, weights[rows, cols], weights.shape)
+
+    @property
+    def entryColumns(self):
+        if self._entryCols is None:
+            self._entryCols = np.repeat(np.arange(self.shape[1]), np.diff(self.indptr))
+        return self._entryCols
+
+    def column(self, col):
+        """(vertices, weights) of every non-zero weight of one influence"""
+        start, end = self.indptr[col], self.indptr[col + 1]
+        return self.rows[start:end], self.values[start:end]
+
+    def vertices(self, col, threshold=0.0):
+        """Vertices whose weight on col is above threshold"""
+        rows, values = self.column(col)
+        if threshold > 0.0:
+            return rows[values > threshold]
+        return rows
+
+    def verticesOf(self, cols, threshold=0.0):
+        """Union of the vertices touched by any of cols"""
+        if not len(cols):
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate([self.vertices(c, threshold) for c in cols]))
+
+    def count(self, col, threshold=0.0):
+        return len(self.vertices(col, threshold))
+
+    def counts(self, threshold=0.0):
+        """Vertex count per influence in one pass"""
+        if threshold <= 0.0:
+            return np.diff(self.indptr)
+        return np.bincount(self.entryColumns[self.values > threshold], minlength=self.shape[1])
+
+    def weightRange(self, col):
+        """(min, max) of the non-zero weights of one influence, (0, 0) when it touches nothing"""
+        rows, values = self.column(col)
+        if not len(values):
+            return 0.0, 0.0
+        return values.min(), values.max()
+
+    def ranges(self):
+        """Per influence (min, max) of the non-zero weights, zeros for unused influences"""
+        mins = np.zeros(self.shape[1])
+        maxs = np.zeros(self.shape[1])
+        used = np.diff(self.indptr) > 0
+        if used.any():
+            starts = self.indptr[:-1][used]
+            mins[used] = np.minimum.reduceat(self.values, starts)
+            maxs[used] = np.maximum.reduceat(self.values, starts)
+        return mins, maxs
+
+
+class NameIndex(object):
+    """
+    Influence names of one skinCluster in short, long and namespace-stripped form, with a
+    trigram index so substring filters only test the names sharing the filter's trigrams.
+    Filters that extend the previous one (typing) only re-test the previous matches.
+    """
+
+    def __init__(self, names, longNames=None):
+        self.names = list(names)
+        self.longNames = list(longNames) if longNames else list(self.names)
+        self.stripped = [name.split('|')[-1].split(':')[-1] for name in self.names]
+        self.lookup = dict((name, i) for i, name in enumerate(self.names))
+        self._search = {}
+        self._trigrams = {}
+        self._last = {}
+
+    def display(self, i, stripNamespace=False, longNames=False):
+        if longNames:
+            name = self.longNames[i]
+            if stripNamespace:
+                name = '|'.join(part.split(':')[-1] for part in name.split('|'))
+            return name
+        return self.stripped[i] if stripNamespace else self.names[i]
+
+    def _field(self, longNames):
+        """Lowercased search strings and their trigram index for one name form, built once"""
+        if longNames not in self._search:
+            strings = [name.lower() for name in (self.longNames if longNames else self.names)]
+            trigrams = {}
+            for i, string in enumerate(strings):
+                for j in range(len(string) - 2):
+                    trigrams.setdefault(string[j:j + 3], set()).add(i)
+            self._search[longNames] = strings
+            self._trigrams[longNames] = trigrams
+        return self._search[longNames], self._trigrams[longNames]
+
+    def filter(self, text, longNames=False):
+        """Indices of the names containing text (case insensitive), in name order"""
+        text = text.lower()
+        if not text:
+            return list(range(len(self.names)))
+        strings, trigrams = self._field(longNames)
+
+        lastText, lastResult = self._last.get(longNames, (None, None))
+        if lastText is not None and lastText in text:
+            candidates = lastResult
+        elif len(text) >= 3:
+            candidates = None
+            for j in range(len(text) - 2):
+                hits = trigrams.get(text[j:j + 3])
+                if not hits:
+                    candidates = []
+                    break
+                candidates = hits if candidates is None else candidates & hits
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(strings))
+
+        result = [i for i in candidates if text in strings[i]]
+        self._last[longNames] = (text, result)
+        return result
+
+
+def parentIndices(longNames):
+    """
+    Index of the nearest ancestor of every node that is itself in the list, -1 for roots.
+    Walks the '|' separated long names so no DAG queries are needed.
+    """
+    lookup = dict((name, i) for i, name in enumerate(longNames))
+    parents = np.full(len(longNames), -1, dtype=np.intp)
+    for i, name in enumerate(longNames):
+        path = name.rsplit('|', 1)[0]
+        while path:
+            if path in lookup:
+                parents[i] = lookup[path]
+                break
+            path = path.rsplit('|', 1)[0]
+    return parents
+
+
+class InfluenceTree(object):
+    """
+    Influence hierarchy from a parent index array (see parentIndices). Children are kept in CSR
+    form for lazy population of tree views, and the nodes are grouped by depth once so subtree
+    totals take one pass over the nodes, deepest level first.
+    """
+
+    def __init__(self, parents):
+        self.parents = np.asarray(parents, dtype=np.intp)
+        count = len(self.parents)
+        # depth by pointer jumping, each jump doubles the distance climbed
+        depth = (self.parents >= 0).astype(np.intp)
+        ancestor = self.parents.copy()
+        while True:
+            climbing = ancestor >= 0
+            climbing[climbing] = ancestor[ancestor[climbing]] >= 0
+            if not climbing.any():
+                break
+            depth[climbing] += depth[ancestor[climbing]]
+            ancestor[climbing] = ancestor[ancestor[climbing]]
+        self.depth = depth
+        self.levels = [np.nonzero(depth == d)[0] for d in range(depth.max(initial=0), 0, -1)]
+        self.roots = np.nonzero(self.parents < 0)[0]
+        children = np.nonzero(self.parents >= 0)[0]
+        order = children[np.argsort(self.parents[children], kind='stable')]
+        self.children = order
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(self.parents[children], minlength=count))))
+
+    def __len__(self):
+        return len(self.parents)
+
+    def childrenOf(self, node):
+        """Direct children of a node in list order, the roots for node -1"""
+        if node < 0:
+            return self.roots
+        return self.children[self.indptr[node]:self.indptr[node + 1]]
+
+    def ancestors(self, node):
+        """Path from the root down to the parent of node"""
+        path = []
+        node = self.parents[node]
+        while node >= 0:
+            path.append(int(node))
+            node = self.parents[node]
+        return path[::-1]
+
+    def totals(self, values):
+        """Every node's value plus those of all its descendants"""
+        totals = np.array(values, dtype=np.float64)
+        for level in self.levels:
+            np.add.at(totals, self.parents[level], totals[level])
+        return totals
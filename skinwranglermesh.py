@@ -0,0 +1,269 @@
+"""
+skinWrangler mesh topology
+
+Pure NumPy mesh structures built from the face-vertex buffers MFnMesh.getVertices() returns:
+edges, vertex adjacency in CSR form and sparse matrix products over it.
+"""
+
+import numpy as np
+
+
+def faceIds(counts):
+    """Face index of every entry of the face-vertex connect buffer"""
+    counts = np.asarray(counts, dtype=np.intp)
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+def edgesFromFaces(counts, connects):
+    """Unique undirected (E, 2) edges, lower vertex index first"""
+    counts = np.asarray(counts, dtype=np.intp)
+    connects = np.asarray(connects, dtype=np.intp)
+    if not len(connects):
+        return np.zeros((0, 2), dtype=np.intp)
+    # the next vertex of every face corner, wrapping around at the end of each face
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    nxt = np.arange(len(connects)) + 1
+    ends = starts + counts
+    nxt[ends - 1] = starts
+    edges = np.sort(np.column_stack((connects, connects[nxt])), axis=1)
+    return np.unique(edges, axis=0)
+
+
+class Adjacency(object):
+    """Vertex neighbours in CSR form: the neighbours of v are indices[indptr[v]:indptr[v + 1]]"""
+
+    def __init__(self, edges, numVerts):
+        edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        rows = np.concatenate((edges[:, 0], edges[:, 1]))
+        cols = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.lexsort((cols, rows))
+        self.edges = edges
+        self.numVerts = numVerts
+        self.rows = rows[order]
+        self.indices = cols[order]
+        self.degree = np.bincount(rows, minlength=numVerts)
+        self.indptr = np.concatenate(([0], np.cumsum(self.degree)))
+
+    @classmethod
+    def fromFaces(cls, counts, connects, numVerts):
+        return cls(edgesFromFaces(counts, connects), numVerts)
+
+    ARRAYS = ('edges', 'rows', 'indices', 'degree', 'indptr')
+
+    def toArrays(self):
+        """{name: array} of everything the adjacency holds, for skinwranglercache"""
+        return dict((name, getattr(self, name)) for name in self.ARRAYS)
+
+    @classmethod
+    def fromArrays(cls, arrays):
+        """Rebuilds an adjacency from toArrays() output without re-sorting anything"""
+        adjacency = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(adjacency, name, arrays[name])
+        adjacency.numVerts = len(arrays['degree'])
+        return adjacency
+
+    def neighbours(self, vertex):
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def ring(self, vertices):
+        """vertices plus their one-ring neighbours, sorted"""
+        vertices = np.asarray(vertices, dtype=np.intp)
+        mask = np.zeros(self.numVerts, dtype=bool)
+        mask[vertices] = True
+        mask[self.indices[mask[self.rows]]] = True
+        return np.nonzero(mask)[0]
+
+    def border(self, vertices):
+        """The vertices of the set that have a neighbour outside it"""
+        vertices = np.asarray(vertices, dtype=np.intp)
+        mask = np.zeros(self.numVerts, dtype=bool)
+        mask[vertices] = True
+        outside = mask[self.rows] & ~mask[self.indices]
+        return np.unique(self.rows[outside])
+
+    def submatrix(self, rowVerts, colVerts):
+        """
+        Adjacency restricted to edges from rowVerts to colVerts, as local COO (rows, cols)
+        indexing into the two given vertex lists.
+        """
+        rowLookup = np.full(self.numVerts, -1, dtype=np.intp)
+        rowLookup[rowVerts] = np.arange(len(rowVerts))
+        colLookup = np.full(self.numVerts, -1, dtype=np.intp)
+        colLookup[colVerts] = np.arange(len(colVerts))
+        r = rowLookup[self.rows]
+        c = colLookup[self.indices]
+        keep = (r >= 0) & (c >= 0)
+        return r[keep], c[keep]
+
+
+def cooProduct(rows, cols, x, numRows, values=None):
+    """y = A x for a sparse COO matrix A (unit values unless given) and a dense (n, k) x"""
+    x = np.asarray(x, dtype=np.float64)
+    contrib = x[cols] if values is None else x[cols] * np.asarray(values)[:, None]
+    y = np.zeros((numRows, x.shape[1]))
+    if len(rows):
+        # rows come sorted out of Adjacency, so segments can be summed with reduceat
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        y[rows[starts]] = np.add.reduceat(contrib, starts, axis=0)
+    return y
+
+
+## DISTANCES
+########################################################################
+def ringDistance(adjacency, sources, maxRings):
+    """
+    Multi-source BFS: ring number of every vertex reached from sources within maxRings,
+    -1 for the ones that weren't reached.
+    """
+    rings = np.full(adjacency.numVerts, -1, dtype=np.intp)
+    frontier = np.zeros(adjacency.numVerts, dtype=bool)
+    frontier[np.asarray(sources, dtype=np.intp)] = True
+    rings[frontier] = 0
+    for ring in range(1, int(maxRings) + 1):
+        reached = adjacency.indices[frontier[adjacency.rows]]
+        reached = reached[rings[reached] < 0]
+        if not len(reached):
+            break
+        rings[reached] = ring
+        frontier[:] = False
+        frontier[reached] = True
+    return rings
+
+
+def edgeDistance(adjacency, points, sources, maxDistance):
+    """
+    Multi-source shortest path by edge length. Same result as Dijkstra, but relaxes a whole frontier
+    of vertices per pass instead of popping them one by one off a heap.
+    Returns the distance of every vertex within maxDistance, inf for the rest.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    lengths = np.linalg.norm(points[adjacency.indices] - points[adjacency.rows], axis=1)
+    dist = np.full(adjacency.numVerts, np.inf)
+    sources = np.asarray(sources, dtype=np.intp)
+    dist[sources] = 0.0
+    changed = np.zeros(adjacency.numVerts, dtype=bool)
+    changed[sources] = True
+    while changed.any():
+        edges = np.nonzero(changed[adjacency.rows])[0]
+        candidate = dist[adjacency.rows[edges]] + lengths[edges]
+        keep = candidate <= maxDistance
+        edges, candidate = edges[keep], candidate[keep]
+        targets = adjacency.indices[edges]
+        before = dist.copy()
+        np.minimum.at(dist, targets, candidate)
+        changed = dist < before
+    return dist
+
+
+def _byChunks(func, count, chunkSize):
+    """Concatenates func(slice) over count rows in chunks, keeping (rows, segments, 3) temporaries small"""
+    return np.concatenate([func(slice(i, i + chunkSize)) for i in range(0, max(count, 1), chunkSize)])
+
+
+def _segmentOffsets(points, starts, ends):
+    """(numPoints, numSegments, 3) vectors from the closest point of every segment to every point"""
+    points = points[:, None, :]
+    starts = np.asarray(starts, dtype=np.float64)[None, :, :]
+    axis = np.asarray(ends, dtype=np.float64)[None, :, :] - starts
+    lengthSq = (axis * axis).sum(axis=2)
+    t = np.zeros((points.shape[0], starts.shape[1]))
+    np.divide(((points - starts) * axis).sum(axis=2), lengthSq, out=t, where=lengthSq > 0)
+    return points - (starts + axis * np.clip(t, 0.0, 1.0)[:, :, None])
+
+
+def segmentDistance(points, starts, ends, chunkSize=16384):
+    """
+    (numPoints, numSegments) distances from every point to every segment start-end.
+    Degenerate segments (start == end) measure the distance to the point.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    return _byChunks(lambda chunk: np.sqrt((_segmentOffsets(points[chunk], starts, ends) ** 2).sum(axis=2)),
+                     len(points), chunkSize)
+
+
+def segmentFacing(points, normals, starts, ends, chunkSize=16384):
+    """
+    (numPoints, numSegments) bool, True where the segment lies behind the surface at the point,
+    i.e. the vertex normal points away from it. A cheap stand-in for a visibility ray test that
+    stops a vertex on the inside of one limb from seeing the bone of the next.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    normals = np.asarray(normals, dtype=np.float64)
+    return _byChunks(lambda chunk: (_segmentOffsets(points[chunk], starts, ends) *
+                                    normals[chunk][:, None, :]).sum(axis=2) >= 0.0, len(points), chunkSize)
+
+
+## SHELLS
+########################################################################
+def shellLabels(adjacency):
+    """
+    Connected component (shell) label of every vertex, numbered 0..shells-1 in vertex order.
+    Union-find done a whole edge list at a time: hook every edge's larger root onto the smaller
+    one, then pointer jump until every vertex points straight at its root.
+    """
+    parent = np.arange(adjacency.numVerts)
+    a, b = adjacency.edges[:, 0], adjacency.edges[:, 1]
+    while True:
+        rootA, rootB = parent[a], parent[b]
+        split = rootA != rootB
+        if not split.any():
+            break
+        np.minimum.at(parent, np.maximum(rootA[split], rootB[split]), np.minimum(rootA[split], rootB[split]))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    return np.unique(parent, return_inverse=True)[1].reshape(-1)
+
+
+def componentLabels(adjacency, vertices):
+    """Shell labels of the subgraph spanned by vertices, so separate islands of one selection split apart"""
+    vertices = np.asarray(vertices, dtype=np.intp)
+    rows, cols = adjacency.submatrix(vertices, vertices)
+    keep = rows < cols
+    return shellLabels(Adjacency(np.column_stack((rows[keep], cols[keep])), len(vertices)))
+
+
+## FRAMES
+########################################################################
+CENTER_MODES = ('bbox', 'centroid', 'pca')
+
+
+def groupFrames(points, labels, mode='bbox'):
+    """
+    One (centers (g, 3), rotations (g, 3, 3)) frame per label group of points.
+    bbox/centroid frames are world aligned. pca frames are centered on the centroid with rows
+    ordered by descending variance (X along the longest extent), right handed.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.intp)
+    numGroups = labels.max() + 1 if len(labels) else 0
+    counts = np.bincount(labels, minlength=numGroups).astype(np.float64)
+    centroid = np.column_stack([np.bincount(labels, points[:, i], numGroups) for i in range(3)]) / counts[:, None]
+    rotations = np.tile(np.eye(3), (numGroups, 1, 1))
+    if mode == 'bbox':
+        lo = np.full((numGroups, 3), np.inf)
+        hi = np.full((numGroups, 3), -np.inf)
+        np.minimum.at(lo, labels, points)
+        np.maximum.at(hi, labels, points)
+        return (lo + hi) * 0.5, rotations
+    if mode == 'centroid':
+        return centroid, rotations
+    if mode != 'pca':
+        raise ValueError('Unknown center mode {}, expected one of {}'.format(mode, CENTER_MODES))
+
+    # per group covariance from one scatter add of the outer products
+    offsets = points - centroid[labels]
+    covariance = np.zeros((numGroups, 3, 3))
+    np.add.at(covariance, labels, offsets[:, :, None] * offsets[:, None, :])
+    values, vectors = np.linalg.eigh(covariance)
+    axes = np.swapaxes(vectors[:, :, ::-1], 1, 2)
+    # deterministic signs: the largest component of X and Y positive, Z from the cross product
+    for i in (0, 1):
+        biggest = np.abs(axes[:, i]).argmax(axis=1)
+        flip = np.take_along_axis(axes[:, i], biggest[:, None], axis=1)[:, 0] < 0
+        axes[flip, i] *= -1.0
+    axes[:, 2] = np.cross(axes[:, 0], axes[:, 1])
+    return centroid, axes
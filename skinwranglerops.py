@@ -0,0 +1,581 @@
+"""
+skinWrangler weight ops
+
+Pure NumPy operations on (vertices, influences) weight matrices. Nothing in here talks to Maya,
+the UI reads a matrix through skinwranglerdata, runs one of these and commits the result once.
+"""
+
+import numpy as np
+
+import skinwranglerindex
+import skinwranglermesh
+
+EPSILON = 1e-8
+SUM_TOLERANCE = 1e-3
+
+
+def columnMask(columns, numColumns):
+    """Turns a list of column indices (or an existing bool mask, or None) into a bool mask"""
+    mask = np.zeros(numColumns, dtype=bool)
+    if columns is None:
+        return mask
+    columns = np.asarray(columns)
+    if columns.dtype == bool:
+        return columns.copy()
+    mask[columns.astype(np.intp)] = True
+    return mask
+
+
+def normalizeRows(weights, fixed=None, locked=None):
+    """
+    Rescales each row to sum to 1.
+    Locked columns are never modified. Fixed columns keep their value unless they don't fit in what
+    the locked ones leave over, the remaining free columns are scaled to fill the rest.
+    """
+    weights = np.array(weights, dtype=np.float64)
+    if not weights.size:
+        return weights
+    numColumns = weights.shape[1]
+    lockMask = columnMask(locked, numColumns)
+    fixMask = columnMask(fixed, numColumns) & ~lockMask
+    freeMask = ~(lockMask | fixMask)
+
+    room = np.clip(1.0 - weights[:, lockMask].sum(axis=1), 0.0, None)
+
+    # fixed columns only shrink when they overflow the unlocked room
+    fixSum = weights[:, fixMask].sum(axis=1)
+    scale = np.ones_like(fixSum)
+    over = fixSum > room
+    scale[over] = room[over] / fixSum[over]
+    weights[:, fixMask] *= scale[:, None]
+    fixSum = np.minimum(fixSum, room)
+
+    left = room - fixSum
+    freeSum = weights[:, freeMask].sum(axis=1)
+    scale = np.zeros_like(freeSum)
+    np.divide(left, freeSum, out=scale, where=freeSum > EPSILON)
+    weights[:, freeMask] *= scale[:, None]
+
+    # nothing free to take the remainder, hand it back to the fixed columns
+    stuck = (freeSum <= EPSILON) & (left > EPSILON) & (fixSum > EPSILON)
+    if stuck.any():
+        rows = np.nonzero(stuck)[0]
+        weights[np.ix_(rows, np.nonzero(fixMask)[0])] *= (room[rows] / fixSum[rows])[:, None]
+    return weights
+
+
+def unnormalizedRows(sums, tolerance=SUM_TOLERANCE):
+    """Indices of the rows whose sum is off 1 by more than tolerance"""
+    return np.nonzero(np.abs(np.asarray(sums) - 1.0) > tolerance)[0]
+
+
+def setColumns(weights, columns, values, normalize=True, locked=None):
+    """
+    skinPercent -transformValue for a whole matrix: sets the given columns to values
+    (scalar, per column or per row/column) and renormalizes the others around them.
+    """
+    weights = np.array(weights, dtype=np.float64)
+    columns = np.asarray(columns, dtype=np.intp)
+    if not len(columns):
+        return weights
+    lockMask = columnMask(locked, weights.shape[1])
+    values = np.broadcast_to(np.clip(values, 0.0, 1.0), (weights.shape[0], len(columns)))
+    editable = ~lockMask[columns]
+    weights[:, columns[editable]] = values[:, editable]
+    if normalize:
+        weights = normalizeRows(weights, fixed=columns, locked=lockMask)
+    return weights
+
+
+ARITHMETIC_OPS = ('add', 'subtract', 'multiply', 'divide', 'scale')
+
+
+def arithmetic(weights, columns, op, value, target=0.0, normalize=True, locked=None):
+    """
+    Applies op to the given columns of every row at once:
+    add/subtract/multiply/divide by value, or scale the distance to target by value.
+    Results are clamped to 0-1 and the other columns renormalized around them.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    columns = np.asarray(columns, dtype=np.intp)
+    current = weights[:, columns]
+    if op == 'add':
+        values = current + value
+    elif op == 'subtract':
+        values = current - value
+    elif op == 'multiply':
+        values = current * value
+    elif op == 'divide':
+        if value == 0.0:
+            raise ValueError('Cannot divide weights by zero')
+        values = current / value
+    elif op == 'scale':
+        values = target + (current - target) * value
+    else:
+        raise ValueError('Unknown weight op {}, expected one of {}'.format(op, ARITHMETIC_OPS))
+    return setColumns(weights, columns, values, normalize=normalize, locked=locked)
+
+
+def setRows(weights, row, normalize=True, locked=None):
+    """Replaces every row with the same weight row (paste), unlocked columns only"""
+    weights = np.array(weights, dtype=np.float64)
+    lockMask = columnMask(locked, weights.shape[1])
+    weights[:, ~lockMask] = np.asarray(row, dtype=np.float64)[~lockMask]
+    if normalize:
+        weights = normalizeRows(weights, fixed=np.nonzero(~lockMask & (np.asarray(row) > 0))[0], locked=lockMask)
+    return weights
+
+
+## ENGINE EXPORT
+########################################################################
+def pruneWeights(weights, epsilon, normalize=True, locked=None):
+    """Zeroes every unlocked weight below epsilon"""
+    weights = np.array(weights, dtype=np.float64)
+    lockMask = columnMask(locked, weights.shape[1])
+    prune = (weights < epsilon) & ~lockMask
+    weights[prune] = 0.0
+    if normalize:
+        weights = normalizeRows(weights, locked=lockMask)
+    return weights
+
+
+def limitInfluences(weights, maxInfluences, normalize=True, locked=None):
+    """Keeps the largest maxInfluences weights per row, locked weights always count as kept"""
+    weights = np.array(weights, dtype=np.float64)
+    numColumns = weights.shape[1]
+    if maxInfluences >= numColumns:
+        return weights
+    lockMask = columnMask(locked, numColumns)
+    # locked columns sort first so they're never the ones cut
+    rank = np.where(lockMask, np.inf, weights)
+    cut = np.argpartition(-rank, maxInfluences, axis=1)[:, maxInfluences:]
+    cutMask = np.zeros(weights.shape, dtype=bool)
+    np.put_along_axis(cutMask, cut, True, axis=1)
+    weights[cutMask & ~lockMask] = 0.0
+    if normalize:
+        weights = normalizeRows(weights, locked=lockMask)
+    return weights
+
+
+def quantizeWeights(weights, bits=8, locked=None):
+    """
+    Snaps every weight to a multiple of 1 / (2**bits - 1) with largest remainder rounding,
+    so each row still sums to exactly the quantized total of the original row.
+    Locked columns are left as they are, only the room they leave over gets quantized.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    lockMask = columnMask(locked, weights.shape[1])
+    if lockMask.any():
+        result = weights.copy()
+        result[:, ~lockMask] = quantizeWeights(weights[:, ~lockMask], bits)
+        return result
+    steps = float(2 ** bits - 1)
+    scaled = weights * steps
+    floor = np.floor(scaled + EPSILON)
+    frac = np.clip(scaled - floor, 0.0, None)
+    totals = np.rint(scaled.sum(axis=1))
+    remainder = (totals - floor.sum(axis=1)).astype(np.intp)
+
+    # hand the remaining steps to the largest fractional parts of each row
+    order = np.argsort(-frac, axis=1, kind='mergesort')
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.broadcast_to(np.arange(weights.shape[1]), order.shape), axis=1)
+    floor += rank < remainder[:, None]
+    return floor / steps
+
+
+def quantizationError(before, after):
+    """Per row (max, mean) absolute error, the mean taken over the influences used before or after"""
+    diff = np.abs(np.asarray(after) - np.asarray(before))
+    used = (np.asarray(before) > 0) | (np.asarray(after) > 0)
+    count = used.sum(axis=1)
+    mean = np.zeros(len(diff))
+    np.divide(diff.sum(axis=1), count, out=mean, where=count > 0)
+    return diff.max(axis=1) if diff.size else np.zeros(len(diff)), mean
+
+
+def prepareForEngine(weights, maxInfluences=4, epsilon=0.001, bits=8, locked=None):
+    """
+    Prune below epsilon, limit to maxInfluences and quantize to bits per weight.
+    Returns (weights, maxError, meanError) with the errors measured per row against the input.
+    Locked columns are untouched by every step, so rows with off-grid locked values stay off-grid.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    result = pruneWeights(weights, epsilon, locked=locked)
+    result = limitInfluences(result, maxInfluences, locked=locked)
+    result = quantizeWeights(result, bits, locked=locked)
+    maxError, meanError = quantizationError(weights, result)
+    return result, maxError, meanError
+
+
+def prepareSparseForEngine(weights, maxInfluences=4, epsilon=0.001, bits=8, locked=None, chunkSize=16384):
+    """
+    prepareForEngine over a whole mesh SparseWeights, in row chunks and over the used and locked
+    columns only, so no numVerts x numInfluences block is ever built. Unlocked columns nothing is
+    weighted to can't gain weight from any of the steps, locked ones still count against maxInfluences.
+    Returns (columns, weights over those columns, maxError, meanError).
+    """
+    lockMask = columnMask(locked, weights.shape[1])
+    columns = np.union1d(weights.cols, np.nonzero(lockMask)[0])
+    lockMask = lockMask[columns]
+    # filled in place, a list of chunks to concatenate would hold the result twice
+    result = np.empty((weights.shape[0], len(columns)))
+    maxError = np.empty(weights.shape[0])
+    meanError = np.empty(weights.shape[0])
+    for rows, block in weights.iterRowBlocks(chunkSize, columns):
+        result[rows], maxError[rows], meanError[rows] = prepareForEngine(block, maxInfluences, epsilon, bits,
+                                                                         locked=lockMask)
+    return columns, result, maxError, meanError
+
+
+## SMOOTHING
+########################################################################
+def _blockCG(matvec, b, x0, iterations=100, tolerance=1e-6):
+    """Conjugate gradient solving every column of b at once for a symmetric positive definite operator"""
+    x = x0.copy()
+    r = b - matvec(x)
+    p = r.copy()
+    rr = (r * r).sum(axis=0)
+    limit = tolerance * tolerance * np.maximum((b * b).sum(axis=0), EPSILON)
+    for i in range(iterations):
+        if (rr <= limit).all():
+            break
+        mp = matvec(p)
+        pmp = (p * mp).sum(axis=0)
+        alpha = np.zeros_like(rr)
+        np.divide(rr, pmp, out=alpha, where=pmp > 0)
+        x += p * alpha
+        r -= mp * alpha
+        rrNew = (r * r).sum(axis=0)
+        beta = np.zeros_like(rr)
+        np.divide(rrNew, rr, out=beta, where=rr > 0)
+        p = r + p * beta
+        rr = rrNew
+    return x
+
+
+def smoothValues(values, adjacency, vertices, strength=0.5, iterations=5, implicit=False, pinned=None):
+    """
+    Smoothed rows of the given vertices, clipped to 0..1, without any normalization.
+
+    values holds every row of the mesh, (n,) or (n, k), only the vertices and their one-ring are read.
+    Neighbours outside the selection and pinned vertices act as fixed boundary values.
+
+    iterative: `iterations` damped Jacobi steps of w += strength * (neighbour average - w)
+    implicit:  one solve of (I + strength * iterations * L) w = w0 with conjugate gradient
+    """
+    vertices = np.asarray(vertices, dtype=np.intp)
+    region = adjacency.ring(vertices)
+    lookup = np.full(adjacency.numVerts, -1, dtype=np.intp)
+    lookup[region] = np.arange(len(region))
+    regionValues = np.array(values[region], dtype=np.float64)
+    flat = regionValues.ndim == 1
+    if flat:
+        regionValues = regionValues[:, None]
+
+    freeMask = np.zeros(adjacency.numVerts, dtype=bool)
+    freeMask[vertices] = True
+    if pinned is not None and len(pinned):
+        freeMask[np.asarray(pinned, dtype=np.intp)] = False
+    free = np.nonzero(freeMask)[0]
+    fixed = np.setdiff1d(region, free)
+    freeLocal = lookup[free]
+    if len(free):
+        degree = adjacency.degree[free].astype(np.float64)[:, None]
+        safeDegree = np.maximum(degree, 1.0)
+        ffRows, ffCols = adjacency.submatrix(free, free)
+        fcRows, fcCols = adjacency.submatrix(free, fixed)
+        boundary = skinwranglermesh.cooProduct(fcRows, fcCols, regionValues[lookup[fixed]], len(free))
+        current = regionValues[freeLocal]
+        if implicit:
+            amount = strength * iterations
+
+            def matvec(x):
+                return x + amount * (degree * x - skinwranglermesh.cooProduct(ffRows, ffCols, x, len(free)))
+
+            current = _blockCG(matvec, current + amount * boundary, current)
+        else:
+            for i in range(iterations):
+                average = (skinwranglermesh.cooProduct(ffRows, ffCols, current, len(free)) + boundary) / safeDegree
+                current = current + strength * (average - current) * (degree > 0)
+        regionValues[freeLocal] = np.clip(current, 0.0, 1.0)
+
+    smoothed = regionValues[lookup[vertices]]
+    return smoothed[:, 0] if flat else smoothed
+
+
+def laplacianSmooth(weights, adjacency, vertices, strength=0.5, iterations=5, implicit=False,
+                    columns=None, pinned=None, maxInfluences=None, locked=None):
+    """
+    Smooths the rows of the given vertices over the mesh adjacency, see smoothValues.
+
+    weights holds every row of the mesh, the returned matrix holds the new rows for vertices in the
+    same order. columns limits the smoothing to those influences, the rest get renormalized around them.
+    """
+    vertices = np.asarray(vertices, dtype=np.intp)
+    smoothed = smoothValues(weights, adjacency, vertices, strength, iterations, implicit, pinned)
+    original = np.asarray(weights[vertices], dtype=np.float64)
+    lockMask = columnMask(locked, original.shape[1])
+    smoothed[:, lockMask] = original[:, lockMask]
+    if columns is not None and len(columns):
+        result = setColumns(original, columns, smoothed[:, np.asarray(columns, dtype=np.intp)], locked=lockMask)
+    else:
+        result = normalizeRows(smoothed, locked=lockMask)
+    if maxInfluences:
+        result = limitInfluences(result, maxInfluences, locked=lockMask)
+    return result
+
+
+## FALLOFF
+########################################################################
+FALLOFF_CURVES = {
+    'linear': lambda t: t,
+    'smooth': lambda t: t * t * (3.0 - 2.0 * t),
+    'sharp': lambda t: t * t,
+    'soft': lambda t: 1.0 - (1.0 - t) * (1.0 - t),
+}
+
+
+def falloff(distance, radius, curve='smooth'):
+    """1 at the sources fading to 0 at radius, 0 past it (or for unreached vertices with inf/-1 distances)"""
+    distance = np.asarray(distance, dtype=np.float64)
+    reached = (distance >= 0) & np.isfinite(distance) & (distance <= radius)
+    t = np.zeros(len(distance))
+    if radius > 0:
+        t[reached] = 1.0 - distance[reached] / float(radius)
+    else:
+        t[reached] = 1.0
+    return np.clip(FALLOFF_CURVES[curve](t), 0.0, 1.0)
+
+
+def blendColumn(weights, column, amount, target=1.0, normalize=True, locked=None):
+    """Pulls one influence toward target by a per row amount (0 keeps the row as is) and renormalizes"""
+    weights = np.asarray(weights, dtype=np.float64)
+    current = weights[:, column]
+    values = current + np.asarray(amount) * (target - current)
+    return setColumns(weights, [column], values[:, None], normalize=normalize, locked=locked)
+
+
+## INFLUENCE CLEANUP
+########################################################################
+def redistributeColumns(weights, columns, targets, normalize=True, locked=None):
+    """
+    Moves the weight of each of columns onto the matching targets column and zeroes it.
+    A target of -1 (or a locked target) spreads the weight over the rest of the row instead.
+    Locked source columns are left alone.
+    """
+    weights = np.array(weights, dtype=np.float64)
+    numColumns = weights.shape[1]
+    lockMask = columnMask(locked, numColumns)
+    columns = np.asarray(columns, dtype=np.intp)
+    targets = np.asarray(targets, dtype=np.intp)
+    movable = ~lockMask[columns]
+    columns, targets = columns[movable], targets[movable]
+
+    # (m, m) remap matrix, identity except for the moved columns
+    remap = np.eye(numColumns)
+    remap[columns, columns] = 0.0
+    direct = (targets >= 0) & ~lockMask[np.maximum(targets, 0)]
+    remap[columns[direct], targets[direct]] = 1.0
+    weights = weights.dot(remap)
+    if normalize:
+        weights = normalizeRows(weights, locked=lockMask)
+    return weights
+
+
+def removalTargets(candidates, parents):
+    """For every candidate column the nearest ancestor column that isn't a candidate, -1 if there is none"""
+    candidateMask = np.zeros(len(parents), dtype=bool)
+    candidateMask[np.asarray(candidates, dtype=np.intp)] = True
+    targets = []
+    for c in candidates:
+        parent = parents[c]
+        while parent >= 0 and candidateMask[parent]:
+            parent = parents[parent]
+        targets.append(parent)
+    return np.array(targets, dtype=np.intp)
+
+
+def seedColumns(weights, columns, distance, radius, curve='smooth', normalize=True, locked=None):
+    """
+    Initial weights for newly added influences from their distance to each row's vertex:
+    falloff(distance, radius) per column, scaled down together when they add up past 1.
+    distance is (rows, len(columns)).
+    """
+    distance = np.asarray(distance, dtype=np.float64)
+    values = np.column_stack([falloff(distance[:, i], radius, curve) for i in range(distance.shape[1])])
+    total = values.sum(axis=1)
+    over = total > 1.0
+    values[over] /= total[over][:, None]
+    return setColumns(weights, columns, values, normalize=normalize, locked=locked)
+
+
+## PROXIMITY BIND
+########################################################################
+def proximityWeights(distance, maxInfluences=4, power=2.0, allowed=None):
+    """
+    Normalized inverse distance weights from an (n, k) distance matrix, keeping the closest
+    maxInfluences per row. allowed masks out candidates, rows left with none fall back to all of them.
+    """
+    distance = np.asarray(distance, dtype=np.float64)
+    weights = 1.0 / np.maximum(distance, EPSILON) ** power
+    if allowed is not None:
+        masked = np.where(allowed, weights, 0.0)
+        empty = ~masked.any(axis=1)
+        masked[empty] = weights[empty]
+        weights = masked
+    return pruneWeights(normalizeRows(limitInfluences(weights, maxInfluences, normalize=False)), EPSILON)
+
+
+def shellNearest(labels, distance, maxInfluences=4):
+    """(n, k) bool, True for the maxInfluences candidates closest to each row's whole shell"""
+    distance = np.asarray(distance, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.intp)
+    numShells = labels.max() + 1 if len(labels) else 0
+    shellDistance = np.full((numShells, distance.shape[1]), np.inf)
+    np.minimum.at(shellDistance, labels, distance)
+    rank = np.argsort(np.argsort(shellDistance, axis=1, kind='mergesort'), axis=1)
+    return (rank < maxInfluences)[labels]
+
+
+def bindColumns(weights, columns, values, locked=None):
+    """Replaces the unlocked part of every row with values over columns, scaled into what locked columns leave"""
+    weights = np.array(weights, dtype=np.float64)
+    columns = np.asarray(columns, dtype=np.intp)
+    lockMask = columnMask(locked, weights.shape[1])
+    editable = ~lockMask[columns]
+    weights[:, ~lockMask] = 0.0
+    weights[:, columns[editable]] = np.asarray(values, dtype=np.float64)[:, editable]
+    return normalizeRows(weights, locked=lockMask)
+
+
+## TRANSFER
+########################################################################
+def interpolateRows(weights, corners, bary):
+    """
+    Barycentric blend of source rows: row i is sum_k bary[i, k] * weights[corners[i, k]].
+    weights is anything handing out dense rows by index (a matrix or SparseWeights),
+    each source row is only pulled out once.
+    """
+    corners = np.asarray(corners, dtype=np.intp)
+    unique, inverse = np.unique(corners, return_inverse=True)
+    inverse = inverse.reshape(corners.shape)
+    rows = np.asarray(weights[unique], dtype=np.float64)
+    result = np.zeros((len(corners), rows.shape[1]))
+    for k in range(corners.shape[1]):
+        result += bary[:, k, None] * rows[inverse[:, k]]
+    return result
+
+
+def transferNames(rows, sourceNames, targetNames):
+    """Source influences the sampled rows weight that targetNames has no match for, matched like alignColumns"""
+    names, targetColumns, sourceColumns = skinwranglerindex.alignColumns(targetNames, sourceNames)
+    used = np.unique(sourceColumns[np.asarray(rows).any(axis=0)])
+    return [names[c] for c in used if c >= len(targetNames)]
+
+
+def transferRows(rows, sourceNames, targetNames, current=None, locked=None):
+    """
+    Sampled source rows (interpolateRows output) moved onto targetNames by name and normalized.
+    Source influences the target doesn't have are dropped, add transferNames() first to keep them.
+    With current given the locked target columns keep their values.
+    """
+    names, targetColumns, sourceColumns = skinwranglerindex.alignColumns(targetNames, sourceNames)
+    known = sourceColumns < len(targetNames)
+    weights = normalizeRows(remapColumns(np.asarray(rows)[:, known], sourceColumns[known], len(targetNames)))
+    if current is not None:
+        weights = keepLocked(weights, current, locked)
+    return weights
+
+
+def keepLocked(weights, original, locked=None):
+    """
+    Puts the locked columns of original back into new rows and renormalizes the rest around them.
+    Rows left with nothing unlocked to fill the room keep their original values.
+    """
+    lockMask = columnMask(locked, np.shape(weights)[1])
+    if not lockMask.any():
+        return np.asarray(weights, dtype=np.float64)
+    original = np.asarray(original, dtype=np.float64)
+    weights = np.array(weights, dtype=np.float64)
+    weights[:, lockMask] = original[:, lockMask]
+    empty = weights[:, ~lockMask].sum(axis=1) <= EPSILON
+    weights = normalizeRows(weights, locked=lockMask)
+    weights[empty] = original[empty]
+    return weights
+
+
+def remapColumns(weights, columns, numColumns):
+    """Moves the columns of weights to the given column indices of a numColumns wide matrix, summing duplicates"""
+    result = np.zeros((len(weights), numColumns))
+    np.add.at(result.T, np.asarray(columns, dtype=np.intp), np.asarray(weights, dtype=np.float64).T)
+    return result
+
+
+## SHELLS
+########################################################################
+RIGID_MODES = ('dominant', 'average')
+
+
+def groupSums(values, labels, numGroups=None):
+    """Per label sums of the rows of values, one sort and reduceat instead of a loop over groups"""
+    values = np.asarray(values, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.intp)
+    if numGroups is None:
+        numGroups = labels.max() + 1 if len(labels) else 0
+    sums = np.zeros((numGroups,) + values.shape[1:])
+    if len(labels):
+        order = np.argsort(labels, kind='mergesort')
+        ordered = labels[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        sums[ordered[starts]] = np.add.reduceat(values[order], starts, axis=0)
+    return sums
+
+
+def rigidShells(weights, labels, mode='dominant', columns=None, locked=None):
+    """
+    Gives every vertex of a shell the same row: a single influence carrying the most weight summed
+    over the shell (dominant) or the shell's average row (average). columns limits the candidates,
+    shells without any weight on them keep their rows. Locked columns keep their per vertex values
+    and the shell row is scaled into what they leave.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    labels = np.unique(labels, return_inverse=True)[1].reshape(-1)
+    numColumns = weights.shape[1]
+    lockMask = columnMask(locked, numColumns)
+    candidates = ~lockMask if columns is None else columnMask(columns, numColumns) & ~lockMask
+    sums = groupSums(weights, labels)
+    sums[:, ~candidates] = 0.0
+    if mode == 'dominant':
+        rows = np.zeros_like(sums)
+        rows[np.arange(len(sums)), sums.argmax(axis=1)] = 1.0
+    elif mode == 'average':
+        rows = sums / np.maximum(np.bincount(labels, minlength=len(sums)), 1)[:, None]
+    else:
+        raise ValueError('Unknown rigid mode {}, expected one of {}'.format(mode, RIGID_MODES))
+
+    result = weights.copy()
+    result[:, ~lockMask] = rows[labels][:, ~lockMask]
+    result = normalizeRows(result, locked=lockMask)
+    empty = (sums.max(axis=1, initial=0.0) <= EPSILON)[labels]
+    result[empty] = weights[empty]
+    return result
+
+
+## BLEND WEIGHTS
+########################################################################
+BLEND_OPS = ('set', 'add', 'scale')
+
+
+def blendArithmetic(values, op, amount):
+    """set/add/scale per vertex dual quaternion blend weights, clipped to 0 (linear) .. 1 (dual quaternion)"""
+    values = np.asarray(values, dtype=np.float64)
+    if op == 'set':
+        result = np.full(values.shape, float(amount))
+    elif op == 'add':
+        result = values + amount
+    elif op == 'scale':
+        result = values * amount
+    else:
+        raise ValueError('Unknown blend op {}, expected one of {}'.format(op, BLEND_OPS))
+    return np.clip(result, 0.0, 1.0)
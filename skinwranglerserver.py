@@ -0,0 +1,477 @@
+"""
+skinWrangler JSON-RPC server
+
+Opt-in local socket server exposing the weight operations to processes outside Maya.
+Messages are JSON-RPC 2.0, framed as
+
+    uint32 json length, uint32 binary length, json bytes, binary bytes
+
+NumPy arrays anywhere in params or results travel in the binary part and are referenced
+from the JSON as {"__ndarray__": [offset, nbytes], "dtype": ..., "shape": [...]}.
+A frame holding a JSON list is a batch and gets a list back. Frames on one connection are
+answered in order, so clients can pipeline any number of requests before reading.
+
+Nothing in here imports Maya: MemoryBackend runs the same operations on in-memory matrices
+so the protocol can be exercised without a Maya session, MayaBackend talks to skinClusters.
+"""
+
+import inspect
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+import numpy as np
+
+import skinwranglerindex
+import skinwranglerops
+import skinwranglerspatial
+
+logger = logging.getLogger(__name__)
+
+try:
+    stringTypes = basestring
+except NameError:
+    stringTypes = str
+
+HEADER = struct.Struct('!II')
+DEFAULT_PORT = 7733
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super(RPCError, self).__init__(message)
+        self.code = code
+
+
+## FRAMING
+########################################################################
+def encodeMessage(obj):
+    """Frame bytes for a JSON-able object whose arrays go into the binary part"""
+    blobs = []
+    offset = [0]
+
+    def pack(value):
+        if isinstance(value, np.ndarray):
+            data = np.ascontiguousarray(value).tobytes()
+            ref = {'__ndarray__': [offset[0], len(data)], 'dtype': value.dtype.str, 'shape': list(value.shape)}
+            blobs.append(data)
+            offset[0] += len(data)
+            return ref
+        if isinstance(value, dict):
+            return dict((k, pack(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return [pack(v) for v in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    text = json.dumps(pack(obj)).encode('utf-8')
+    blob = b''.join(blobs)
+    return HEADER.pack(len(text), len(blob)) + text + blob
+
+
+def decodeMessage(text, blob):
+    """Inverse of encodeMessage given the two frame parts"""
+
+    def unpack(value):
+        if isinstance(value, dict):
+            if '__ndarray__' in value:
+                start, size = value['__ndarray__']
+                return np.frombuffer(blob[start:start + size], dtype=np.dtype(value['dtype'])).reshape(value['shape'])
+            return dict((k, unpack(v)) for k, v in value.items())
+        if isinstance(value, list):
+            return [unpack(v) for v in value]
+        return value
+
+    return unpack(json.loads(text.decode('utf-8')))
+
+
+def _recvExactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def readFrame(sock):
+    """(json bytes, binary bytes) of the next frame, None once the peer closed the connection"""
+    header = _recvExactly(sock, HEADER.size)
+    if header is None:
+        return None
+    textSize, blobSize = HEADER.unpack(header)
+    text = _recvExactly(sock, textSize)
+    blob = _recvExactly(sock, blobSize) if blobSize else b''
+    if text is None or blob is None:
+        return None
+    return text, blob
+
+
+## BACKENDS
+########################################################################
+class WeightBackend(object):
+    """
+    Operations exposed over RPC, written against four primitives subclasses provide:
+    skins(), influences(skin), read(skin, indices) and write(skin, indices, weights).
+    transfer also needs points(skin), surface(skin) -> TriangleBVH and addInfluences(skin, names),
+    exportWeights needs export(skin, path) and an exportDir, the only place it may write to.
+    """
+
+    methods = ('listSkins', 'getInfluences', 'getWeights', 'setWeights', 'normalize', 'prune', 'clamp',
+               'transfer', 'exportWeights')
+    exportDir = None
+
+    def locked(self, skin):
+        return None
+
+    def listSkins(self):
+        return self.skins()
+
+    def getInfluences(self, skin):
+        return self.influences(skin)
+
+    def getWeights(self, skin, indices=None):
+        return self.read(skin, indices)[1]
+
+    def setWeights(self, skin, indices, weights):
+        """Writes raw rows, locked columns keep their current values and the rest is normalized around them"""
+        indices = np.asarray(indices, dtype=np.intp)
+        weights = np.asarray(weights, dtype=np.float64)
+        locked = self.locked(skin)
+        if locked is not None and np.any(locked):
+            weights = skinwranglerops.keepLocked(weights, self.read(skin, indices)[1], locked)
+        self.write(skin, indices, weights)
+        return len(indices)
+
+    def _modify(self, skin, func, indices=None):
+        indices, weights = self.read(skin, indices)
+        self.write(skin, indices, func(weights))
+        return len(indices)
+
+    def normalize(self, skin, indices=None):
+        return self._modify(skin, lambda w: skinwranglerops.normalizeRows(w, locked=self.locked(skin)), indices)
+
+    def prune(self, skin, epsilon=0.001, indices=None):
+        return self._modify(skin, lambda w: skinwranglerops.pruneWeights(w, epsilon, locked=self.locked(skin)),
+                            indices)
+
+    def clamp(self, skin, maxInfluences=4, indices=None):
+        return self._modify(skin, lambda w: skinwranglerops.limitInfluences(w, maxInfluences,
+                                                                             locked=self.locked(skin)), indices)
+
+    def transfer(self, source, target, indices=None):
+        """Closest point transfer of source's weights onto target's vertices, see skinwranglerdata.transferWeights"""
+        points = self.points(target)
+        indices = np.arange(len(points)) if indices is None else np.asarray(indices, dtype=np.intp)
+        bvh = self.surface(source)
+        tris, bary, distance = bvh.closestPoint(points[indices])
+        sourceNames = self.influences(source)
+        rows = skinwranglerops.interpolateRows(self.read(source)[1], bvh.triangles[tris], bary)
+        self.addInfluences(target, skinwranglerops.transferNames(rows, sourceNames, self.influences(target)))
+        current = self.read(target, indices)[1]
+        self.write(target, indices, skinwranglerops.transferRows(rows, sourceNames, self.influences(target),
+                                                                 current, self.locked(target)))
+        return len(indices)
+
+    def exportPath(self, path):
+        """path resolved inside exportDir, anything outside it (absolute, .., symlinks) is refused"""
+        if not self.exportDir:
+            raise RPCError(INVALID_PARAMS, 'Exports are disabled, the server has no export directory')
+        root = os.path.realpath(self.exportDir)
+        full = os.path.realpath(os.path.join(root, path))
+        if not full.startswith(os.path.join(root, '')):
+            raise RPCError(INVALID_PARAMS, 'Export path {} is outside {}'.format(path, self.exportDir))
+        return full
+
+    def exportWeights(self, skin, path):
+        """Saves the weights of skin to path, relative to exportDir, returns the file written"""
+        if not path.endswith('.npz'):
+            path += '.npz'
+        path = self.exportPath(path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self.export(skin, path)
+        return path
+
+
+class MemoryBackend(WeightBackend):
+    """Named weight matrices held in memory, for tests and for driving the protocol without Maya"""
+
+    def __init__(self, clusters=None, exportDir=None):
+        self.exportDir = exportDir
+        # {name: (influences, weights)}
+        self.clusters = dict(clusters or {})
+        # {name: (points, triangles)}, only needed for transfer
+        self.geometry = {}
+
+    def add(self, skin, influences, weights, points=None, triangles=None):
+        self.clusters[skin] = (list(influences), np.array(weights, dtype=np.float64))
+        if points is not None:
+            self.geometry[skin] = (np.asarray(points, dtype=np.float64), triangles)
+
+    def _get(self, skin):
+        if skin not in self.clusters:
+            raise ValueError('No skinCluster named {}'.format(skin))
+        return self.clusters[skin]
+
+    def skins(self):
+        return sorted(self.clusters)
+
+    def influences(self, skin):
+        return self._get(skin)[0]
+
+    def read(self, skin, indices=None):
+        weights = self._get(skin)[1]
+        if indices is None:
+            indices = np.arange(len(weights))
+        indices = np.asarray(indices, dtype=np.intp)
+        return indices, weights[indices].copy()
+
+    def write(self, skin, indices, weights):
+        self._get(skin)[1][indices] = weights
+
+    def points(self, skin):
+        self._get(skin)
+        if skin not in self.geometry:
+            raise ValueError('No geometry for {}'.format(skin))
+        return self.geometry[skin][0]
+
+    def surface(self, skin):
+        points = self.points(skin)
+        return skinwranglerspatial.TriangleBVH(points, self.geometry[skin][1])
+
+    def addInfluences(self, skin, names):
+        influences, weights = self._get(skin)
+        new = [name for name in names if name not in influences]
+        if new:
+            self.clusters[skin] = (influences + new, np.hstack((weights, np.zeros((len(weights), len(new))))))
+        return new
+
+    def export(self, skin, path):
+        # same layout as skinwranglerdata.exportWeights, so loadWeightFile reads it back
+        influences, weights = self._get(skin)
+        sparse = skinwranglerindex.SparseWeights.fromDense(weights)
+        with open(path, 'wb') as f:
+            np.savez(f, version=1, rows=sparse.rows, cols=sparse.cols, values=sparse.values,
+                     shape=np.array(sparse.shape), influences=np.array(influences))
+
+
+class MayaBackend(WeightBackend):
+    """skinClusters of the open scene through skinwranglerdata, one bulk undoable write per call"""
+
+    def __init__(self, exportDir=None):
+        # deferred so the rest of the module works outside Maya
+        import skinwranglerdata
+        self.data = skinwranglerdata
+        self.exportDir = exportDir
+
+    def skins(self):
+        return self.data.cmds.ls(type='skinCluster')
+
+    def influences(self, skin):
+        return self.data.influenceNames(skin)
+
+    def locked(self, skin):
+        return self.data.lockMask(skin)
+
+    def read(self, skin, indices=None):
+        return self.data.readWeights(skin, self.data.skinGeometry(skin), indices)
+
+    def write(self, skin, indices, weights):
+        self.data.writeWeights(skin, self.data.skinGeometry(skin), indices, weights)
+
+    def transfer(self, source, target, indices=None):
+        indices, distance = self.data.transferWeights(source, self.data.skinGeometry(source), target,
+                                                      self.data.skinGeometry(target), indices)
+        return len(indices)
+
+    def export(self, skin, path):
+        self.data.exportWeights(skin, self.data.skinGeometry(skin), path)
+
+
+## SERVER
+########################################################################
+def checkParams(func, args, kwargs):
+    """INVALID_PARAMS unless args/kwargs bind to func's signature, checked before anything runs"""
+    try:
+        if hasattr(inspect, 'signature'):
+            inspect.signature(func).bind(*args, **kwargs)
+        else:
+            inspect.getcallargs(func, *args, **kwargs)
+    except TypeError as e:
+        raise RPCError(INVALID_PARAMS, str(e))
+
+
+def dispatch(backend, request, executor=None):
+    """
+    Runs one JSON-RPC request object against backend, returns the response object
+    (None for notifications). executor(func) runs the call, e.g. on Maya's main thread.
+    """
+    requestId = request.get('id') if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict) or not isinstance(request.get('method'), stringTypes):
+            raise RPCError(INVALID_REQUEST, 'Invalid request')
+        method = request['method']
+        if method not in backend.methods:
+            raise RPCError(METHOD_NOT_FOUND, 'Method not found: {}'.format(method))
+        params = request.get('params', {})
+        func = getattr(backend, method)
+        if isinstance(params, dict):
+            args, kwargs = [], params
+        elif isinstance(params, list):
+            args, kwargs = params, {}
+        else:
+            raise RPCError(INVALID_PARAMS, 'params must be an object or an array')
+        # a TypeError from inside the call is a bug, not bad params, and gets logged as one below
+        checkParams(func, args, kwargs)
+        call = lambda: func(*args, **kwargs)
+        try:
+            result = executor(call) if executor else call()
+        except (ValueError, KeyError, IndexError) as e:
+            raise RPCError(INTERNAL_ERROR, str(e))
+    except RPCError as e:
+        return {'jsonrpc': '2.0', 'id': requestId, 'error': {'code': e.code, 'message': str(e)}}
+    except Exception as e:
+        logger.error('[skinWrangler] RPC {} failed'.format(request), exc_info=True)
+        return {'jsonrpc': '2.0', 'id': requestId, 'error': {'code': INTERNAL_ERROR, 'message': str(e)}}
+    if 'id' not in request:
+        return None
+    return {'jsonrpc': '2.0', 'id': requestId, 'result': result}
+
+
+def handleFrame(backend, text, blob, executor=None):
+    """Frame bytes answering one request frame, None when nothing needs an answer"""
+    try:
+        message = decodeMessage(text, blob)
+    except (ValueError, TypeError, KeyError) as e:
+        # bad JSON or a malformed __ndarray__ reference (unknown dtype, shape, offsets)
+        return encodeMessage({'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': str(e)}})
+    if isinstance(message, list):
+        if not message:
+            return encodeMessage({'jsonrpc': '2.0', 'id': None,
+                                  'error': {'code': INVALID_REQUEST, 'message': 'Empty batch'}})
+        responses = [r for r in (dispatch(backend, request, executor) for request in message) if r is not None]
+        return encodeMessage(responses) if responses else None
+    response = dispatch(backend, message, executor)
+    return encodeMessage(response) if response is not None else None
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            frame = readFrame(self.request)
+            if frame is None:
+                return
+            reply = handleFrame(self.server.backend, frame[0], frame[1], self.server.executor)
+            if reply is not None:
+                self.request.sendall(reply)
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RPCServer(object):
+    """
+    Serves a backend on host:port from a background thread. Pass executor to move the calls
+    somewhere else, MayaBackend wants maya.utils.executeInMainThreadWithResult.
+    port=0 picks a free port, read it back from .port after start().
+    """
+
+    def __init__(self, backend, host='127.0.0.1', port=DEFAULT_PORT, executor=None):
+        self.backend = backend
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.server = None
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.server is not None
+
+    def start(self):
+        if self.server:
+            return
+        self.server = _TCPServer((self.host, self.port), _Handler)
+        self.server.backend = self.backend
+        self.server.executor = self.executor
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name='skinWranglerRPC')
+        self.thread.daemon = True
+        self.thread.start()
+        logger.info('[skinWrangler] RPC server listening on {}:{}'.format(self.host, self.port))
+
+    def stop(self):
+        if not self.server:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.server = None
+        self.thread = None
+        logger.info('[skinWrangler] RPC server stopped')
+
+
+## CLIENT
+########################################################################
+class RPCClient(object):
+    """Blocking client, call() for single requests, batch() and pipeline() for many at once"""
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, timeout=None):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.nextId = 0
+
+    def close(self):
+        self.sock.close()
+
+    def _request(self, method, params):
+        self.nextId += 1
+        return {'jsonrpc': '2.0', 'id': self.nextId, 'method': method, 'params': params or {}}
+
+    def _receive(self):
+        frame = readFrame(self.sock)
+        if frame is None:
+            raise IOError('skinWrangler RPC server closed the connection')
+        return decodeMessage(*frame)
+
+    @staticmethod
+    def _result(response):
+        if 'error' in response:
+            raise RPCError(response['error']['code'], response['error']['message'])
+        return response['result']
+
+    def call(self, method, **params):
+        self.sock.sendall(encodeMessage(self._request(method, params)))
+        return self._result(self._receive())
+
+    def batch(self, calls):
+        """One frame holding every (method, params) call, results in call order"""
+        requests = [self._request(method, params) for method, params in calls]
+        self.sock.sendall(encodeMessage(requests))
+        responses = dict((r['id'], r) for r in self._receive())
+        return [self._result(responses[request['id']]) for request in requests]
+
+    def pipeline(self, calls):
+        """Sends one frame per call without waiting, then reads the answers back in order"""
+        requests = [self._request(method, params) for method, params in calls]
+        self.sock.sendall(b''.join(encodeMessage(request) for request in requests))
+        return [self._result(self._receive()) for request in requests]
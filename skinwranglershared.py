@@ -0,0 +1,180 @@
+"""
+skinWrangler shared memory buffers
+
+Publishes named NumPy arrays into one multiprocessing.shared_memory block so solver processes
+can work on the weight matrix, positions and adjacency in place instead of receiving pickled
+copies. The block starts with a small header:
+
+    b'SKWR', uint32 version, uint32 table length, JSON table [[name, dtype, shape, offset], ...]
+
+followed by the arrays, each 64 byte aligned and offset from the end of the header.
+shared_memory needs Python 3.8+, on older interpreters AVAILABLE is False and creating
+a block raises RuntimeError.
+"""
+
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+import skinwranglermesh
+import skinwranglerops
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+AVAILABLE = shared_memory is not None
+MAGIC = b'SKWR'
+VERSION = 1
+HEADER = struct.Struct('<4sII')
+ALIGN = 64
+
+
+def _aligned(size):
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+class SharedArrays(object):
+    """
+    Named arrays living in one shared memory block. The creating process owns the block and
+    unlinks it, workers attach by name and only close their mapping.
+    """
+
+    def __init__(self, shm, table, dataStart, owner):
+        self.shm = shm
+        self.owner = owner
+        self.arrays = {}
+        for name, dtype, shape, offset in table:
+            self.arrays[name] = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=shm.buf,
+                                           offset=dataStart + offset)
+
+    @classmethod
+    def create(cls, specs, name=None):
+        """specs is a list of (name, shape, dtype), the arrays come back zero filled"""
+        if not AVAILABLE:
+            raise RuntimeError('Shared memory buffers need Python 3.8 or newer')
+        table = []
+        offset = 0
+        for arrayName, shape, dtype in specs:
+            dtype = np.dtype(dtype)
+            table.append([arrayName, dtype.str, [int(s) for s in shape], offset])
+            offset = _aligned(offset + int(np.prod(shape)) * dtype.itemsize)
+        # table offsets are relative to the first aligned byte after the header
+        text = json.dumps(table).encode('utf-8')
+        dataStart = _aligned(HEADER.size + len(text))
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(dataStart + offset, 1))
+        shm.buf[:HEADER.size] = HEADER.pack(MAGIC, VERSION, len(text))
+        shm.buf[HEADER.size:HEADER.size + len(text)] = text
+        shared = cls(shm, table, dataStart, owner=True)
+        for array in shared.arrays.values():
+            array.fill(0)
+        return shared
+
+    @classmethod
+    def publish(cls, arrays, name=None):
+        """Copies a {name: array} dict into a new block"""
+        shared = cls.create([(key, np.shape(value), np.asarray(value).dtype) for key, value in arrays.items()], name)
+        for key, value in arrays.items():
+            shared.arrays[key][...] = value
+        return shared
+
+    @classmethod
+    def attach(cls, name):
+        if not AVAILABLE:
+            raise RuntimeError('Shared memory buffers need Python 3.8 or newer')
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        magic, version, size = HEADER.unpack(bytes(shm.buf[:HEADER.size]))
+        if magic != MAGIC or version != VERSION:
+            shm.close()
+            raise ValueError('{} is not a skinWrangler shared block'.format(name))
+        table = json.loads(bytes(shm.buf[HEADER.size:HEADER.size + size]).decode('utf-8'))
+        return cls(shm, table, _aligned(HEADER.size + size), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __getitem__(self, key):
+        return self.arrays[key]
+
+    def __contains__(self, key):
+        return key in self.arrays
+
+    def close(self):
+        """Drops the array views and the mapping, the owner also unlinks the block"""
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+## WORKERS
+########################################################################
+def smoothWorker(name, strength=0.5, iterations=5, implicit=False, columns=None, pinned=None, maxInfluences=None,
+                 locked=None):
+    """
+    Worker side of an out of process smooth: attaches to a block published by
+    skinwranglerdata.publishSkin and replaces the rows of its indices in place.
+    """
+    shared = SharedArrays.attach(name)
+    try:
+        weights = shared['weights']
+        indices = shared['indices']
+        adjacency = skinwranglermesh.Adjacency(shared['edges'], len(shared['points']))
+        weights[indices] = skinwranglerops.laplacianSmooth(weights, adjacency, indices, strength=strength,
+                                                           iterations=iterations, implicit=implicit, columns=columns,
+                                                           pinned=pinned, maxInfluences=maxInfluences, locked=locked)
+    finally:
+        shared.close()
+
+
+def pythonExecutable():
+    """Interpreter for worker processes, mayapy rather than the maya binary when running inside Maya"""
+    folder, exe = os.path.split(sys.executable)
+    if os.path.splitext(exe)[0].lower() == 'maya':
+        return os.path.join(folder, 'mayapy' + os.path.splitext(exe)[1])
+    return sys.executable
+
+
+def startWorker(func, *args, **kwargs):
+    """
+    Starts func(*args, **kwargs) in a spawned process and returns the process without waiting for it,
+    func has to be importable. Poll is_alive() and check the exitcode with checkWorker once it's done.
+    """
+    import multiprocessing
+    from multiprocessing import spawn
+    context = multiprocessing.get_context('spawn')
+    # the spawn executable is process wide, only swap it in for this start
+    previous = spawn.get_executable()
+    context.set_executable(pythonExecutable())
+    try:
+        process = context.Process(target=func, args=args, kwargs=kwargs)
+        process.start()
+    finally:
+        context.set_executable(previous)
+    return process
+
+
+def checkWorker(process, name='worker'):
+    """Raises RuntimeError if a finished worker process failed"""
+    process.join()
+    if process.exitcode:
+        raise RuntimeError('{} exited with code {}'.format(name, process.exitcode))
+
+
+def runWorker(func, *args, **kwargs):
+    """Blocking startWorker for scripts and batch jobs, the UI polls startWorker instead"""
+    checkWorker(startWorker(func, *args, **kwargs), func.__name__)
@@ -0,0 +1,120 @@
+"""
+skinWrangler weight snapshots
+
+Named in-memory copies of a skinCluster's sparse weights, kept in a ring with a memory cap
+and least recently used eviction. Rows are stored as per vertex counts instead of indices,
+values either as float16 (fast, ~4 bytes per weight) or zlib compressed float32.
+"""
+
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+import skinwranglerindex
+
+COMPRESSIONS = ('float16', 'zlib')
+DEFAULT_CAP = 256 * 1024 * 1024
+
+
+class Snapshot(object):
+    """Compressed sparse weights of one skinCluster/mesh pair"""
+
+    def __init__(self, name, skin, mesh, influences, weights, compression='float16'):
+        if compression not in COMPRESSIONS:
+            raise ValueError('Unknown compression {}, expected one of {}'.format(compression, COMPRESSIONS))
+        self.name = name
+        self.skin = skin
+        self.mesh = mesh
+        self.influences = list(influences)
+        self.shape = weights.shape
+        self.compression = compression
+        self.time = time.time()
+        # rows are sorted, so per vertex counts rebuild them exactly
+        counts = np.bincount(weights.rows, minlength=self.shape[0])
+        self.counts = counts.astype(np.uint8 if counts.max(initial=0) < 256 else np.uint16)
+        self.cols = weights.cols.astype(np.uint16 if self.shape[1] < 65536 else np.uint32)
+        if compression == 'float16':
+            self.values = weights.values.astype(np.float16)
+            # float16 rounding breaks row sums, remember which rows were normalized
+            sums = np.bincount(weights.rows, weights.values, self.shape[0])
+            self.normalized = np.packbits(np.abs(sums - 1.0) < 1e-4)
+        else:
+            self.values = zlib.compress(weights.values.astype(np.float32).tobytes(), 1)
+            self.normalized = None
+
+    @property
+    def nbytes(self):
+        size = self.counts.nbytes + self.cols.nbytes
+        if self.compression == 'float16':
+            return size + self.values.nbytes + self.normalized.nbytes
+        return size + len(self.values)
+
+    def sparse(self):
+        """The stored weights as SparseWeights"""
+        rows = np.repeat(np.arange(self.shape[0]), self.counts)
+        if self.compression == 'float16':
+            values = self.values.astype(np.float64)
+            normalized = np.unpackbits(self.normalized)[:self.shape[0]].astype(bool)
+            sums = np.bincount(rows, values, self.shape[0])
+            scale = np.ones(self.shape[0])
+            fix = normalized & (sums > 0)
+            scale[fix] = 1.0 / sums[fix]
+            values *= scale[rows]
+        else:
+            values = np.frombuffer(zlib.decompress(self.values), dtype=np.float32).astype(np.float64)
+        return skinwranglerindex.SparseWeights(rows, self.cols.astype(np.intp), values, self.shape, presorted=True)
+
+
+class SnapshotRing(object):
+    """Snapshots by name in least recently used order, the oldest are dropped once over cap bytes"""
+
+    def __init__(self, cap=DEFAULT_CAP):
+        self.cap = cap
+        self.snapshots = OrderedDict()
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def __contains__(self, name):
+        return name in self.snapshots
+
+    @property
+    def nbytes(self):
+        return sum(snapshot.nbytes for snapshot in self.snapshots.values())
+
+    def names(self):
+        return list(self.snapshots.keys())
+
+    def add(self, snapshot):
+        """Stores a snapshot (replacing one of the same name), returns the names evicted to make room"""
+        self.snapshots.pop(snapshot.name, None)
+        self.snapshots[snapshot.name] = snapshot
+        return self.evict()
+
+    def get(self, name):
+        """Returns a snapshot and marks it as most recently used"""
+        snapshot = self.snapshots.pop(name)
+        self.snapshots[name] = snapshot
+        return snapshot
+
+    def remove(self, name):
+        self.snapshots.pop(name, None)
+
+    def clear(self):
+        self.snapshots.clear()
+
+    def setCap(self, cap):
+        self.cap = cap
+        return self.evict()
+
+    def evict(self):
+        """Drops least recently used snapshots until under cap, always keeping the newest one"""
+        evicted = []
+        total = self.nbytes
+        while total > self.cap and len(self.snapshots) > 1:
+            name, snapshot = self.snapshots.popitem(last=False)
+            total -= snapshot.nbytes
+            evicted.append(name)
+        return evicted
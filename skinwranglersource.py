@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 
-# Form implementation generated from reading ui file 'D:\tools\zootools\zoo\apps\skinwrangler\skinwrangler.ui'
+# Form implementation generated from reading ui file 'skinWrangler.ui'
 #
-# Created: Wed Feb 01 21:14:43 2017
+# Created: Mon Oct 19 18:40:12 2026
 #      by: pyside2-uic  running on PySide2 2.0.0~alpha0
 #
 # WARNING! All changes made in this file will be lost!
@@ -123,6 +123,9 @@ class Ui_skinWranglerDlg(object):
         self.selLoopBTN.setObjectName("selLoopBTN")
         self.horizontalLayout.addWidget(self.selLoopBTN)
         self.verticalLayout_2.addLayout(self.horizontalLayout)
+        self.horizontalLayout_9 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_9.setSpacing(2)
+        self.horizontalLayout_9.setObjectName("horizontalLayout_9")
         self.selPointsEffectedBTN = QtWidgets.QPushButton(self.groupBox)
         font = QtGui.QFont()
         font.setPointSize(8)
@@ -130,7 +133,23 @@ class Ui_skinWranglerDlg(object):
         font.setBold(True)
         self.selPointsEffectedBTN.setFont(font)
         self.selPointsEffectedBTN.setObjectName("selPointsEffectedBTN")
-        self.verticalLayout_2.addWidget(self.selPointsEffectedBTN)
+        self.horizontalLayout_9.addWidget(self.selPointsEffectedBTN)
+        self.affectedThresholdSLD = QtWidgets.QSlider(self.groupBox)
+        self.affectedThresholdSLD.setMaximumSize(QtCore.QSize(80, 16777215))
+        self.affectedThresholdSLD.setMaximum(100)
+        self.affectedThresholdSLD.setOrientation(QtCore.Qt.Horizontal)
+        self.affectedThresholdSLD.setObjectName("affectedThresholdSLD")
+        self.horizontalLayout_9.addWidget(self.affectedThresholdSLD)
+        self.affectedThresholdLBL = QtWidgets.QLabel(self.groupBox)
+        self.affectedThresholdLBL.setMinimumSize(QtCore.QSize(32, 0))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setWeight(50)
+        font.setBold(False)
+        self.affectedThresholdLBL.setFont(font)
+        self.affectedThresholdLBL.setObjectName("affectedThresholdLBL")
+        self.horizontalLayout_9.addWidget(self.affectedThresholdLBL)
+        self.verticalLayout_2.addLayout(self.horizontalLayout_9)
         self.verticalLayout.addWidget(self.groupBox)
         self.groupBox_2 = QtWidgets.QGroupBox(skinWranglerDlg)
         font = QtGui.QFont()
@@ -261,7 +280,6 @@ class Ui_skinWranglerDlg(object):
         self.setWeightSpin.setObjectName("setWeightSpin")
         self.gridLayout.addWidget(self.setWeightSpin, 0, 2, 1, 1)
         self.scaleWeightBTN = QtWidgets.QPushButton(self.groupBox_2)
-        self.scaleWeightBTN.setEnabled(False)
         font = QtGui.QFont()
         font.setPointSize(10)
         font.setWeight(75)
@@ -270,18 +288,16 @@ class Ui_skinWranglerDlg(object):
         self.scaleWeightBTN.setObjectName("scaleWeightBTN")
         self.gridLayout.addWidget(self.scaleWeightBTN, 1, 0, 1, 1)
         self.scaleWeightSpin = QtWidgets.QDoubleSpinBox(self.groupBox_2)
-        self.scaleWeightSpin.setEnabled(False)
         font = QtGui.QFont()
         font.setPointSize(10)
         font.setWeight(75)
         font.setBold(True)
         self.scaleWeightSpin.setFont(font)
         self.scaleWeightSpin.setSingleStep(0.01)
-        self.scaleWeightSpin.setProperty("value", 0.1)
+        self.scaleWeightSpin.setProperty("value", 0.9)
         self.scaleWeightSpin.setObjectName("scaleWeightSpin")
         self.gridLayout.addWidget(self.scaleWeightSpin, 1, 2, 1, 1)
         self.multWeightBTN = QtWidgets.QPushButton(self.groupBox_2)
-        self.multWeightBTN.setEnabled(False)
         self.multWeightBTN.setMaximumSize(QtCore.QSize(25, 16777215))
         self.multWeightBTN.setObjectName("multWeightBTN")
         self.gridLayout.addWidget(self.multWeightBTN, 1, 3, 1, 1)
@@ -301,7 +317,6 @@ class Ui_skinWranglerDlg(object):
         self.refreshBTN.setObjectName("refreshBTN")
         self.gridLayout.addWidget(self.refreshBTN, 2, 4, 1, 1)
         self.divWeightBTN = QtWidgets.QPushButton(self.groupBox_2)
-        self.divWeightBTN.setEnabled(False)
         self.divWeightBTN.setMaximumSize(QtCore.QSize(25, 16777215))
         self.divWeightBTN.setObjectName("divWeightBTN")
         self.gridLayout.addWidget(self.divWeightBTN, 1, 4, 1, 1)
@@ -357,6 +372,14 @@ class Ui_skinWranglerDlg(object):
         self.filterLINE.setFont(font)
         self.filterLINE.setObjectName("filterLINE")
         self.horizontalLayout_6.addWidget(self.filterLINE)
+        self.lockFilteredBTN = QtWidgets.QPushButton(self.groupBox_2)
+        self.lockFilteredBTN.setMaximumSize(QtCore.QSize(55, 20))
+        self.lockFilteredBTN.setObjectName("lockFilteredBTN")
+        self.horizontalLayout_6.addWidget(self.lockFilteredBTN)
+        self.unlockFilteredBTN = QtWidgets.QPushButton(self.groupBox_2)
+        self.unlockFilteredBTN.setMaximumSize(QtCore.QSize(55, 20))
+        self.unlockFilteredBTN.setObjectName("unlockFilteredBTN")
+        self.horizontalLayout_6.addWidget(self.unlockFilteredBTN)
         self.verticalLayout_3.addLayout(self.horizontalLayout_6)
         self.jointLST = QtWidgets.QTreeWidget(self.groupBox_2)
         font = QtGui.QFont()
@@ -368,18 +391,10 @@ class Ui_skinWranglerDlg(object):
         self.jointLST.setIconSize(QtCore.QSize(20, 20))
         self.jointLST.setRootIsDecorated(False)
         self.jointLST.setItemsExpandable(False)
-        self.jointLST.setColumnCount(2)
+        self.jointLST.setColumnCount(5)
         self.jointLST.setObjectName("jointLST")
         self.jointLST.headerItem().setText(0, "JOINT")
         item_0 = QtWidgets.QTreeWidgetItem(self.jointLST)
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        font.setWeight(75)
-        font.setBold(True)
-        font = QtGui.QFont()
-        font.setPointSize(8)
-        font.setWeight(50)
-        font.setBold(False)
         self.jointLST.header().setVisible(True)
         self.jointLST.header().setDefaultSectionSize(120)
         self.verticalLayout_3.addWidget(self.jointLST)
@@ -402,12 +417,17 @@ class Ui_skinWranglerDlg(object):
         self.nameSpaceCHK.setObjectName("nameSpaceCHK")
         self.horizontalLayout_4.addWidget(self.nameSpaceCHK)
         self.longNamesCHK = QtWidgets.QCheckBox(self.groupBox_2)
-        self.longNamesCHK.setEnabled(False)
         font = QtGui.QFont()
         font.setPointSize(8)
         self.longNamesCHK.setFont(font)
         self.longNamesCHK.setObjectName("longNamesCHK")
         self.horizontalLayout_4.addWidget(self.longNamesCHK)
+        self.hierarchyCHK = QtWidgets.QCheckBox(self.groupBox_2)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.hierarchyCHK.setFont(font)
+        self.hierarchyCHK.setObjectName("hierarchyCHK")
+        self.horizontalLayout_4.addWidget(self.hierarchyCHK)
         self.verticalLayout_3.addLayout(self.horizontalLayout_4)
         self.horizontalLayout_10 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_10.setSizeConstraint(QtWidgets.QLayout.SetMinimumSize)
@@ -454,6 +474,13 @@ class Ui_skinWranglerDlg(object):
         self.removeUnusedBTN.setFont(font)
         self.removeUnusedBTN.setObjectName("removeUnusedBTN")
         self.horizontalLayout_5.addWidget(self.removeUnusedBTN)
+        self.removeThresholdSPIN = QtWidgets.QDoubleSpinBox(self.tab_3)
+        self.removeThresholdSPIN.setMaximumSize(QtCore.QSize(55, 16777215))
+        self.removeThresholdSPIN.setDecimals(3)
+        self.removeThresholdSPIN.setMaximum(1.0)
+        self.removeThresholdSPIN.setSingleStep(0.005)
+        self.removeThresholdSPIN.setObjectName("removeThresholdSPIN")
+        self.horizontalLayout_5.addWidget(self.removeThresholdSPIN)
         self.clampInfBTN = QtWidgets.QPushButton(self.tab_3)
         self.clampInfBTN.setMaximumSize(QtCore.QSize(122, 16777215))
         font = QtGui.QFont()
@@ -489,6 +516,15 @@ class Ui_skinWranglerDlg(object):
         self.bindPoseBTN.setFont(font)
         self.bindPoseBTN.setObjectName("bindPoseBTN")
         self.horizontalLayout_7.addWidget(self.bindPoseBTN)
+        self.auditBindPoseBTN = QtWidgets.QPushButton(self.tab_3)
+        self.auditBindPoseBTN.setMaximumSize(QtCore.QSize(50, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.auditBindPoseBTN.setFont(font)
+        self.auditBindPoseBTN.setObjectName("auditBindPoseBTN")
+        self.horizontalLayout_7.addWidget(self.auditBindPoseBTN)
         self.selectVertsWithInfBTN = QtWidgets.QPushButton(self.tab_3)
         self.selectVertsWithInfBTN.setMaximumSize(QtCore.QSize(131, 16777215))
         font = QtGui.QFont()
@@ -508,16 +544,567 @@ class Ui_skinWranglerDlg(object):
         self.tab_4 = QtWidgets.QWidget()
         self.tab_4.setObjectName("tab_4")
         self.jointOnBboxCenterBTN = QtWidgets.QPushButton(self.tab_4)
-        self.jointOnBboxCenterBTN.setGeometry(QtCore.QRect(0, 0, 196, 23))
-        self.jointOnBboxCenterBTN.setCheckable(True)
+        self.jointOnBboxCenterBTN.setGeometry(QtCore.QRect(0, 0, 150, 23))
         self.jointOnBboxCenterBTN.setObjectName("jointOnBboxCenterBTN")
+        self.jointCenterModeCMB = QtWidgets.QComboBox(self.tab_4)
+        self.jointCenterModeCMB.setGeometry(QtCore.QRect(154, 0, 80, 23))
+        self.jointCenterModeCMB.setObjectName("jointCenterModeCMB")
+        self.jointCenterModeCMB.addItem("")
+        self.jointCenterModeCMB.addItem("")
+        self.jointCenterModeCMB.addItem("")
+        self.jointGroupCMB = QtWidgets.QComboBox(self.tab_4)
+        self.jointGroupCMB.setGeometry(QtCore.QRect(238, 0, 98, 23))
+        self.jointGroupCMB.setObjectName("jointGroupCMB")
+        self.jointGroupCMB.addItem("")
+        self.jointGroupCMB.addItem("")
         self.avgOptionCHK = QtWidgets.QCheckBox(self.tab_4)
-        self.avgOptionCHK.setGeometry(QtCore.QRect(0, 30, 336, 15))
+        self.avgOptionCHK.setGeometry(QtCore.QRect(0, 30, 200, 15))
         font = QtGui.QFont()
         font.setPointSize(7)
         self.avgOptionCHK.setFont(font)
         self.avgOptionCHK.setObjectName("avgOptionCHK")
+        self.jointParentCHK = QtWidgets.QCheckBox(self.tab_4)
+        self.jointParentCHK.setGeometry(QtCore.QRect(205, 30, 131, 15))
+        font = QtGui.QFont()
+        font.setPointSize(7)
+        self.jointParentCHK.setFont(font)
+        self.jointParentCHK.setObjectName("jointParentCHK")
         self.tabWidget.addTab(self.tab_4, "")
+        self.tab_5 = QtWidgets.QWidget()
+        self.tab_5.setObjectName("tab_5")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.tab_5)
+        self.verticalLayout_6.setSpacing(2)
+        self.verticalLayout_6.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.horizontalLayout_11 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_11.setSpacing(2)
+        self.horizontalLayout_11.setObjectName("horizontalLayout_11")
+        self.prepEngineBTN = QtWidgets.QPushButton(self.tab_5)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.prepEngineBTN.setFont(font)
+        self.prepEngineBTN.setObjectName("prepEngineBTN")
+        self.horizontalLayout_11.addWidget(self.prepEngineBTN)
+        self.prepBitsCMB = QtWidgets.QComboBox(self.tab_5)
+        self.prepBitsCMB.setMaximumSize(QtCore.QSize(55, 16777215))
+        self.prepBitsCMB.setObjectName("prepBitsCMB")
+        self.prepBitsCMB.addItem("")
+        self.prepBitsCMB.addItem("")
+        self.horizontalLayout_11.addWidget(self.prepBitsCMB)
+        self.prepMaxInfSPIN = QtWidgets.QSpinBox(self.tab_5)
+        self.prepMaxInfSPIN.setMaximumSize(QtCore.QSize(57, 16777215))
+        self.prepMaxInfSPIN.setMinimum(1)
+        self.prepMaxInfSPIN.setProperty("value", 4)
+        self.prepMaxInfSPIN.setObjectName("prepMaxInfSPIN")
+        self.horizontalLayout_11.addWidget(self.prepMaxInfSPIN)
+        self.prepEpsilonSPIN = QtWidgets.QDoubleSpinBox(self.tab_5)
+        self.prepEpsilonSPIN.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.prepEpsilonSPIN.setDecimals(4)
+        self.prepEpsilonSPIN.setMaximum(0.5)
+        self.prepEpsilonSPIN.setSingleStep(0.001)
+        self.prepEpsilonSPIN.setProperty("value", 0.001)
+        self.prepEpsilonSPIN.setObjectName("prepEpsilonSPIN")
+        self.horizontalLayout_11.addWidget(self.prepEpsilonSPIN)
+        self.verticalLayout_6.addLayout(self.horizontalLayout_11)
+        self.horizontalLayout_12 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_12.setSpacing(2)
+        self.horizontalLayout_12.setObjectName("horizontalLayout_12")
+        self.prepErrorLBL = QtWidgets.QLabel(self.tab_5)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setWeight(50)
+        font.setBold(False)
+        self.prepErrorLBL.setFont(font)
+        self.prepErrorLBL.setObjectName("prepErrorLBL")
+        self.horizontalLayout_12.addWidget(self.prepErrorLBL)
+        self.prepWorstSPIN = QtWidgets.QSpinBox(self.tab_5)
+        self.prepWorstSPIN.setMaximumSize(QtCore.QSize(75, 16777215))
+        self.prepWorstSPIN.setMaximum(100000)
+        self.prepWorstSPIN.setProperty("value", 50)
+        self.prepWorstSPIN.setObjectName("prepWorstSPIN")
+        self.horizontalLayout_12.addWidget(self.prepWorstSPIN)
+        self.verticalLayout_6.addLayout(self.horizontalLayout_12)
+        self.tabWidget.addTab(self.tab_5, "")
+        self.tab_6 = QtWidgets.QWidget()
+        self.tab_6.setObjectName("tab_6")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.tab_6)
+        self.verticalLayout_7.setSpacing(2)
+        self.verticalLayout_7.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.horizontalLayout_13 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_13.setSpacing(2)
+        self.horizontalLayout_13.setObjectName("horizontalLayout_13")
+        self.smoothStrengthSPIN = QtWidgets.QDoubleSpinBox(self.tab_6)
+        self.smoothStrengthSPIN.setMaximum(1.0)
+        self.smoothStrengthSPIN.setSingleStep(0.05)
+        self.smoothStrengthSPIN.setProperty("value", 0.5)
+        self.smoothStrengthSPIN.setObjectName("smoothStrengthSPIN")
+        self.horizontalLayout_13.addWidget(self.smoothStrengthSPIN)
+        self.smoothIterSPIN = QtWidgets.QSpinBox(self.tab_6)
+        self.smoothIterSPIN.setMinimum(1)
+        self.smoothIterSPIN.setMaximum(500)
+        self.smoothIterSPIN.setProperty("value", 5)
+        self.smoothIterSPIN.setObjectName("smoothIterSPIN")
+        self.horizontalLayout_13.addWidget(self.smoothIterSPIN)
+        self.smoothImplicitCHK = QtWidgets.QCheckBox(self.tab_6)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.smoothImplicitCHK.setFont(font)
+        self.smoothImplicitCHK.setObjectName("smoothImplicitCHK")
+        self.horizontalLayout_13.addWidget(self.smoothImplicitCHK)
+        self.verticalLayout_7.addLayout(self.horizontalLayout_13)
+        self.horizontalLayout_14 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_14.setSpacing(2)
+        self.horizontalLayout_14.setObjectName("horizontalLayout_14")
+        self.smoothPinBorderCHK = QtWidgets.QCheckBox(self.tab_6)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.smoothPinBorderCHK.setFont(font)
+        self.smoothPinBorderCHK.setObjectName("smoothPinBorderCHK")
+        self.horizontalLayout_14.addWidget(self.smoothPinBorderCHK)
+        self.smoothSelInfCHK = QtWidgets.QCheckBox(self.tab_6)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.smoothSelInfCHK.setFont(font)
+        self.smoothSelInfCHK.setObjectName("smoothSelInfCHK")
+        self.horizontalLayout_14.addWidget(self.smoothSelInfCHK)
+        self.smoothProcessCHK = QtWidgets.QCheckBox(self.tab_6)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.smoothProcessCHK.setFont(font)
+        self.smoothProcessCHK.setObjectName("smoothProcessCHK")
+        self.horizontalLayout_14.addWidget(self.smoothProcessCHK)
+        self.verticalLayout_7.addLayout(self.horizontalLayout_14)
+        self.tabWidget.addTab(self.tab_6, "")
+        self.tab_7 = QtWidgets.QWidget()
+        self.tab_7.setObjectName("tab_7")
+        self.verticalLayout_8 = QtWidgets.QVBoxLayout(self.tab_7)
+        self.verticalLayout_8.setSpacing(2)
+        self.verticalLayout_8.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_8.setObjectName("verticalLayout_8")
+        self.horizontalLayout_15 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_15.setSpacing(2)
+        self.horizontalLayout_15.setObjectName("horizontalLayout_15")
+        self.falloffBTN = QtWidgets.QPushButton(self.tab_7)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.falloffBTN.setFont(font)
+        self.falloffBTN.setObjectName("falloffBTN")
+        self.horizontalLayout_15.addWidget(self.falloffBTN)
+        self.falloffCurveCMB = QtWidgets.QComboBox(self.tab_7)
+        self.falloffCurveCMB.setMaximumSize(QtCore.QSize(70, 16777215))
+        self.falloffCurveCMB.setObjectName("falloffCurveCMB")
+        self.falloffCurveCMB.addItem("")
+        self.falloffCurveCMB.addItem("")
+        self.falloffCurveCMB.addItem("")
+        self.falloffCurveCMB.addItem("")
+        self.horizontalLayout_15.addWidget(self.falloffCurveCMB)
+        self.verticalLayout_8.addLayout(self.horizontalLayout_15)
+        self.horizontalLayout_16 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_16.setSpacing(2)
+        self.horizontalLayout_16.setObjectName("horizontalLayout_16")
+        self.falloffModeCMB = QtWidgets.QComboBox(self.tab_7)
+        self.falloffModeCMB.setObjectName("falloffModeCMB")
+        self.falloffModeCMB.addItem("")
+        self.falloffModeCMB.addItem("")
+        self.horizontalLayout_16.addWidget(self.falloffModeCMB)
+        self.falloffRingsSPIN = QtWidgets.QSpinBox(self.tab_7)
+        self.falloffRingsSPIN.setMinimum(1)
+        self.falloffRingsSPIN.setMaximum(1000)
+        self.falloffRingsSPIN.setProperty("value", 5)
+        self.falloffRingsSPIN.setObjectName("falloffRingsSPIN")
+        self.horizontalLayout_16.addWidget(self.falloffRingsSPIN)
+        self.falloffDistSPIN = QtWidgets.QDoubleSpinBox(self.tab_7)
+        self.falloffDistSPIN.setMaximum(100000.0)
+        self.falloffDistSPIN.setProperty("value", 5.0)
+        self.falloffDistSPIN.setObjectName("falloffDistSPIN")
+        self.horizontalLayout_16.addWidget(self.falloffDistSPIN)
+        self.verticalLayout_8.addLayout(self.horizontalLayout_16)
+        self.tabWidget.addTab(self.tab_7, "")
+        self.tab_8 = QtWidgets.QWidget()
+        self.tab_8.setObjectName("tab_8")
+        self.verticalLayout_9 = QtWidgets.QVBoxLayout(self.tab_8)
+        self.verticalLayout_9.setSpacing(2)
+        self.verticalLayout_9.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_9.setObjectName("verticalLayout_9")
+        self.horizontalLayout_17 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_17.setSpacing(2)
+        self.horizontalLayout_17.setObjectName("horizontalLayout_17")
+        self.addSeedCHK = QtWidgets.QCheckBox(self.tab_8)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.addSeedCHK.setFont(font)
+        self.addSeedCHK.setObjectName("addSeedCHK")
+        self.horizontalLayout_17.addWidget(self.addSeedCHK)
+        self.addRadiusSPIN = QtWidgets.QDoubleSpinBox(self.tab_8)
+        self.addRadiusSPIN.setMaximumSize(QtCore.QSize(90, 16777215))
+        self.addRadiusSPIN.setMaximum(100000.0)
+        self.addRadiusSPIN.setProperty("value", 5.0)
+        self.addRadiusSPIN.setObjectName("addRadiusSPIN")
+        self.horizontalLayout_17.addWidget(self.addRadiusSPIN)
+        self.transferBTN = QtWidgets.QPushButton(self.tab_8)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.transferBTN.setFont(font)
+        self.transferBTN.setObjectName("transferBTN")
+        self.horizontalLayout_17.addWidget(self.transferBTN)
+        self.transferSelCHK = QtWidgets.QCheckBox(self.tab_8)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.transferSelCHK.setFont(font)
+        self.transferSelCHK.setObjectName("transferSelCHK")
+        self.horizontalLayout_17.addWidget(self.transferSelCHK)
+        self.verticalLayout_9.addLayout(self.horizontalLayout_17)
+        self.horizontalLayout_18 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_18.setSpacing(2)
+        self.horizontalLayout_18.setObjectName("horizontalLayout_18")
+        self.roughBindBTN = QtWidgets.QPushButton(self.tab_8)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.roughBindBTN.setFont(font)
+        self.roughBindBTN.setObjectName("roughBindBTN")
+        self.horizontalLayout_18.addWidget(self.roughBindBTN)
+        self.bindMaxInfSPIN = QtWidgets.QSpinBox(self.tab_8)
+        self.bindMaxInfSPIN.setMinimum(1)
+        self.bindMaxInfSPIN.setMaximum(32)
+        self.bindMaxInfSPIN.setProperty("value", 4)
+        self.bindMaxInfSPIN.setObjectName("bindMaxInfSPIN")
+        self.horizontalLayout_18.addWidget(self.bindMaxInfSPIN)
+        self.bindVisibleCHK = QtWidgets.QCheckBox(self.tab_8)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.bindVisibleCHK.setFont(font)
+        self.bindVisibleCHK.setChecked(True)
+        self.bindVisibleCHK.setObjectName("bindVisibleCHK")
+        self.horizontalLayout_18.addWidget(self.bindVisibleCHK)
+        self.bindShellCHK = QtWidgets.QCheckBox(self.tab_8)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.bindShellCHK.setFont(font)
+        self.bindShellCHK.setChecked(True)
+        self.bindShellCHK.setObjectName("bindShellCHK")
+        self.horizontalLayout_18.addWidget(self.bindShellCHK)
+        self.verticalLayout_9.addLayout(self.horizontalLayout_18)
+        self.tabWidget.addTab(self.tab_8, "")
+        self.tab_9 = QtWidgets.QWidget()
+        self.tab_9.setObjectName("tab_9")
+        self.verticalLayout_10 = QtWidgets.QVBoxLayout(self.tab_9)
+        self.verticalLayout_10.setSpacing(2)
+        self.verticalLayout_10.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_10.setObjectName("verticalLayout_10")
+        self.horizontalLayout_19 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_19.setSpacing(2)
+        self.horizontalLayout_19.setObjectName("horizontalLayout_19")
+        self.compareBTN = QtWidgets.QPushButton(self.tab_9)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.compareBTN.setFont(font)
+        self.compareBTN.setObjectName("compareBTN")
+        self.horizontalLayout_19.addWidget(self.compareBTN)
+        self.compareTolSPIN = QtWidgets.QDoubleSpinBox(self.tab_9)
+        self.compareTolSPIN.setMaximumSize(QtCore.QSize(70, 16777215))
+        self.compareTolSPIN.setDecimals(4)
+        self.compareTolSPIN.setMaximum(1.0)
+        self.compareTolSPIN.setSingleStep(0.001)
+        self.compareTolSPIN.setProperty("value", 0.001)
+        self.compareTolSPIN.setObjectName("compareTolSPIN")
+        self.horizontalLayout_19.addWidget(self.compareTolSPIN)
+        self.exportWeightsBTN = QtWidgets.QPushButton(self.tab_9)
+        self.exportWeightsBTN.setMaximumSize(QtCore.QSize(60, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.exportWeightsBTN.setFont(font)
+        self.exportWeightsBTN.setObjectName("exportWeightsBTN")
+        self.horizontalLayout_19.addWidget(self.exportWeightsBTN)
+        self.verticalLayout_10.addLayout(self.horizontalLayout_19)
+        self.compareLBL = QtWidgets.QLabel(self.tab_9)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setWeight(50)
+        font.setBold(False)
+        self.compareLBL.setFont(font)
+        self.compareLBL.setObjectName("compareLBL")
+        self.verticalLayout_10.addWidget(self.compareLBL)
+        self.tabWidget.addTab(self.tab_9, "")
+        self.tab_10 = QtWidgets.QWidget()
+        self.tab_10.setObjectName("tab_10")
+        self.verticalLayout_11 = QtWidgets.QVBoxLayout(self.tab_10)
+        self.verticalLayout_11.setSpacing(2)
+        self.verticalLayout_11.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_11.setObjectName("verticalLayout_11")
+        self.horizontalLayout_20 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_20.setSpacing(2)
+        self.horizontalLayout_20.setObjectName("horizontalLayout_20")
+        self.snapshotBTN = QtWidgets.QPushButton(self.tab_10)
+        self.snapshotBTN.setMaximumSize(QtCore.QSize(60, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.snapshotBTN.setFont(font)
+        self.snapshotBTN.setObjectName("snapshotBTN")
+        self.horizontalLayout_20.addWidget(self.snapshotBTN)
+        self.snapshotCMB = QtWidgets.QComboBox(self.tab_10)
+        self.snapshotCMB.setObjectName("snapshotCMB")
+        self.horizontalLayout_20.addWidget(self.snapshotCMB)
+        self.restoreSnapshotBTN = QtWidgets.QPushButton(self.tab_10)
+        self.restoreSnapshotBTN.setMaximumSize(QtCore.QSize(80, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.restoreSnapshotBTN.setFont(font)
+        self.restoreSnapshotBTN.setObjectName("restoreSnapshotBTN")
+        self.horizontalLayout_20.addWidget(self.restoreSnapshotBTN)
+        self.verticalLayout_11.addLayout(self.horizontalLayout_20)
+        self.horizontalLayout_21 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_21.setSpacing(2)
+        self.horizontalLayout_21.setObjectName("horizontalLayout_21")
+        self.restoreSelCHK = QtWidgets.QCheckBox(self.tab_10)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.restoreSelCHK.setFont(font)
+        self.restoreSelCHK.setObjectName("restoreSelCHK")
+        self.horizontalLayout_21.addWidget(self.restoreSelCHK)
+        self.snapshotZlibCHK = QtWidgets.QCheckBox(self.tab_10)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.snapshotZlibCHK.setFont(font)
+        self.snapshotZlibCHK.setObjectName("snapshotZlibCHK")
+        self.horizontalLayout_21.addWidget(self.snapshotZlibCHK)
+        self.snapshotCapSPIN = QtWidgets.QSpinBox(self.tab_10)
+        self.snapshotCapSPIN.setMinimum(16)
+        self.snapshotCapSPIN.setMaximum(8192)
+        self.snapshotCapSPIN.setSingleStep(64)
+        self.snapshotCapSPIN.setProperty("value", 256)
+        self.snapshotCapSPIN.setObjectName("snapshotCapSPIN")
+        self.horizontalLayout_21.addWidget(self.snapshotCapSPIN)
+        self.snapshotLBL = QtWidgets.QLabel(self.tab_10)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setWeight(50)
+        font.setBold(False)
+        self.snapshotLBL.setFont(font)
+        self.snapshotLBL.setObjectName("snapshotLBL")
+        self.horizontalLayout_21.addWidget(self.snapshotLBL)
+        self.verticalLayout_11.addLayout(self.horizontalLayout_21)
+        self.tabWidget.addTab(self.tab_10, "")
+        self.tab_11 = QtWidgets.QWidget()
+        self.tab_11.setObjectName("tab_11")
+        self.verticalLayout_12 = QtWidgets.QVBoxLayout(self.tab_11)
+        self.verticalLayout_12.setSpacing(2)
+        self.verticalLayout_12.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_12.setObjectName("verticalLayout_12")
+        self.horizontalLayout_22 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_22.setSpacing(2)
+        self.horizontalLayout_22.setObjectName("horizontalLayout_22")
+        self.auditSceneBTN = QtWidgets.QPushButton(self.tab_11)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.auditSceneBTN.setFont(font)
+        self.auditSceneBTN.setObjectName("auditSceneBTN")
+        self.horizontalLayout_22.addWidget(self.auditSceneBTN)
+        self.auditEpsilonSPIN = QtWidgets.QDoubleSpinBox(self.tab_11)
+        self.auditEpsilonSPIN.setMaximumSize(QtCore.QSize(80, 16777215))
+        self.auditEpsilonSPIN.setDecimals(5)
+        self.auditEpsilonSPIN.setMaximum(0.1)
+        self.auditEpsilonSPIN.setSingleStep(0.0001)
+        self.auditEpsilonSPIN.setProperty("value", 0.0001)
+        self.auditEpsilonSPIN.setObjectName("auditEpsilonSPIN")
+        self.horizontalLayout_22.addWidget(self.auditEpsilonSPIN)
+        self.rpcServerCHK = QtWidgets.QCheckBox(self.tab_11)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.rpcServerCHK.setFont(font)
+        self.rpcServerCHK.setObjectName("rpcServerCHK")
+        self.horizontalLayout_22.addWidget(self.rpcServerCHK)
+        self.rpcPortSPIN = QtWidgets.QSpinBox(self.tab_11)
+        self.rpcPortSPIN.setMaximumSize(QtCore.QSize(70, 16777215))
+        self.rpcPortSPIN.setMinimum(1024)
+        self.rpcPortSPIN.setMaximum(65535)
+        self.rpcPortSPIN.setProperty("value", 7733)
+        self.rpcPortSPIN.setObjectName("rpcPortSPIN")
+        self.horizontalLayout_22.addWidget(self.rpcPortSPIN)
+        self.verticalLayout_12.addLayout(self.horizontalLayout_22)
+        self.horizontalLayout_23 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_23.setSpacing(2)
+        self.horizontalLayout_23.setObjectName("horizontalLayout_23")
+        self.checkNormalizedBTN = QtWidgets.QPushButton(self.tab_11)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.checkNormalizedBTN.setFont(font)
+        self.checkNormalizedBTN.setObjectName("checkNormalizedBTN")
+        self.horizontalLayout_23.addWidget(self.checkNormalizedBTN)
+        self.normalizeRowsBTN = QtWidgets.QPushButton(self.tab_11)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.normalizeRowsBTN.setFont(font)
+        self.normalizeRowsBTN.setObjectName("normalizeRowsBTN")
+        self.horizontalLayout_23.addWidget(self.normalizeRowsBTN)
+        self.normalizeTolSPIN = QtWidgets.QDoubleSpinBox(self.tab_11)
+        self.normalizeTolSPIN.setMaximumSize(QtCore.QSize(70, 16777215))
+        self.normalizeTolSPIN.setDecimals(4)
+        self.normalizeTolSPIN.setMaximum(0.5)
+        self.normalizeTolSPIN.setSingleStep(0.001)
+        self.normalizeTolSPIN.setProperty("value", 0.001)
+        self.normalizeTolSPIN.setObjectName("normalizeTolSPIN")
+        self.horizontalLayout_23.addWidget(self.normalizeTolSPIN)
+        self.autoNormalizeCHK = QtWidgets.QCheckBox(self.tab_11)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.autoNormalizeCHK.setFont(font)
+        self.autoNormalizeCHK.setObjectName("autoNormalizeCHK")
+        self.horizontalLayout_23.addWidget(self.autoNormalizeCHK)
+        self.verticalLayout_12.addLayout(self.horizontalLayout_23)
+        self.tabWidget.addTab(self.tab_11, "")
+        self.tab_12 = QtWidgets.QWidget()
+        self.tab_12.setObjectName("tab_12")
+        self.verticalLayout_13 = QtWidgets.QVBoxLayout(self.tab_12)
+        self.verticalLayout_13.setSpacing(2)
+        self.verticalLayout_13.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_13.setObjectName("verticalLayout_13")
+        self.horizontalLayout_24 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_24.setSpacing(2)
+        self.horizontalLayout_24.setObjectName("horizontalLayout_24")
+        self.blendSetBTN = QtWidgets.QPushButton(self.tab_12)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendSetBTN.setFont(font)
+        self.blendSetBTN.setObjectName("blendSetBTN")
+        self.horizontalLayout_24.addWidget(self.blendSetBTN)
+        self.blendAddBTN = QtWidgets.QPushButton(self.tab_12)
+        self.blendAddBTN.setMaximumSize(QtCore.QSize(30, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendAddBTN.setFont(font)
+        self.blendAddBTN.setObjectName("blendAddBTN")
+        self.horizontalLayout_24.addWidget(self.blendAddBTN)
+        self.blendSubBTN = QtWidgets.QPushButton(self.tab_12)
+        self.blendSubBTN.setMaximumSize(QtCore.QSize(30, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendSubBTN.setFont(font)
+        self.blendSubBTN.setObjectName("blendSubBTN")
+        self.horizontalLayout_24.addWidget(self.blendSubBTN)
+        self.blendScaleBTN = QtWidgets.QPushButton(self.tab_12)
+        self.blendScaleBTN.setMaximumSize(QtCore.QSize(30, 16777215))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendScaleBTN.setFont(font)
+        self.blendScaleBTN.setObjectName("blendScaleBTN")
+        self.horizontalLayout_24.addWidget(self.blendScaleBTN)
+        self.blendValueSPIN = QtWidgets.QDoubleSpinBox(self.tab_12)
+        self.blendValueSPIN.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.blendValueSPIN.setDecimals(3)
+        self.blendValueSPIN.setMaximum(2.0)
+        self.blendValueSPIN.setSingleStep(0.1)
+        self.blendValueSPIN.setProperty("value", 0.5)
+        self.blendValueSPIN.setObjectName("blendValueSPIN")
+        self.horizontalLayout_24.addWidget(self.blendValueSPIN)
+        self.verticalLayout_13.addLayout(self.horizontalLayout_24)
+        self.horizontalLayout_25 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_25.setSpacing(2)
+        self.horizontalLayout_25.setObjectName("horizontalLayout_25")
+        self.blendSmoothBTN = QtWidgets.QPushButton(self.tab_12)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendSmoothBTN.setFont(font)
+        self.blendSmoothBTN.setObjectName("blendSmoothBTN")
+        self.horizontalLayout_25.addWidget(self.blendSmoothBTN)
+        self.blendCopyBTN = QtWidgets.QPushButton(self.tab_12)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendCopyBTN.setFont(font)
+        self.blendCopyBTN.setCheckable(True)
+        self.blendCopyBTN.setObjectName("blendCopyBTN")
+        self.horizontalLayout_25.addWidget(self.blendCopyBTN)
+        self.blendPasteBTN = QtWidgets.QPushButton(self.tab_12)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.blendPasteBTN.setFont(font)
+        self.blendPasteBTN.setObjectName("blendPasteBTN")
+        self.horizontalLayout_25.addWidget(self.blendPasteBTN)
+        self.blendPreviewCHK = QtWidgets.QCheckBox(self.tab_12)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.blendPreviewCHK.setFont(font)
+        self.blendPreviewCHK.setObjectName("blendPreviewCHK")
+        self.horizontalLayout_25.addWidget(self.blendPreviewCHK)
+        self.verticalLayout_13.addLayout(self.horizontalLayout_25)
+        self.tabWidget.addTab(self.tab_12, "")
+        self.tab_13 = QtWidgets.QWidget()
+        self.tab_13.setObjectName("tab_13")
+        self.verticalLayout_14 = QtWidgets.QVBoxLayout(self.tab_13)
+        self.verticalLayout_14.setSpacing(2)
+        self.verticalLayout_14.setContentsMargins(3, 3, 3, 3)
+        self.verticalLayout_14.setObjectName("verticalLayout_14")
+        self.horizontalLayout_26 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_26.setSpacing(2)
+        self.horizontalLayout_26.setObjectName("horizontalLayout_26")
+        self.rigidShellsBTN = QtWidgets.QPushButton(self.tab_13)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setWeight(75)
+        font.setBold(True)
+        self.rigidShellsBTN.setFont(font)
+        self.rigidShellsBTN.setObjectName("rigidShellsBTN")
+        self.horizontalLayout_26.addWidget(self.rigidShellsBTN)
+        self.rigidModeCMB = QtWidgets.QComboBox(self.tab_13)
+        self.rigidModeCMB.setMaximumSize(QtCore.QSize(80, 16777215))
+        self.rigidModeCMB.setObjectName("rigidModeCMB")
+        self.rigidModeCMB.addItem("")
+        self.rigidModeCMB.addItem("")
+        self.horizontalLayout_26.addWidget(self.rigidModeCMB)
+        self.verticalLayout_14.addLayout(self.horizontalLayout_26)
+        self.horizontalLayout_27 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_27.setSpacing(2)
+        self.horizontalLayout_27.setObjectName("horizontalLayout_27")
+        self.rigidSelInfCHK = QtWidgets.QCheckBox(self.tab_13)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.rigidSelInfCHK.setFont(font)
+        self.rigidSelInfCHK.setObjectName("rigidSelInfCHK")
+        self.horizontalLayout_27.addWidget(self.rigidSelInfCHK)
+        self.rigidShellsLBL = QtWidgets.QLabel(self.tab_13)
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        self.rigidShellsLBL.setFont(font)
+        self.rigidShellsLBL.setObjectName("rigidShellsLBL")
+        self.horizontalLayout_27.addWidget(self.rigidShellsLBL)
+        self.verticalLayout_14.addLayout(self.horizontalLayout_27)
+        self.tabWidget.addTab(self.tab_13, "")
         self.verticalLayout.addWidget(self.tabWidget)
 
         self.retranslateUi(skinWranglerDlg)
@@ -539,6 +1126,8 @@ class Ui_skinWranglerDlg(object):
         self.selShellBTN.setText("SHELL")
         self.selLoopBTN.setText("LOOP")
         self.selPointsEffectedBTN.setText("VERTS EFFECTED BY SELECTED JOINTS")
+        self.affectedThresholdSLD.setToolTip("Only select vertices weighted above this value")
+        self.affectedThresholdLBL.setText("> 0.00")
         self.groupBox_2.setTitle("SKINNING")
         self.label_2.setText("NORMALIZATION:  ")
         self.label_3.setText("MAX INF:  ")
@@ -557,38 +1146,167 @@ class Ui_skinWranglerDlg(object):
         self.plusWeightBTN.setText("+")
         self.minusWeightBTN.setToolTip("Subtract value to current weight for selected joint")
         self.minusWeightBTN.setText("-")
+        self.scaleWeightBTN.setToolTip("Scale the distance between the selected joint weights and the set weight value")
         self.scaleWeightBTN.setText("SCALE WEIGHT")
+        self.multWeightBTN.setToolTip("Multiply the selected joint weights by the scale value")
         self.multWeightBTN.setText("*")
         self.pasteBTN.setToolTip("Paste stored skinning weights")
         self.pasteBTN.setText("PASTE")
         self.refreshBTN.setToolTip("Used to refresh the weight list")
         self.refreshBTN.setText("<")
+        self.divWeightBTN.setToolTip("Divide the selected joint weights by the scale value")
         self.divWeightBTN.setText("/")
+        self.setAverageWeightBTN.setToolTip("Smooth the selected vertices, options in the SMOOTH tab")
         self.setAverageWeightBTN.setText("AVERAGE")
         self.copyBTN.setToolTip("Copy/store skinning info for current selection")
         self.copyBTN.setText("COPY")
         self.label.setText("JOINT INFLUENCE LIST:")
+        self.filterBTN.setToolTip("Filters as you type, click to also refresh the list")
         self.filterBTN.setText("FILTER")
-        self.jointLST.headerItem().setText(0, "AVG WEIGHT")
+        self.lockFilteredBTN.setToolTip("Lock every influence matching the filter, all of them when it\'s empty")
+        self.lockFilteredBTN.setText("LOCK")
+        self.unlockFilteredBTN.setToolTip("Unlock every influence matching the filter, all of them when it\'s empty")
+        self.unlockFilteredBTN.setText("UNLOCK")
+        self.jointLST.headerItem().setText(1, "AVG WEIGHT")
+        self.jointLST.headerItem().setText(2, "VTX")
+        self.jointLST.headerItem().setText(3, "DIFF")
+        self.jointLST.headerItem().setText(4, "SUBTREE")
         self.jointLST.setSortingEnabled(False)
         self.jointLST.topLevelItem(0).setText(0, "joint01")
         self.jointLST.setSortingEnabled(self.jointLST.isSortingEnabled())
         self.listAllCHK.setText("List all influences")
         self.nameSpaceCHK.setText("strip nameSpace")
         self.longNamesCHK.setText("longNames")
+        self.hierarchyCHK.setToolTip("Show the influences as their joint hierarchy, with the summed weight of every branch")
+        self.hierarchyCHK.setText("hierarchy")
         self.dynAnnotationCHK.setText("Dynamic annotation")
         self.labelJointsCHK.setText("Label joints")
-        self.removeUnusedBTN.setToolTip("Maya remove unused influences command")
+        self.removeUnusedBTN.setToolTip("Remove influences whose max weight is at or below the threshold,\n their weight goes to the nearest kept parent joint")
         self.removeUnusedBTN.setText("REMOVE UNUSED INFS")
+        self.removeThresholdSPIN.setToolTip("Max weight threshold, 0 only removes unused influences")
         self.clampInfBTN.setToolTip("Trims down the smallest values and re-normalizes")
         self.clampInfBTN.setText("CLAMP MAX INFS")
+        self.addJntBTN.setToolTip("Add the selected joints to the skinClusters of the selected meshes")
         self.addJntBTN.setText("ADD JNT")
         self.bindPoseBTN.setText("BIND POSE")
+        self.auditBindPoseBTN.setToolTip("Check the bind pose of every skinCluster in the scene")
+        self.auditBindPoseBTN.setText("AUDIT")
         self.selectVertsWithInfBTN.setToolTip("Select vertices that have more influences than the number")
         self.selectVertsWithInfBTN.setText("SEL VTX WITH >")
         self.selectVertsWithInfSPIN.setSuffix(" INF")
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_3), "SKIN CLUSTER UTILS")
-        self.jointOnBboxCenterBTN.setText("MAKE JOINT ON BBOX CENTER")
-        self.avgOptionCHK.setToolTip("Uses custom code to average skinning,\n respecting the max influences")
-        self.avgOptionCHK.setText("Calc \'AVERAGE\' with max inf (no hammer)")
+        self.jointOnBboxCenterBTN.setToolTip("Create a joint at the center of every selected island in one go")
+        self.jointOnBboxCenterBTN.setText("JOINTS AT CENTERS")
+        self.jointCenterModeCMB.setToolTip("pca also orients each joint along its island\'s longest extent")
+        self.jointCenterModeCMB.setItemText(0, "bbox")
+        self.jointCenterModeCMB.setItemText(1, "centroid")
+        self.jointCenterModeCMB.setItemText(2, "pca")
+        self.jointGroupCMB.setItemText(0, "per island")
+        self.jointGroupCMB.setItemText(1, "selection")
+        self.avgOptionCHK.setToolTip("Clamp the smoothed \'AVERAGE\' result to the CLAMP MAX INFS value")
+        self.avgOptionCHK.setText("Calc \'AVERAGE\' with max inf")
+        self.jointParentCHK.setToolTip("Parent the new joints under the first influence selected in the list")
+        self.jointParentCHK.setText("parent to sel inf")
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_4), "TOOLBOX")
+        self.prepEngineBTN.setToolTip("Prune, clamp and quantize every vertex of the selected meshes for the game engine")
+        self.prepEngineBTN.setText("PREPARE FOR ENGINE")
+        self.prepBitsCMB.setItemText(0, "8 bit")
+        self.prepBitsCMB.setItemText(1, "16 bit")
+        self.prepMaxInfSPIN.setSuffix(" INF")
+        self.prepEpsilonSPIN.setToolTip("Weights below this are pruned")
+        self.prepErrorLBL.setText("MAX ERR: -  MEAN ERR: -")
+        self.prepWorstSPIN.setToolTip("Number of worst offending vertices to select afterwards")
+        self.prepWorstSPIN.setPrefix("SEL ")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_5), "EXPORT")
+        self.smoothStrengthSPIN.setPrefix("STR ")
+        self.smoothIterSPIN.setPrefix("ITER ")
+        self.smoothImplicitCHK.setToolTip("Solve one implicit smoothing step instead of iterating")
+        self.smoothImplicitCHK.setText("Implicit")
+        self.smoothPinBorderCHK.setToolTip("Keep the border vertices of the selection fixed")
+        self.smoothPinBorderCHK.setText("Pin border")
+        self.smoothSelInfCHK.setToolTip("Only smooth the joints selected in the list")
+        self.smoothSelInfCHK.setText("Selected joints only")
+        self.smoothProcessCHK.setToolTip("Solve in a separate process over shared memory, needs Python 3.8+")
+        self.smoothProcessCHK.setText("subprocess")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_6), "SMOOTH")
+        self.falloffBTN.setToolTip("Fade the first selected joint out from the selected vertices")
+        self.falloffBTN.setText("FALLOFF FROM SELECTION")
+        self.falloffCurveCMB.setItemText(0, "smooth")
+        self.falloffCurveCMB.setItemText(1, "linear")
+        self.falloffCurveCMB.setItemText(2, "sharp")
+        self.falloffCurveCMB.setItemText(3, "soft")
+        self.falloffModeCMB.setItemText(0, "Rings")
+        self.falloffModeCMB.setItemText(1, "Edge distance")
+        self.falloffRingsSPIN.setSuffix(" RINGS")
+        self.falloffDistSPIN.setSuffix(" DIST")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_7), "FALLOFF")
+        self.addSeedCHK.setToolTip("ADD JNT gives new joints weights from their distance to the bone")
+        self.addSeedCHK.setText("seed ADD JNT")
+        self.addRadiusSPIN.setPrefix("R ")
+        self.transferBTN.setToolTip("Transfer weights from the first selected skinned mesh onto the second by closest point")
+        self.transferBTN.setText("TRANSFER")
+        self.transferSelCHK.setToolTip("Only transfer onto the selected vertices of the target")
+        self.transferSelCHK.setText("sel only")
+        self.roughBindBTN.setToolTip("Weight the selected vertices to the selected influences by distance to their bones")
+        self.roughBindBTN.setText("ROUGH BIND")
+        self.bindMaxInfSPIN.setPrefix("max ")
+        self.bindVisibleCHK.setToolTip("Skip bones behind the surface, judged by the vertex normal")
+        self.bindVisibleCHK.setText("visible")
+        self.bindShellCHK.setToolTip("Each shell only uses the bones closest to the whole shell")
+        self.bindShellCHK.setText("shells")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_8), "BIND")
+        self.compareBTN.setToolTip("Diff against the second selected skinCluster, or a saved weight file")
+        self.compareBTN.setText("COMPARE")
+        self.compareTolSPIN.setToolTip("Select vertices whose largest weight change is above this")
+        self.exportWeightsBTN.setToolTip("Save the current skinCluster\'s weights to compare against later")
+        self.exportWeightsBTN.setText("SAVE")
+        self.compareLBL.setText("-")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_9), "DIFF")
+        self.snapshotBTN.setToolTip("Keep a copy of the selected skinClusters\' weights in memory")
+        self.snapshotBTN.setText("SNAP")
+        self.restoreSnapshotBTN.setText("RESTORE")
+        self.restoreSelCHK.setToolTip("Only restore the selected vertices")
+        self.restoreSelCHK.setText("sel only")
+        self.snapshotZlibCHK.setToolTip("Lossless zlib storage, slower and a little bigger than float16")
+        self.snapshotZlibCHK.setText("zlib")
+        self.snapshotCapSPIN.setToolTip("Memory cap, the least recently used snapshots are dropped past it")
+        self.snapshotCapSPIN.setSuffix(" MB")
+        self.snapshotLBL.setText("0 snaps")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_10), "SNAP")
+        self.auditSceneBTN.setToolTip("Report max influence, normalization, locked and unused influence issues for every skinCluster")
+        self.auditSceneBTN.setText("AUDIT SCENE")
+        self.auditEpsilonSPIN.setToolTip("Weights below this count as stray and influences without any as unused")
+        self.rpcServerCHK.setToolTip("Serve the weight operations as JSON-RPC on localhost for external tools")
+        self.rpcServerCHK.setText("RPC server")
+        self.checkNormalizedBTN.setToolTip("Select the vertices whose weights don\'t sum to 1")
+        self.checkNormalizedBTN.setText("CHECK SUMS")
+        self.normalizeRowsBTN.setToolTip("Renormalize those vertices around their locked influences")
+        self.normalizeRowsBTN.setText("FIX SUMS")
+        self.autoNormalizeCHK.setToolTip("Fix sums whenever normalization is switched back to Interactive")
+        self.autoNormalizeCHK.setText("on Interactive")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_11), "AUDIT")
+        self.blendSetBTN.setToolTip("Set the dual quaternion blend weight of the selected vertices, 0 linear, 1 dual quaternion")
+        self.blendSetBTN.setText("SET BLEND")
+        self.blendAddBTN.setToolTip("Add the value to the blend weights")
+        self.blendAddBTN.setText("+")
+        self.blendSubBTN.setToolTip("Subtract the value from the blend weights")
+        self.blendSubBTN.setText("-")
+        self.blendScaleBTN.setToolTip("Multiply the blend weights by the value")
+        self.blendScaleBTN.setText("*")
+        self.blendSmoothBTN.setToolTip("Smooth the blend weights over the mesh, using the SMOOTH tab strength and iterations")
+        self.blendSmoothBTN.setText("SMOOTH")
+        self.blendCopyBTN.setToolTip("Copy the average blend weight of the selection")
+        self.blendCopyBTN.setText("COPY")
+        self.blendPasteBTN.setToolTip("Paste the copied blend weight onto the selection")
+        self.blendPasteBTN.setText("PASTE")
+        self.blendPreviewCHK.setToolTip("Show the blend weights as vertex colors, black linear to white dual quaternion")
+        self.blendPreviewCHK.setText("preview")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_12), "BLEND")
+        self.rigidShellsBTN.setToolTip("Bind every shell the selection touches to one shared row, one write per skinCluster")
+        self.rigidShellsBTN.setText("RIGIDIFY SHELLS")
+        self.rigidModeCMB.setToolTip("dominant: the influence with the most weight over the shell, average: the shell\'s mean row")
+        self.rigidModeCMB.setItemText(0, "dominant")
+        self.rigidModeCMB.setItemText(1, "average")
+        self.rigidSelInfCHK.setToolTip("Only pick from the influences selected in the list")
+        self.rigidSelInfCHK.setText("selected influences only")
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab_13), "SHELLS")
@@ -0,0 +1,214 @@
+"""
+skinWrangler spatial queries
+
+Pure NumPy triangle BVH for closest point lookups. Both the build and the queries work on
+whole arrays at a time: the tree is split level by level with one sort per level, and
+queries walk it as a frontier of (query, node) pairs pruned against each query's best
+distance so far.
+"""
+
+import numpy as np
+
+
+def triangulate(counts, connects):
+    """(t, 3) fan triangulation of the face-vertex buffers MFnMesh.getVertices() returns"""
+    counts = np.asarray(counts, dtype=np.intp)
+    connects = np.asarray(connects, dtype=np.intp)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    numTris = np.maximum(counts - 2, 0)
+    face = np.repeat(np.arange(len(counts)), numTris)
+    # corner i of the fan for every triangle of a face, 1..count-2
+    corner = np.arange(numTris.sum()) - np.repeat(np.cumsum(numTris) - numTris, numTris) + 1
+    first = connects[starts[face]]
+    return np.column_stack((first, connects[starts[face] + corner], connects[starts[face] + corner + 1]))
+
+
+def closestOnTriangles(points, a, b, c):
+    """
+    Closest points of points[i] on triangles (a[i], b[i], c[i]), vectorized over i.
+    Returns (barycentric (n, 3), squared distances). Voronoi region tests after Ericson,
+    applied from the interior outwards so the vertex and edge regions win.
+    """
+    dot = lambda x, y: (x * y).sum(axis=1)
+    ab, ac, ap = b - a, c - a, points - a
+    bp, cp = points - b, points - c
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    bary = np.zeros((len(points), 3))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = va + vb + vc
+        v, w = vb / denom, vc / denom
+        bary[:] = np.column_stack((1.0 - v - w, v, w))
+
+        edge = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        bary[edge] = np.column_stack((np.zeros_like(t), 1.0 - t, t))[edge]
+        edge = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        t = d2 / (d2 - d6)
+        bary[edge] = np.column_stack((1.0 - t, np.zeros_like(t), t))[edge]
+        edge = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        t = d1 / (d1 - d3)
+        bary[edge] = np.column_stack((1.0 - t, t, np.zeros_like(t)))[edge]
+    bary[(d6 >= 0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+    bary[(d3 >= 0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+    bary[(d1 <= 0) & (d2 <= 0)] = (1.0, 0.0, 0.0)
+    # degenerate triangles fall back to their first corner
+    bary[~np.isfinite(bary).all(axis=1)] = (1.0, 0.0, 0.0)
+
+    closest = bary[:, :1] * a + bary[:, 1:2] * b + bary[:, 2:] * c
+    return bary, ((points - closest) ** 2).sum(axis=1)
+
+
+def boxDistance(points, lo, hi):
+    """Squared distance from points to axis aligned boxes, 0 inside"""
+    gap = np.maximum(np.maximum(lo - points, points - hi), 0.0)
+    return (gap * gap).sum(axis=1)
+
+
+class TriangleBVH(object):
+    """
+    Median split BVH over triangles. Node n is a leaf when child[n] < 0 and then holds
+    triangles order[start[n]:start[n] + count[n]], otherwise its children are child[n], child[n] + 1.
+    """
+
+    def __init__(self, points, triangles, leafSize=8):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+        self.leafSize = leafSize
+        self.build()
+
+    @classmethod
+    def fromFaces(cls, points, counts, connects, leafSize=8):
+        return cls(points, triangulate(counts, connects), leafSize)
+
+    ARRAYS = ('points', 'triangles', 'order', 'lo', 'hi', 'child', 'start', 'count')
+
+    def toArrays(self):
+        """{name: array} of the points, triangles and built tree, for skinwranglercache"""
+        return dict((name, getattr(self, name)) for name in self.ARRAYS)
+
+    @classmethod
+    def fromArrays(cls, arrays):
+        """Restores a tree from toArrays() output without rebuilding it"""
+        bvh = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(bvh, name, arrays[name])
+        bvh.leafSize = int(bvh.count.max()) if len(bvh.count) else 8
+        return bvh
+
+    def build(self):
+        corners = self.points[self.triangles]
+        triLo, triHi = corners.min(axis=1), corners.max(axis=1)
+        centroids = corners.mean(axis=1)
+        numTris = len(self.triangles)
+        order = np.arange(numTris)
+
+        lo, hi, child, start, count = [], [], [], [], []
+        segStarts = np.zeros(1 if numTris else 0, dtype=np.intp)
+        segCounts = np.full(len(segStarts), numTris, dtype=np.intp)
+        nodeBase = 0
+        while len(segStarts):
+            numSegs = len(segStarts)
+            lo.append(np.minimum.reduceat(triLo[order], segStarts, axis=0))
+            hi.append(np.maximum.reduceat(triHi[order], segStarts, axis=0))
+            start.append(segStarts)
+            count.append(segCounts)
+
+            split = segCounts > self.leafSize
+            levelChild = np.full(numSegs, -1, dtype=np.intp)
+            nextBase = nodeBase + numSegs
+            levelChild[split] = nextBase + 2 * np.arange(split.sum())
+            child.append(levelChild)
+            if not split.any():
+                break
+
+            # sort every segment along the longest axis of its centroids, then halve it
+            cLo = np.minimum.reduceat(centroids[order], segStarts, axis=0)
+            cHi = np.maximum.reduceat(centroids[order], segStarts, axis=0)
+            axis = (cHi - cLo).argmax(axis=1)
+            segIds = np.repeat(np.arange(numSegs), segCounts)
+            keys = centroids[order, axis[segIds]]
+            order = order[np.lexsort((keys, segIds))]
+
+            half = segCounts[split] // 2
+            segStarts = np.column_stack((segStarts[split], segStarts[split] + half)).ravel()
+            segCounts = np.column_stack((half, segCounts[split] - half)).ravel()
+            nodeBase = nextBase
+
+        self.order = order
+        self.lo = np.concatenate(lo) if lo else np.zeros((0, 3))
+        self.hi = np.concatenate(hi) if hi else np.zeros((0, 3))
+        self.child = np.concatenate(child) if child else np.zeros(0, dtype=np.intp)
+        self.start = np.concatenate(start) if start else np.zeros(0, dtype=np.intp)
+        self.count = np.concatenate(count) if count else np.zeros(0, dtype=np.intp)
+
+    def _testLeaves(self, queries, q, nodes, best, bestTri, bestBary):
+        """Exact distances to every triangle of the given leaves, keeping each query's closest"""
+        counts = self.count[nodes]
+        qq = np.repeat(q, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        tris = self.order[np.repeat(self.start[nodes], counts) + offsets]
+        corners = self.points[self.triangles[tris]]
+        bary, dist = closestOnTriangles(queries[qq], corners[:, 0], corners[:, 1], corners[:, 2])
+        # closest candidate per query, then only keep it where it beats the best so far
+        pick = np.lexsort((dist, qq))
+        first = pick[np.r_[True, qq[pick][1:] != qq[pick][:-1]]]
+        better = dist[first] < best[qq[first]]
+        first = first[better]
+        best[qq[first]] = dist[first]
+        bestTri[qq[first]] = tris[first]
+        bestBary[qq[first]] = bary[first]
+
+    def _query(self, queries):
+        numQueries = len(queries)
+        best = np.full(numQueries, np.inf)
+        bestTri = np.full(numQueries, -1, dtype=np.intp)
+        bestBary = np.zeros((numQueries, 3))
+        if not len(self.child):
+            return bestTri, bestBary, best
+
+        # greedy descent to one leaf per query for a tight first bound
+        node = np.zeros(numQueries, dtype=np.intp)
+        inner = self.child[node] >= 0
+        while inner.any():
+            left = self.child[node[inner]]
+            dLeft = boxDistance(queries[inner], self.lo[left], self.hi[left])
+            dRight = boxDistance(queries[inner], self.lo[left + 1], self.hi[left + 1])
+            node[inner] = np.where(dLeft <= dRight, left, left + 1)
+            inner = self.child[node] >= 0
+        self._testLeaves(queries, np.arange(numQueries), node, best, bestTri, bestBary)
+
+        # frontier of (query, node) pairs, pruned against the best distance found so far
+        q = np.arange(numQueries)
+        n = np.zeros(numQueries, dtype=np.intp)
+        while len(q):
+            keep = boxDistance(queries[q], self.lo[n], self.hi[n]) < best[q]
+            q, n = q[keep], n[keep]
+            leaf = self.child[n] < 0
+            # the greedy leaf is already tested
+            keep = ~leaf | (n != node[q])
+            q, n, leaf = q[keep], n[keep], leaf[keep]
+            if leaf.any():
+                self._testLeaves(queries, q[leaf], n[leaf], best, bestTri, bestBary)
+            q, n = q[~leaf], self.child[n[~leaf]]
+            q, n = np.repeat(q, 2), np.column_stack((n, n + 1)).ravel()
+        return bestTri, bestBary, best
+
+    def closestPoint(self, queries, batchSize=4096):
+        """
+        (triangle index, barycentric (n, 3), distance) of the closest surface point for every query
+        point, processed in batches to bound the frontier size.
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        tris = np.empty(len(queries), dtype=np.intp)
+        bary = np.empty((len(queries), 3))
+        dist = np.empty(len(queries))
+        for i in range(0, len(queries), batchSize):
+            chunk = slice(i, i + batchSize)
+            tris[chunk], bary[chunk], dist[chunk] = self._query(queries[chunk])
+        return tris, bary, np.sqrt(dist)
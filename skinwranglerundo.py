@@ -0,0 +1,86 @@
+"""
+skinWrangler undo plugin
+
+MFnSkinCluster.setWeights doesn't go on Maya's undo queue by itself, so bulk writes from
+skinwranglerdata.writeWeights and writeBlendWeights are routed through these commands. The weight block is handed
+over in skinwranglerdata's pending list since it can't be passed as command flags.
+"""
+
+from maya.api import OpenMaya as om2
+
+import skinwranglerdata
+
+
+def maya_useNewAPI():
+    pass
+
+
+class SkinWranglerSetWeights(om2.MPxCommand):
+    commandName = 'skinWranglerSetWeights'
+
+    def __init__(self):
+        super(SkinWranglerSetWeights, self).__init__()
+        self.write = None
+        self.oldWeights = None
+
+    @staticmethod
+    def creator():
+        return SkinWranglerSetWeights()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        self.write = skinwranglerdata.popPendingWrite()
+        self.redoIt()
+
+    def redoIt(self):
+        skin, mesh, indices, weights, influences = self.write
+        self.oldWeights = skinwranglerdata.applyWeights(skin, mesh, indices, weights, influences)
+
+    def undoIt(self):
+        skin, mesh, indices, weights, influences = self.write
+        skinwranglerdata.applyWeights(skin, mesh, indices, self.oldWeights, influences)
+
+
+class SkinWranglerSetBlendWeights(om2.MPxCommand):
+    commandName = 'skinWranglerSetBlendWeights'
+
+    def __init__(self):
+        super(SkinWranglerSetBlendWeights, self).__init__()
+        self.write = None
+        self.oldValues = None
+
+    @staticmethod
+    def creator():
+        return SkinWranglerSetBlendWeights()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        self.write = skinwranglerdata.popPendingWrite()
+        self.redoIt()
+
+    def redoIt(self):
+        skin, mesh, indices, values = self.write
+        self.oldValues = skinwranglerdata.applyBlendWeights(skin, mesh, indices, values)
+
+    def undoIt(self):
+        skin, mesh, indices, values = self.write
+        skinwranglerdata.applyBlendWeights(skin, mesh, indices, self.oldValues)
+
+
+COMMANDS = (SkinWranglerSetWeights, SkinWranglerSetBlendWeights)
+
+
+def initializePlugin(plugin):
+    fn = om2.MFnPlugin(plugin, 'skinWrangler', '2.0')
+    for command in COMMANDS:
+        fn.registerCommand(command.commandName, command.creator)
+
+
+def uninitializePlugin(plugin):
+    fn = om2.MFnPlugin(plugin)
+    for command in COMMANDS:
+        fn.deregisterCommand(command.commandName)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules are flat files next to this folder, imported directly rather than through the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,18 @@
+import numpy as np
+
+import skinwranglerindex
+
+
+def test_replaceRowsMatchesDense():
+    rng = np.random.RandomState(0)
+    dense = rng.rand(50, 6) * (rng.rand(50, 6) > 0.5)
+    weights = skinwranglerindex.SparseWeights.fromDense(dense)
+    for rows, columns in (([3, 40, 7], None), ([0, 49], [4, 1]), ([12], [2])):
+        block = rng.rand(len(rows), 6 if columns is None else len(columns)) * (rng.rand(len(rows), 1) > 0.3)
+        weights.replaceRows(rows, block, columns)
+        dense[np.ix_(rows, np.arange(6) if columns is None else columns)] = block
+        # merged triplets must stay sorted as if built from scratch
+        np.testing.assert_array_equal(weights.toDense(), dense)
+        rebuilt = skinwranglerindex.SparseWeights.fromDense(dense)
+        np.testing.assert_array_equal(weights.rows, rebuilt.rows)
+        np.testing.assert_array_equal(weights.cols, rebuilt.cols)
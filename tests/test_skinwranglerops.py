@@ -0,0 +1,35 @@
+import numpy as np
+
+import skinwranglerindex
+import skinwranglerops
+
+
+def test_prepareForEngineKeepsLocked():
+    weights = np.array([(0.3333, 0.3, 0.2, 0.1667), (0.1234, 0.0005, 0.8761, 0.0)])
+    locked = np.array([True, False, False, False])
+    result, maxError, meanError = skinwranglerops.prepareForEngine(weights, 2, 0.001, 8, locked=locked)
+    np.testing.assert_array_equal(result[:, 0], weights[:, 0])
+    # the unlocked part is on the 8 bit grid and fills what the locked column leaves
+    steps = result[:, 1:] * 255
+    np.testing.assert_allclose(steps, np.rint(steps), atol=1e-9)
+    np.testing.assert_allclose(result.sum(axis=1), 1.0, atol=0.5 / 255)
+    assert ((result > 0).sum(axis=1) <= 2).all()
+
+
+def test_prepareSparseForEngineMatchesDense():
+    rng = np.random.RandomState(1)
+    dense = rng.rand(40, 9) * (rng.rand(40, 9) > 0.6)
+    dense[:, [4, 5]] = 0.0
+    dense /= np.maximum(dense.sum(axis=1), 1e-12)[:, None]
+    locked = np.zeros(9, dtype=bool)
+    locked[[2, 4]] = True
+    expected, maxError, meanError = skinwranglerops.prepareForEngine(dense, 3, 0.05, 8, locked=locked)
+    sparse = skinwranglerindex.SparseWeights.fromDense(dense)
+    columns, weights, sparseMax, sparseMean = skinwranglerops.prepareSparseForEngine(sparse, 3, 0.05, 8,
+                                                                                    locked=locked, chunkSize=7)
+    assert 4 in columns and 5 not in columns
+    result = np.zeros_like(dense)
+    result[:, columns] = weights
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+    np.testing.assert_allclose(sparseMax, maxError, atol=1e-12)
+    np.testing.assert_allclose(sparseMean, meanError, atol=1e-12)
@@ -0,0 +1,192 @@
+import contextlib
+import json
+import os
+
+import numpy as np
+import pytest
+
+import skinwranglerserver
+
+
+def makeBackend():
+    backend = skinwranglerserver.MemoryBackend()
+    # unit quad in the xy plane, x=0 edge on influence A, x=1 edge on B
+    points = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    backend.add('sourceSkin', ['A', 'B'], [(1, 0), (0, 1), (0, 1), (1, 0)], points, [(0, 1, 2), (0, 2, 3)])
+    targetPoints = [(0, 0.5, 1), (0.25, 0.5, -1), (1, 0.5, 0), (2, 2, 0)]
+    backend.add('targetSkin', ['ns:A', 'C'], [(0, 1)] * 4, targetPoints)
+    return backend
+
+
+def test_memoryBackendTransfer():
+    backend = makeBackend()
+    assert backend.transfer('sourceSkin', 'targetSkin') == 4
+    # A matched across the namespace, B added, C left unweighted
+    assert backend.getInfluences('targetSkin') == ['ns:A', 'C', 'B']
+    weights = backend.getWeights('targetSkin')
+    np.testing.assert_allclose(weights, [(1, 0, 0), (0.75, 0, 0.25), (0, 0, 1), (0, 0, 1)], atol=1e-12)
+
+
+def test_memoryBackendTransferKeepsLocked():
+    backend = makeBackend()
+    backend.locked = lambda skin: np.array([name == 'C' for name in backend.influences(skin)])
+    backend.transfer('sourceSkin', 'targetSkin', indices=[1])
+    np.testing.assert_allclose(backend.getWeights('targetSkin', [1]), [(0, 1, 0)], atol=1e-12)
+    np.testing.assert_allclose(backend.getWeights('targetSkin', [0, 2, 3]), [(0, 1, 0)] * 3)
+
+
+def test_transferOverRPC():
+    server = skinwranglerserver.RPCServer(makeBackend(), port=0)
+    server.start()
+    try:
+        client = skinwranglerserver.RPCClient(port=server.port, timeout=10)
+        try:
+            assert client.call('transfer', source='sourceSkin', target='targetSkin', indices=[0, 2]) == 2
+            weights = client.call('getWeights', skin='targetSkin', indices=[0, 2])
+        finally:
+            client.close()
+    finally:
+        server.stop()
+    np.testing.assert_allclose(weights, [(1, 0, 0), (0, 0, 1)], atol=1e-12)
+
+
+@contextlib.contextmanager
+def connect(backend):
+    """RPCClient on a freshly started server for backend"""
+    server = skinwranglerserver.RPCServer(backend, port=0)
+    server.start()
+    try:
+        client = skinwranglerserver.RPCClient(port=server.port, timeout=10)
+        try:
+            yield client
+        finally:
+            client.close()
+    finally:
+        server.stop()
+
+
+def makeWeights():
+    backend = skinwranglerserver.MemoryBackend()
+    backend.add('skin', ['A', 'B', 'C'], [(0.5, 0.3, 0.0005), (0.2, 0.2, 0.2), (0.7, 0.2, 0.1), (1, 0, 0)])
+    return backend
+
+
+def test_callBatchPipelineOrder():
+    with connect(makeWeights()) as client:
+        assert client.call('listSkins') == ['skin']
+        calls = [('getWeights', {'skin': 'skin', 'indices': [i]}) for i in (3, 0, 2, 1)]
+        expected = [makeWeights().getWeights('skin', [i]) for i in (3, 0, 2, 1)]
+        for results in (client.batch(calls), client.pipeline(calls)):
+            for result, weights in zip(results, expected):
+                np.testing.assert_array_equal(result, weights)
+        # a write pipelined ahead of a read is seen by it
+        results = client.pipeline([('setWeights', {'skin': 'skin', 'indices': [1], 'weights': [(0, 1, 0)]}),
+                                   ('getWeights', {'skin': 'skin', 'indices': [1]})])
+        assert results[0] == 1
+        np.testing.assert_array_equal(results[1], [(0, 1, 0)])
+
+
+def test_ndarrayRoundTrip():
+    arrays = [np.arange(12, dtype=np.int32).reshape(3, 4), np.linspace(0, 1, 6, dtype=np.float32).reshape(2, 1, 3),
+              np.array([True, False]), np.zeros((0, 3))]
+    frame = skinwranglerserver.encodeMessage({'nested': [arrays[0], {'x': arrays[1]}], 'rest': arrays[2:]})
+    textSize, blobSize = skinwranglerserver.HEADER.unpack(frame[:skinwranglerserver.HEADER.size])
+    text = frame[skinwranglerserver.HEADER.size:skinwranglerserver.HEADER.size + textSize]
+    decoded = skinwranglerserver.decodeMessage(text, frame[skinwranglerserver.HEADER.size + textSize:])
+    for array, result in zip(arrays, [decoded['nested'][0], decoded['nested'][1]['x']] + decoded['rest']):
+        assert result.dtype == array.dtype and result.shape == array.shape
+        np.testing.assert_array_equal(result, array)
+
+    backend = makeWeights()
+    weights = np.array([(0.25, 0.25, 0.5)], dtype=np.float32)
+    with connect(backend) as client:
+        client.call('setWeights', skin='skin', indices=np.array([2]), weights=weights)
+        result = client.call('getWeights', skin='skin')
+    assert result.dtype == np.float64 and result.shape == (4, 3)
+    np.testing.assert_array_equal(result[2], weights[0])
+
+
+def test_normalizeClampPrune():
+    with connect(makeWeights()) as client:
+        assert client.call('normalize', skin='skin', indices=[0, 1]) == 2
+        weights = client.call('getWeights', skin='skin')
+        np.testing.assert_allclose(weights[:2].sum(axis=1), 1.0)
+        np.testing.assert_allclose(weights[1], [1 / 3.0] * 3)
+
+        client.call('prune', skin='skin', epsilon=0.01, indices=[0])
+        weights = client.call('getWeights', skin='skin', indices=[0])
+        assert weights[0, 2] == 0.0
+        np.testing.assert_allclose(weights.sum(), 1.0)
+
+        client.call('clamp', skin='skin', maxInfluences=2)
+        weights = client.call('getWeights', skin='skin')
+        assert ((weights > 0).sum(axis=1) <= 2).all()
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        np.testing.assert_allclose(weights[2], [0.7 / 0.9, 0.2 / 0.9, 0])
+
+
+def test_errorResponses():
+    with connect(makeWeights()) as client:
+        with pytest.raises(skinwranglerserver.RPCError) as error:
+            client.call('deleteEverything')
+        assert error.value.code == skinwranglerserver.METHOD_NOT_FOUND
+        # the private primitives are not methods either
+        with pytest.raises(skinwranglerserver.RPCError) as error:
+            client.call('write', skin='skin', indices=[0], weights=[(1, 0, 0)])
+        assert error.value.code == skinwranglerserver.METHOD_NOT_FOUND
+        for params in ({'skinn': 'skin'}, {'skin': 'skin', 'indices': [0], 'extra': 1}):
+            with pytest.raises(skinwranglerserver.RPCError) as error:
+                client.call('getWeights', **params)
+            assert error.value.code == skinwranglerserver.INVALID_PARAMS
+
+        # broken frames get a parse error and the connection keeps serving
+        bad = [b'{not json', json.dumps({'__ndarray__': [0, 8], 'dtype': 'nope', 'shape': [1]}).encode('utf-8'),
+               json.dumps({'x': {'__ndarray__': 3, 'dtype': '<f8', 'shape': [1]}}).encode('utf-8'),
+               json.dumps({'x': {'__ndarray__': [0, 8], 'dtype': '<f8', 'shape': 'ab'}}).encode('utf-8')]
+        for text in bad:
+            client.sock.sendall(skinwranglerserver.HEADER.pack(len(text), 8) + text + b'\0' * 8)
+            response = client._receive()
+            assert response['id'] is None and response['error']['code'] == skinwranglerserver.PARSE_ERROR
+        assert client.call('listSkins') == ['skin']
+
+
+def test_internalTypeErrorIsNotInvalidParams():
+    backend = makeWeights()
+
+    def read(skin, indices=None):
+        raise TypeError('bug inside the backend')
+
+    backend.read = read
+    response = skinwranglerserver.dispatch(backend, {'jsonrpc': '2.0', 'id': 1, 'method': 'getWeights',
+                                                     'params': {'skin': 'skin'}})
+    assert response['error']['code'] == skinwranglerserver.INTERNAL_ERROR
+
+
+def test_exportConfinedToExportDir(tmpdir):
+    backend = makeWeights()
+    with connect(backend) as client:
+        with pytest.raises(skinwranglerserver.RPCError):
+            client.call('exportWeights', skin='skin', path='weights')
+    backend.exportDir = str(tmpdir)
+    with connect(backend) as client:
+        path = client.call('exportWeights', skin='skin', path='sub/weights')
+        for outside in ('../weights', str(tmpdir.dirpath().join('weights')), '/tmp/weights'):
+            with pytest.raises(skinwranglerserver.RPCError) as error:
+                client.call('exportWeights', skin='skin', path=outside)
+            assert error.value.code == skinwranglerserver.INVALID_PARAMS
+    assert path == os.path.realpath(str(tmpdir.join('sub', 'weights.npz')))
+    data = np.load(path)
+    dense = np.zeros(tuple(data['shape']))
+    dense[data['rows'], data['cols']] = data['values']
+    np.testing.assert_array_equal(dense, backend.getWeights('skin'))
+    assert list(data['influences']) == ['A', 'B', 'C']
+
+
+def test_setWeightsKeepsLocked():
+    backend = makeWeights()
+    backend.locked = lambda skin: np.array([False, True, False])
+    with connect(backend) as client:
+        client.call('setWeights', skin='skin', indices=[2, 3], weights=[(0.0, 1.0, 0.0), (0.5, 0.0, 0.5)])
+        weights = client.call('getWeights', skin='skin', indices=[2, 3])
+    np.testing.assert_allclose(weights[:, 1], [0.2, 0.0])
+    np.testing.assert_allclose(weights, [(0.7, 0.2, 0.1), (0.5, 0.0, 0.5)])